@@ -0,0 +1,236 @@
+"""
+Benchmarks for the algo_trade indicators.
+
+Times every indicator exported by ``financelib.trading.algo_trade`` on
+synthetic OHLCV data (batch, compact, incremental and panel variants), records
+throughput and peak memory, and compares the run against a JSON baseline.
+Everything runs offline.
+
+    # Record a baseline on this machine
+    python benchmarks/bench_algo_trade.py --update-baseline
+
+    # Later: fail (exit code 1) if anything got more than 25% worse
+    python benchmarks/bench_algo_trade.py --threshold 0.25
+"""
+import argparse
+import inspect
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+# Run from a checkout: the repo root for ``financelib`` and the package
+# directory for its top-level ``settings`` imports.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (os.path.join(ROOT, 'financelib'), ROOT):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from financelib.trading import algo_trade  # noqa: E402
+
+# Below these, differences are noise rather than regressions.
+MIN_SECONDS = 0.005
+MIN_BYTES = 64 * 1024
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# Input columns and streaming class (if any) of every indicator.
+INDICATORS = {
+    'sma': (('close',), 'IncrementalSMA'),
+    'ema': (('close',), 'IncrementalEMA'),
+    'rsi': (('close',), 'IncrementalRSI'),
+    'macd': (('close',), 'IncrementalMACD'),
+    'bollinger_bands': (('close',), 'IncrementalBollingerBands'),
+    'atr': (('high', 'low', 'close'), 'IncrementalATR'),
+    'adx': (('high', 'low', 'close'), 'IncrementalADX'),
+    'stochastic': (('high', 'low', 'close'), 'IncrementalStochastic'),
+    'williams_r': (('high', 'low', 'close'), 'IncrementalWilliamsR'),
+    'cci': (('high', 'low', 'close'), 'IncrementalCCI'),
+    'aroon': (('high', 'low'), 'IncrementalAroon'),
+    'adx_wilder': (('high', 'low', 'close'), None),
+    'vwap': (('high', 'low', 'close', 'volume'), None),
+    'obv': (('close', 'volume'), None),
+    'supertrend': (('high', 'low', 'close'), None),
+    'parabolic_sar': (('high', 'low'), None),
+    'ichimoku': (('high', 'low', 'close'), None),
+}
+
+
+def indicator_functions():
+    """Every indicator function exported by algo_trade, checked against INDICATORS."""
+    names = [name for name in algo_trade.__all__
+             if name[0].islower() and callable(getattr(algo_trade, name))
+             and not isinstance(getattr(algo_trade, name), type(algo_trade))]
+    missing = sorted(set(names) - set(INDICATORS))
+    if missing:
+        raise SystemExit(f"No benchmark spec for: {', '.join(missing)}. Please add them to INDICATORS.")
+    return names
+
+
+def make_ohlcv(rows, dtype, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, rows))
+    spread = rng.uniform(0.1, 2.0, rows)
+    return pd.DataFrame({
+        'high': close + spread * rng.uniform(0, 1, rows),
+        'low': close - spread * rng.uniform(0, 1, rows),
+        'close': close,
+        'volume': rng.integers(1_000, 100_000, rows).astype(float),
+    }).astype(dtype)
+
+
+def make_panel(rows, dtype, symbols):
+    """Wide (time x symbols) frames holding ``rows`` values in total."""
+    length = max(rows // symbols, 1)
+    frames = [make_ohlcv(length, dtype, seed=seed) for seed in range(symbols)]
+    return {field: pd.DataFrame({seed: frame[field] for seed, frame in enumerate(frames)})
+            for field in ('high', 'low', 'close')}
+
+
+def measure(func, repeat):
+    """Best wall time over ``repeat`` runs and peak traced memory of one run."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def cases(sizes, dtypes, variants, incremental_rows, panel_symbols):
+    for dtype in dtypes:
+        for size in sizes:
+            data = make_ohlcv(size, dtype)
+            panel_data = make_panel(size, dtype, panel_symbols) if 'panel' in variants else None
+            for name in indicator_functions():
+                fields, incremental_name = INDICATORS[name]
+
+                if 'batch' in variants:
+                    func = getattr(algo_trade, name)
+                    inputs = [data[field] for field in fields]
+                    yield name, 'batch', size, dtype, size, lambda f=func, i=inputs: f(*i)
+
+                if 'compact' in variants and 'dtype' in inspect.signature(getattr(algo_trade, name)).parameters:
+                    func = getattr(algo_trade, name)
+                    inputs = [data[field] for field in fields]
+                    yield name, 'compact', size, dtype, size, lambda f=func, i=inputs, d=dtype: f(*i, dtype=d)
+
+                if 'incremental' in variants and incremental_name is not None:
+                    rows = min(size, incremental_rows)
+                    bars = data[list(fields)].iloc[:rows].to_numpy().tolist()
+                    cls = getattr(algo_trade, incremental_name)
+
+                    def stream(cls=cls, bars=bars):
+                        indicator = cls()
+                        for bar in bars:
+                            indicator.update(*bar)
+
+                    yield name, 'incremental', size, dtype, rows, stream
+
+                if 'panel' in variants and hasattr(algo_trade.panel, name):
+                    func = getattr(algo_trade.panel, name)
+                    inputs = [panel_data[field] for field in fields]
+                    rows = inputs[0].size
+                    yield name, 'panel', size, dtype, rows, lambda f=func, i=inputs: f(*i)
+
+
+def run(args):
+    results = {}
+    for name, variant, size, dtype, rows, func in cases(
+            args.sizes, args.dtypes, args.variants, args.incremental_rows, args.panel_symbols):
+        seconds, peak = measure(func, args.repeat)
+        key = f'{name}/{variant}/{size}/{dtype}'
+        results[key] = {
+            'rows': rows,
+            'seconds': seconds,
+            'rows_per_second': rows / seconds if seconds else float('inf'),
+            'peak_bytes': peak,
+        }
+        print(f'{key:<48} {rows / seconds:>14,.0f} rows/s {peak / 2 ** 20:>10.1f} MiB', flush=True)
+    return results
+
+
+def compare(results, baseline, threshold, min_seconds=MIN_SECONDS, min_bytes=MIN_BYTES):
+    """
+    Regressions of ``results`` against ``baseline`` beyond ``threshold``.
+
+    Cases faster than ``min_seconds`` in both runs are timer noise and are not
+    compared for throughput; memory only counts when it grew by more than
+    ``min_bytes`` as well.
+    """
+    regressions = []
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        timed = max(current['seconds'], previous['seconds']) >= min_seconds
+        if timed and current['rows_per_second'] < previous['rows_per_second'] * (1 - threshold):
+            regressions.append(f"{key}: throughput {current['rows_per_second']:,.0f} rows/s, "
+                               f"baseline {previous['rows_per_second']:,.0f} rows/s")
+        grown = current['peak_bytes'] - previous['peak_bytes']
+        if grown > min_bytes and current['peak_bytes'] > previous['peak_bytes'] * (1 + threshold):
+            regressions.append(f"{key}: peak memory {current['peak_bytes']:,} bytes, "
+                               f"baseline {previous['peak_bytes']:,} bytes")
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', nargs='+', type=lambda value: int(float(value)),
+                        default=[1_000, 10_000, 100_000, 1_000_000, 10_000_000],
+                        help='rows of synthetic data per case (default: 1e3 .. 1e7)')
+    parser.add_argument('--dtypes', nargs='+', default=['float64', 'float32'])
+    parser.add_argument('--variants', nargs='+', default=['batch', 'compact', 'incremental', 'panel'],
+                        choices=['batch', 'compact', 'incremental', 'panel'])
+    parser.add_argument('--incremental-rows', type=int, default=100_000,
+                        help='cap on streamed bars per incremental case (default: 100000)')
+    parser.add_argument('--panel-symbols', type=int, default=100,
+                        help='number of symbols the panel cases are split into (default: 100)')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='allowed relative regression before failing (default: 0.25)')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='write this run to the baseline file instead of comparing')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = run(args)
+
+    if args.update_baseline or not os.path.exists(args.baseline):
+        with open(args.baseline, 'w') as f:
+            json.dump({
+                'machine': {'python': platform.python_version(), 'platform': platform.platform(),
+                            'numpy': np.__version__, 'pandas': pd.__version__},
+                'results': results,
+            }, f, indent=2, sort_keys=True)
+        print(f'Baseline written to {args.baseline}')
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)['results']
+    regressions = compare(results, baseline, args.threshold)
+    for regression in regressions:
+        print(f'REGRESSION {regression}')
+    if regressions:
+        return 1
+    print(f'No regressions beyond {args.threshold:.0%} against {args.baseline}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
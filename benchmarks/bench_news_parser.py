@@ -0,0 +1,163 @@
+"""
+Micro-benchmark of the Bloomberg search page parser.
+
+Times the previous find()-chain extraction on ``html.parser`` against
+``ArticleExtractor`` (fixed and learned selector order, ``html.parser`` and
+lxml) on saved pages, and checks that the fixed order on ``html.parser``
+extracts the same fields as the old code. lxml may repair broken markup
+differently, so its differences are reported but do not fail the run.
+
+    # Save a few search pages first, e.g.
+    #   curl -A Mozilla 'https://www.bloomberg.com/search?query=THYAO' > benchmarks/fixtures/news/thyao.html
+    python benchmarks/bench_news_parser.py --pages benchmarks/fixtures/news
+
+Without saved pages it runs on generated ones, so it works offline.
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (os.path.join(ROOT, 'financelib'), ROOT):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from financelib.news.extract import PARSER, ArticleExtractor  # noqa: E402
+
+DEFAULT_PAGES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'news')
+
+
+def legacy_extract(html, limit):
+    """The extraction BloombergQuery.search_articles did before ArticleExtractor, find() chains as they were"""
+    soup = BeautifulSoup(html, 'html.parser')
+    article_elements = (
+        soup.find_all('article') or
+        soup.find_all('div', class_=lambda x: x and 'story' in x.lower()) or
+        soup.find_all('div', class_=lambda x: x and 'article' in x.lower()) or
+        soup.find_all('div', class_=lambda x: x and 'news' in x.lower())
+    )
+    results = []
+    for article in article_elements[:limit]:
+        title = (
+            article.find(['h1', 'h2', 'h3']) or
+            article.find(class_=lambda x: x and 'title' in x.lower()) or
+            article.find(class_=lambda x: x and 'headline' in x.lower()) or
+            article.find(class_=lambda x: x and 'name' in x.lower()) or
+            article.find(class_=lambda x: x and 'articlename' in x.lower()) or
+            article.find(class_=lambda x: x and 'articletitle' in x.lower()) or
+            article.find(class_=lambda x: x and 'article_name' in x.lower()) or
+            article.find(class_=lambda x: x and 'article_title' in x.lower())
+        )
+        content = (
+            article.find('p') or
+            article.find(class_=lambda x: x and 'summary' in x.lower()) or
+            article.find(class_=lambda x: x and 'description' in x.lower()) or
+            article.find(class_=lambda x: x and 'content' in x.lower())
+        )
+        date_element = (
+            article.find('time') or
+            article.find(class_=lambda x: x and 'time' in x.lower()) or
+            article.find(class_=lambda x: x and 'date' in x.lower()) or
+            article.find(class_=lambda x: x and 'publishedat' in x.lower()) or
+            article.find(class_=lambda x: x and 'published_at' in x.lower()) or
+            article.find(class_=lambda x: x and 'uploadat' in x.lower()) or
+            article.find(class_=lambda x: x and 'upload_at' in x.lower())
+        )
+        author_element = (
+            article.find(class_=lambda x: x and 'author' in x.lower()) or
+            article.find(class_=lambda x: x and 'authors' in x.lower()) or
+            article.find(class_=lambda x: x and 'byline' in x.lower())
+        )
+        category_element = (
+            article.find(class_=lambda x: x and 'category' in x.lower()) or
+            article.find(class_=lambda x: x and 'categories' in x.lower()) or
+            article.find(class_=lambda x: x and 'tag' in x.lower()) or
+            article.find(class_=lambda x: x and 'tags' in x.lower()) or
+            article.find(class_=lambda x: x and 'eyebrow' in x.lower())
+        )
+        results.append({field: node.get_text().strip() if node else None for field, node in (
+            ('title', title), ('content', content), ('date', date_element), ('author', author_element),
+            ('category', category_element))})
+    return results
+
+
+def generated_pages(count=20, articles=20):
+    """Search-result-like pages with navigation noise around the articles"""
+    pages = []
+    for page in range(count):
+        noise = ''.join(f'<li class="nav-item"><a href="/x{i}">Section {i}</a></li>' for i in range(150))
+        items = []
+        for i in range(articles):
+            body = ''.join(f'<span class="word">w{j}</span>' for j in range(30))
+            label = '<div class="eyebrow">markets</div>' if i % 2 else '<span class="categories">Markets</span>'
+            items.append(
+                f'<div class="storyItem">{label}'
+                f'<a class="headline__link"><h3>Headline {page}-{i}</h3></a>'
+                f'<div class="summary__text"><p>Summary {i} {body}</p></div>'
+                f'<div class="byline">By Jane Doe and John Roe</div>'
+                f'<div class="publishedAt"><time>2025-01-0{1 + i % 9}</time></div></div>'
+            )
+        pages.append(f'<html><body><ul class="nav">{noise}</ul><section>{"".join(items)}</section></body></html>')
+    return pages
+
+
+def load_pages(directory):
+    pages = []
+    for path in sorted(glob.glob(os.path.join(directory, '*.html'))):
+        with open(path, encoding='utf-8', errors='replace') as f:
+            pages.append(f.read())
+    return pages
+
+
+def timed(parse, pages, limit, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for page in pages:
+            parse(page, limit)
+        best = min(best, time.perf_counter() - start)
+    return best / len(pages)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', default=DEFAULT_PAGES, help='directory of saved search pages (*.html)')
+    parser.add_argument('--limit', type=int, default=20, help='articles extracted per page')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    pages = load_pages(args.pages)
+    source = f'{len(pages)} saved pages from {args.pages}'
+    if not pages:
+        pages = generated_pages()
+        source = f'{len(pages)} generated pages'
+
+    variants = [('legacy find() chain, html.parser', legacy_extract)]
+    for name in ('html.parser', PARSER) if PARSER != 'html.parser' else ('html.parser',):
+        variants.append((f'ArticleExtractor fixed order, {name}',
+                         ArticleExtractor(parser=name, learn=False).extract_page))
+        variants.append((f'ArticleExtractor learned order, {name}', ArticleExtractor(parser=name).extract_page))
+
+    fixed = ArticleExtractor(parser='html.parser', learn=False)
+    legacy = [legacy_extract(page, args.limit) for page in pages]
+    mismatches = sum(old != fixed.extract_page(page, args.limit) for old, page in zip(legacy, pages))
+    lxml_fixed = ArticleExtractor(parser=PARSER, learn=False)
+    lxml_mismatches = sum(old != lxml_fixed.extract_page(page, args.limit) for old, page in zip(legacy, pages))
+
+    print(f'{source}, {args.limit} articles per page')
+    baseline = None
+    for name, parse in variants:
+        seconds = timed(parse, pages, args.limit, args.repeat)
+        baseline = baseline or seconds
+        print(f'  {name:<44} {seconds * 1000:8.2f} ms/page  {baseline / seconds:5.1f}x')
+    print(f'Pages where the fixed order differs from the legacy extraction: {mismatches} '
+          f'({PARSER}: {lxml_mismatches})')
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""
+Offline benchmarks of the Stock data paths over a recorded provider.
+
+Record the upstream answers once on a machine with a network, then replay
+them anywhere: the numbers measure the library (resolution, caches, history
+store, watchlist), not Yahoo, and are repeatable.
+
+    # Once, with a network
+    python benchmarks/bench_providers.py --record benchmarks/fixtures/bist.pkl.gz
+
+    # Anywhere, optionally with a simulated per-call latency
+    python benchmarks/bench_providers.py --fixture benchmarks/fixtures/bist.pkl.gz --latency 0.05
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (os.path.join(ROOT, 'financelib'), ROOT):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from financelib.database.history import HistoryStore  # noqa: E402
+from financelib.stock import Stock, Watchlist  # noqa: E402
+from financelib.stock.fixtures import RecordingProvider, ReplayProvider  # noqa: E402
+from financelib.stock.metadata_cache import MetadataCache  # noqa: E402
+from financelib.stock.providers import YahooProvider  # noqa: E402
+from financelib.stock.symbol_index import SymbolIndex  # noqa: E402
+
+DEFAULT_FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'bist.pkl.gz')
+HISTORY_RANGE = ('2023-01-01', '2025-01-01')
+
+
+def reset():
+    """Cold caches, so every repeat does the same work"""
+    Stock._symbol_index = SymbolIndex()
+    Stock._metadata_cache = MetadataCache()
+
+
+def workload(provider, symbols, root):
+    """The calls that are recorded and then timed: resolve + info, history, batched quotes"""
+    Stock.fetch_many(symbols, provider=provider)
+    store = HistoryStore(root)
+    for symbol in symbols:
+        Stock(f'{symbol}.IS').history(*HISTORY_RANGE, store=store, provider=provider)
+    Watchlist([f'{symbol}.IS' for symbol in symbols], provider=provider).poll()
+
+
+def record(path, symbols):
+    reset()
+    with tempfile.TemporaryDirectory() as root, RecordingProvider(YahooProvider(), path) as provider:
+        workload(provider, symbols, root)
+    print(f'Recorded {len(symbols)} symbols to {path}')
+
+
+def replay(path, symbols, repeat, latency):
+    provider = ReplayProvider(path, latency=latency)
+    best = float('inf')
+    for _ in range(repeat):
+        reset()
+        provider.calls = 0
+        with tempfile.TemporaryDirectory() as root:
+            start = time.perf_counter()
+            workload(provider, symbols, root)
+            best = min(best, time.perf_counter() - start)
+    print(f'{len(symbols)} symbols, {provider.calls} provider calls: {best:.3f}s '
+          f'({len(symbols) / best:,.1f} symbols/s, latency {latency}s per call)')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--record', metavar='PATH', help='record a fixture from Yahoo instead of replaying')
+    parser.add_argument('--fixture', default=DEFAULT_FIXTURE)
+    parser.add_argument('--symbols', nargs='+', default=list(Stock.COMMON_STOCKS))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--latency', type=float, default=0.0, help='simulated seconds per provider call')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.record:
+        record(args.record, args.symbols)
+        return 0
+    if not os.path.exists(args.fixture):
+        print(f'No fixture at {args.fixture}, record one with --record {args.fixture}')
+        return 1
+    replay(args.fixture, args.symbols, args.repeat, args.latency)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
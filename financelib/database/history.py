@@ -0,0 +1,234 @@
+"""
+Local OHLCV history store.
+
+    store = HistoryStore()
+    df = store.get('THYAO.IS', '1d', '2020-01-01', '2025-01-01', fetch=yahoo_fetch)
+
+Bars are kept per symbol and interval in a flat file of fixed-size records
+(bar time in UTC nanoseconds, then open, high, low, close, volume), sorted by
+time. A JSON file next to it records the time ranges that are known to be
+complete, so ``get`` only asks upstream for the gaps and the missing tail.
+Range reads are a binary search over the memory-mapped file, and a top-up
+that only adds or replaces the newest bars is written in place at the end of
+the file instead of rewriting it.
+
+Writers to the same files are serialized across threads and, where
+``fcntl`` is available, across processes. Readers copy their range under
+the same lock (shared between processes), so they never see a top-up
+halfway through.
+
+``fetch(symbol, interval, start, end)`` returns the bars in ``[start, end)``
+as a DataFrame with a DatetimeIndex (or a 'timestamp' column) and
+open/high/low/close/volume columns in any case.
+"""
+import json
+import os
+import re
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows: threads are still serialized
+    fcntl = None
+
+COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+BAR = np.dtype([('time', '<i8')] + [(column, '<f8') for column in COLUMNS])
+
+# One lock per bars file, shared by every HistoryStore in the process
+_locks: Dict[str, threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+DEFAULT_ROOT = os.path.join(os.path.expanduser('~'), '.financelib', 'history')
+
+Fetch = Callable[[str, str, pd.Timestamp, pd.Timestamp], Optional[pd.DataFrame]]
+
+
+def _timestamp(value) -> pd.Timestamp:
+    stamp = pd.Timestamp(value)
+    return stamp.tz_localize('UTC') if stamp.tzinfo is None else stamp.tz_convert('UTC')
+
+
+def _nanoseconds(value) -> int:
+    return _timestamp(value).value
+
+
+def _merge_ranges(ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        elif start < end:
+            merged.append((start, end))
+    return merged
+
+
+def _normalize(frame: pd.DataFrame) -> np.ndarray:
+    """Time-sorted BAR records of an OHLCV frame."""
+    frame = frame.rename(columns=str.lower)
+    if 'timestamp' in frame.columns:
+        frame = frame.set_index('timestamp')
+    index = pd.DatetimeIndex(frame.index)
+    index = index.tz_localize('UTC') if index.tz is None else index.tz_convert('UTC')
+    bars = np.empty(len(frame), dtype=BAR)
+    bars['time'] = index.as_unit('ns').asi8
+    for column in COLUMNS:
+        bars[column] = frame[column].to_numpy(dtype=np.float64)
+    return bars[np.argsort(bars['time'], kind='stable')]
+
+
+class HistoryStore:
+    """OHLCV bars on local disk, with coverage tracking and incremental top-up."""
+
+    def __init__(self, root: str = DEFAULT_ROOT):
+        self.root = root
+
+    def _path(self, symbol: str, interval: str) -> str:
+        name = re.sub(r'[^A-Za-z0-9._-]', '_', symbol.upper())
+        return os.path.join(self.root, re.sub(r'[^A-Za-z0-9]', '_', interval), name)
+
+    @contextmanager
+    def _locked(self, path: str, shared: bool = False):
+        """Exclusive lock of a symbol's files; ``shared`` lets other processes' readers in"""
+        with _locks_guard:
+            lock = _locks.setdefault(os.path.abspath(path), threading.Lock())
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with lock:
+            if fcntl is None:
+                yield
+                return
+            with open(path + '.lock', 'w') as handle:
+                fcntl.flock(handle, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _bars(path: str) -> np.ndarray:
+        if not os.path.exists(path + '.bars') or not os.path.getsize(path + '.bars'):
+            return np.empty(0, dtype=BAR)
+        return np.memmap(path + '.bars', dtype=BAR, mode='r')
+
+    def _load(self, symbol: str, interval: str) -> Tuple[np.ndarray, list]:
+        path = self._path(symbol, interval)
+        if not os.path.exists(path + '.json'):
+            return np.empty(0, dtype=BAR), []
+        with open(path + '.json') as f:
+            coverage = [tuple(span) for span in json.load(f)['coverage']]
+        return self._bars(path), coverage
+
+    def _save_coverage(self, path: str, symbol: str, interval: str, coverage) -> None:
+        fd, temp = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, 'w') as f:
+            json.dump({'symbol': symbol, 'interval': interval, 'columns': COLUMNS,
+                       'coverage': [list(span) for span in coverage]}, f)
+        os.replace(temp, path + '.json')
+
+    def _save_bars(self, path: str, bars: np.ndarray) -> None:
+        """Merge ``bars`` into the stored ones, in place when only the tail changes"""
+        old = self._bars(path)
+        first = int(np.searchsorted(old['time'], bars['time'][0])) if len(bars) else len(old)
+        top_up = os.path.exists(path + '.bars') and bool(np.isin(old['time'][first:], bars['time']).all())
+        if top_up:
+            # Every stored bar from ``first`` on is replaced by a new one
+            del old
+            with open(path + '.bars', 'r+b') as f:
+                f.seek(first * BAR.itemsize)
+                f.write(bars.tobytes())
+                f.truncate()
+            return
+        merged = np.concatenate((old[~np.isin(old['time'], bars['time'])], bars))
+        merged = merged[np.argsort(merged['time'], kind='stable')]
+        del old
+        fd, temp = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, 'wb') as f:
+            f.write(merged.tobytes())
+        os.replace(temp, path + '.bars')
+
+    def coverage(self, symbol: str, interval: str) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """Time ranges [start, end) with complete local history"""
+        _, coverage = self._load(symbol, interval)
+        return [(pd.Timestamp(start, tz='UTC'), pd.Timestamp(end, tz='UTC')) for start, end in coverage]
+
+    def missing(self, symbol: str, interval: str, start, end) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """Gaps in [start, end) that are not covered locally"""
+        start, end = _nanoseconds(start), _nanoseconds(end)
+        _, coverage = self._load(symbol, interval)
+        gaps, cursor = [], start
+        for covered_start, covered_end in coverage:
+            if covered_end <= cursor:
+                continue
+            if covered_start >= end:
+                break
+            if covered_start > cursor:
+                gaps.append((cursor, covered_start))
+            cursor = max(cursor, covered_end)
+        if cursor < end:
+            gaps.append((cursor, end))
+        return [(pd.Timestamp(a, tz='UTC'), pd.Timestamp(b, tz='UTC')) for a, b in gaps]
+
+    def write(self, symbol: str, interval: str, frame: pd.DataFrame, start=None, end=None) -> None:
+        """
+        Merge bars into the store and mark [start, end) as covered.
+
+        Without ``start``/``end`` the range spans the first to the last bar of
+        ``frame``, the last bar excluded so it is refreshed if it was still
+        forming. Bars already stored at the same time are replaced.
+        """
+        bars = _normalize(frame) if len(frame) else np.empty(0, dtype=BAR)
+        span_start = _nanoseconds(start) if start is not None else (int(bars['time'][0]) if len(bars) else None)
+        span_end = _nanoseconds(end) if end is not None else (int(bars['time'][-1]) if len(bars) else None)
+
+        path = self._path(symbol, interval)
+        with self._locked(path):
+            self._save_bars(path, bars)
+            _, coverage = self._load(symbol, interval)
+            if span_start is not None and span_end is not None:
+                coverage = _merge_ranges(coverage + [(span_start, span_end)])
+            self._save_coverage(path, symbol, interval, coverage)
+
+    def read(self, symbol: str, interval: str, start=None, end=None) -> pd.DataFrame:
+        """Stored bars in [start, end) as an OHLCV frame with a UTC DatetimeIndex"""
+        path = self._path(symbol, interval)
+        if os.path.exists(path + '.json'):
+            # Top-ups rewrite the tail in place, so copy the range out under the lock
+            with self._locked(path, shared=True):
+                stored = self._bars(path)
+                times = stored['time']
+                first = np.searchsorted(times, _nanoseconds(start)) if start is not None else 0
+                last = np.searchsorted(times, _nanoseconds(end)) if end is not None else len(times)
+                bars = np.array(stored[first:last])
+                del stored, times
+        else:
+            bars = np.empty(0, dtype=BAR)
+        index = pd.DatetimeIndex(bars['time'], tz='UTC', name='timestamp')
+        return pd.DataFrame({column: bars[column] for column in COLUMNS}, index=index)
+
+    def get(self, symbol: str, interval: str, start, end=None, fetch: Optional[Fetch] = None) -> pd.DataFrame:
+        """
+        Bars in [start, end), fetching only what is not stored yet.
+
+        ``end`` defaults to now; when it is now or later the still-forming last
+        bar is never marked as covered, so the next call tops it up.
+        """
+        now = pd.Timestamp.now(tz='UTC')
+        end = _timestamp(end) if end is not None else now
+        open_ended = end >= now
+        if fetch is not None:
+            for gap_start, gap_end in self.missing(symbol, interval, start, end):
+                frame = fetch(symbol, interval, gap_start, gap_end)
+                if frame is None:
+                    continue
+                self.write(symbol, interval, frame, start=gap_start,
+                           end=None if open_ended and gap_end == end else gap_end)
+        return self.read(symbol, interval, start, end)
+
+    def frames(self, symbols: List[str], interval: str, start=None, end=None) -> Dict[str, pd.DataFrame]:
+        """Stored bars of many symbols, e.g. for ``algo_trade.parallel.compute_many``"""
+        return {symbol: self.read(symbol, interval, start, end) for symbol in symbols}
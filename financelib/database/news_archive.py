@@ -0,0 +1,241 @@
+"""
+Full-text searchable news archive on SQLite FTS5.
+
+    archive = NewsArchive()
+    archive.add(batch, symbols=['THYAO'])          # NewsBatch, News objects or article dicts
+    archive.search('kargo', symbols=['THYAO'], since='2025-01-01')
+
+Articles live in a plain table (one row per normalized URL, or per title and
+publish time for articles without a URL) with indexes on the publish time,
+source and symbol tags. The title and content are indexed by an
+external-content FTS5 table, kept in sync by triggers, so the text is stored
+once. ``search`` takes an FTS5 query ('kargo', 'title:kargo', '"record
+profit" OR rekor', ...) ranked by BM25 with title matches weighted above
+content matches; date, source and symbol filters are applied through their
+indexes. Without a query it lists the newest matching articles.
+
+Adding is bulk: one transaction and ``executemany`` per call. Adding an
+article again only adds its new symbol tags.
+"""
+import os
+import sqlite3
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+import pandas as pd
+
+from ..news.batch import FIELDS, NewsBatch
+from ..news.dedup import normalize_text, normalize_url
+
+DEFAULT_PATH = os.path.join(os.path.expanduser('~'), '.financelib', 'news.db')
+
+# BM25 weights of the FTS columns (title, content)
+TITLE_WEIGHT = 4.0
+CONTENT_WEIGHT = 1.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    title TEXT,
+    content TEXT,
+    date TEXT,
+    published_at INTEGER,
+    author TEXT,
+    category TEXT,
+    source TEXT,
+    article_url TEXT,
+    article_thumbnail_url TEXT
+);
+CREATE INDEX IF NOT EXISTS articles_published_at ON articles (published_at);
+CREATE INDEX IF NOT EXISTS articles_source ON articles (source, published_at);
+CREATE TABLE IF NOT EXISTS article_symbols (
+    symbol TEXT NOT NULL,
+    published_at INTEGER,
+    article_id INTEGER NOT NULL REFERENCES articles (id) ON DELETE CASCADE,
+    PRIMARY KEY (symbol, article_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS article_symbols_published_at ON article_symbols (symbol, published_at);
+CREATE INDEX IF NOT EXISTS article_symbols_article ON article_symbols (article_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5 (
+    title, content, content='articles', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts (rowid, title, content) VALUES (new.id, new.title, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_fts_update AFTER UPDATE ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+    INSERT INTO articles_fts (rowid, title, content) VALUES (new.id, new.title, new.content);
+END;
+"""
+
+COLUMNS = ('key', 'title', 'content', 'date', 'published_at', 'author', 'category', 'source', 'article_url',
+           'article_thumbnail_url')
+RESULT_COLUMNS = ('id', 'published_at') + FIELDS
+
+Symbols = Union[Iterable[str], Callable[[Dict[str, Any]], Iterable[str]], None]
+
+
+def _epoch(value) -> Optional[int]:
+    """UTC seconds of a date, datetime or date string; None when it cannot be parsed"""
+    if value is None or value == '':
+        return None
+    try:
+        stamp = pd.Timestamp(value)
+    except (ValueError, TypeError):
+        return None
+    if pd.isna(stamp):
+        return None
+    stamp = stamp.tz_localize('UTC') if stamp.tzinfo is None else stamp.tz_convert('UTC')
+    return int(stamp.timestamp())
+
+
+def _text(value) -> Optional[str]:
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (list, tuple)):
+        return ', '.join(map(str, value))
+    return value.isoformat() if hasattr(value, 'isoformat') else str(value)
+
+
+def _symbol(code: str) -> str:
+    """'thyao.is' -> 'THYAO'"""
+    return code.strip().upper().split('.')[0]
+
+
+class NewsArchive:
+    """News articles in SQLite with an FTS5 index over title and content."""
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA foreign_keys = ON')
+        if path != ':memory:':
+            self._conn.execute('PRAGMA journal_mode = WAL')
+            self._conn.execute('PRAGMA synchronous = NORMAL')
+        # FTS segments merge in the page cache during bulk adds
+        self._conn.execute('PRAGMA cache_size = -65536')
+        with self._conn:
+            self._conn.executescript(SCHEMA)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT count(*) FROM articles').fetchone()[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def add(self, news: Union[NewsBatch, Iterable[Any]], symbols: Symbols = None) -> int:
+        """
+        Index articles (a NewsBatch, News objects or dicts with News keys) and
+        tag them with ``symbols``: codes for every article, or a function of an
+        article record returning its codes. Returns how many were new.
+        """
+        if not isinstance(news, NewsBatch):
+            news = list(news)
+            news = NewsBatch.from_records(news) if news and isinstance(news[0], dict) else NewsBatch.from_news(news)
+        records = news.to_records()
+        rows, keys = [], []
+        for record in records:
+            published_at = _epoch(record['date'])
+            url = normalize_url(record['article_url'] or '')
+            key = url or f"{normalize_text(record['title'] or '')}|{published_at}"
+            keys.append(key)
+            rows.append((key, record['title'], record['content'], _text(record['date']), published_at,
+                         _text(record['author']), record['category'], record['source'], record['article_url'],
+                         record['article_thumbnail_url']))
+
+        tags = []
+        if symbols is not None:
+            fixed = None if callable(symbols) else [_symbol(code) for code in symbols]
+            for key, record in zip(keys, records):
+                for code in (fixed if fixed is not None else map(_symbol, symbols(record) or ())):
+                    tags.append((code, key))
+
+        with self._lock, self._conn:
+            added = self._conn.executemany(
+                f"INSERT INTO articles ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))}) "
+                "ON CONFLICT (key) DO NOTHING", rows).rowcount
+            if tags:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO article_symbols (symbol, published_at, article_id) "
+                    "SELECT ?, published_at, id FROM articles WHERE key = ?", tags)
+        return added
+
+    def search(self, query: Optional[str] = None, symbols: Optional[Iterable[str]] = None, since=None, until=None,
+               sources: Optional[Iterable[str]] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Articles matching the FTS5 ``query`` (best BM25 rank first, 'rank' in
+        each record) or, without one, the newest articles; published in
+        [since, until), from ``sources`` and tagged with any of ``symbols``.
+        """
+        times, time_params = [], []
+        if since is not None:
+            times.append('published_at >= ?')
+            time_params.append(_epoch(since))
+        if until is not None:
+            times.append('published_at < ?')
+            time_params.append(_epoch(until))
+        where = [f'a.{clause}' for clause in times]
+        params = list(time_params)
+        if sources is not None:
+            sources = list(sources)
+            where.append(f"a.source IN ({', '.join('?' * len(sources))})")
+            params.extend(sources)
+        if symbols is not None:
+            # The tag index also holds the publish time, so symbol + date ranges stay on one index
+            codes = [_symbol(code) for code in symbols]
+            tagged = ' AND '.join([f"symbol IN ({', '.join('?' * len(codes))})"] + times)
+            where.append(f"a.id IN (SELECT article_id FROM article_symbols WHERE {tagged})")
+            params.extend(codes + time_params)
+
+        columns = ', '.join(f'a.{column}' for column in RESULT_COLUMNS)
+        if query:
+            sql = (f"SELECT {columns}, bm25(articles_fts, {TITLE_WEIGHT}, {CONTENT_WEIGHT}) AS rank "
+                   "FROM articles_fts JOIN articles a ON a.id = articles_fts.rowid "
+                   f"WHERE articles_fts MATCH ? {''.join(' AND ' + clause for clause in where)} "
+                   "ORDER BY rank LIMIT ?")
+            params = [query] + params + [limit]
+        else:
+            sql = (f"SELECT {columns}, NULL AS rank FROM articles a "
+                   f"{'WHERE ' + ' AND '.join(where) if where else ''} "
+                   "ORDER BY a.published_at DESC LIMIT ?")
+            params = params + [limit]
+
+        with self._lock:
+            try:
+                rows = self._conn.execute(sql, params).fetchall()
+            except sqlite3.OperationalError as e:
+                raise ValueError(f"Invalid news search {query!r}: {e}") from e
+            ids = [row[0] for row in rows]
+            tags: Dict[int, List[str]] = {}
+            if ids:
+                for article_id, symbol in self._conn.execute(
+                        f"SELECT article_id, symbol FROM article_symbols WHERE article_id IN "
+                        f"({', '.join('?' * len(ids))})", ids):
+                    tags.setdefault(article_id, []).append(symbol)
+
+        results = []
+        for row in rows:
+            record = dict(zip(RESULT_COLUMNS + ('rank',), row))
+            record['symbols'] = sorted(tags.get(record['id'], []))
+            results.append(record)
+        return results
+
+    def optimize(self) -> None:
+        """Merge the FTS index segments, e.g. after a large import"""
+        with self._lock, self._conn:
+            self._conn.execute("INSERT INTO articles_fts (articles_fts) VALUES ('optimize')")
@@ -6,8 +6,16 @@
 @date: 2025-03-16 15:37:42
 Description: Sabah.com.tr web sitesinden canlı borsa verilerini çeker.
 """
+import json
+
 import requests
 
+# Keys (compared case-insensitively) that carry the code and the company name
+# of a hissesearch entry. Only exact key names count: a substring match would
+# also pick up fields such as 'LastTradeDate'.
+SYMBOL_KEYS = ('symbol', 'sembol', 'kod', 'code', 'hisse')
+NAME_KEYS = ('name', 'ad', 'unvan', 'title')
+
 def get_live_stock_market_data() -> dict:
   #TODO: IMPLEMENT THIS FUNCTION (IN DEVELOPMENT)
   url: str = 'https://www.sabah.com.tr/json/canli-borsa-verileri'
@@ -28,5 +36,33 @@ def get_stock_symbol_list() -> list:
   print(fetched_data)
   return fetched_data
 
+def parse_stock_symbol_list(fetched_data: str) -> list:
+  """
+  Turns the hissesearch response into [{'symbol': 'THYAO', 'name': 'TÜRK HAVA YOLLARI'}, ...].
+  Accepts a JSON list of strings or of objects keyed by SYMBOL_KEYS/NAME_KEYS.
+  """
+  items = json.loads(fetched_data)
+  if isinstance(items, dict):
+    items = next((value for value in items.values() if isinstance(value, list)), [])
+
+  symbols = []
+  for item in items:
+    if isinstance(item, str):
+      symbols.append({'symbol': item.strip().upper(), 'name': None})
+      continue
+    if not isinstance(item, dict):
+      continue
+    fields = {key.lower(): value for key, value in item.items() if value}
+    code = next((fields[key] for key in SYMBOL_KEYS if key in fields), None)
+    name = next((fields[key] for key in NAME_KEYS if key in fields), None)
+    if code:
+      symbols.append({'symbol': str(code).strip().upper(), 'name': name})
+  return symbols
+
+def get_stock_symbols() -> list:
+  """Full BIST symbol list as dicts, without printing the raw response."""
+  response: requests.Response = requests.get('https://www.sabah.com.tr/json/hissesearch', timeout=10)
+  return parse_stock_symbol_list(response.text)
+
 if __name__ == '__main__':
   get_live_stock_market_data()
@@ -4,3 +4,8 @@ from .news import (
   BloombergQuery,
   NewsAPIQuery
 )
+from .ratelimit import TokenBucket, HostLimiter
+from .extract import ArticleExtractor
+from .dedup import NewsDeduplicator
+from .batch import NewsBatch
+from .poller import BloomFilter, NewsPoller
@@ -0,0 +1,114 @@
+"""
+Column-wise storage for many news articles.
+
+    batch = NewsBatch.from_records(rows)          # or NewsBatch.from_news(news_list)
+    frame = batch.to_pandas()                     # no copy of the columns
+    table = batch.to_arrow()                      # needs pyarrow
+    cursor.executemany(INSERT, batch.rows())      # bulk insert
+
+Every News field is one NumPy object array, so a batch costs eight arrays
+(plus the strings) instead of one object per article, and ``to_pandas``
+hands the arrays to the DataFrame without copying them. News objects are
+only built when an item is indexed or iterated.
+"""
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .news import News
+
+FIELDS = News.FIELDS
+
+
+def _array(values: Sequence[Any]) -> np.ndarray:
+  array = np.empty(len(values), dtype=object)
+  array[:] = values
+  return array
+
+
+class NewsBatch:
+  """News fields as equally long object columns, in News.FIELDS order."""
+
+  def __init__(self, columns: Dict[str, Sequence[Any]]):
+    unknown = set(columns) - set(FIELDS)
+    if unknown:
+      raise ValueError(f"Unknown news fields {sorted(unknown)}, expected some of {list(FIELDS)}")
+    lengths = {len(values) for values in columns.values()}
+    if len(lengths) > 1:
+      raise ValueError(f"News columns have different lengths: {sorted(lengths)}")
+    size = lengths.pop() if lengths else 0
+    self.columns: Dict[str, np.ndarray] = {}
+    for field in FIELDS:
+      if field in columns:
+        values = columns[field]
+        self.columns[field] = values if isinstance(values, np.ndarray) and values.dtype == object else _array(values)
+      else:
+        self.columns[field] = _array([News.DEFAULTS.get(field)] * size)
+
+  @classmethod
+  def from_records(cls, records: Iterable[Dict[str, Any]]) -> "NewsBatch":
+    """Batch from dicts with lower-case News keys, without building News objects"""
+    records = records if isinstance(records, list) else list(records)
+    return cls({
+      field: [record.get(field, News.DEFAULTS.get(field)) for record in records] for field in FIELDS
+    })
+
+  @classmethod
+  def from_news(cls, items: Iterable[News]) -> "NewsBatch":
+    items = items if isinstance(items, list) else list(items)
+    return cls({field: [getattr(news, f'_{field}') for news in items] for field in FIELDS})
+
+  @classmethod
+  def concat(cls, batches: Iterable["NewsBatch"]) -> "NewsBatch":
+    batches = list(batches)
+    if not batches:
+      return cls({})
+    return cls({field: np.concatenate([batch.columns[field] for batch in batches]) for field in FIELDS})
+
+  def __len__(self) -> int:
+    return len(self.columns['title'])
+
+  def __getitem__(self, key):
+    """News for an integer position, a sub-batch for a slice, mask or index array"""
+    if isinstance(key, (int, np.integer)):
+      return News._from_values(*(self.columns[field][key] for field in FIELDS))
+    return NewsBatch({field: values[key] for field, values in self.columns.items()})
+
+  def __iter__(self) -> Iterator[News]:
+    return (News._from_values(*values) for values in self.rows())
+
+  def __repr__(self) -> str:
+    return f"NewsBatch({len(self)} articles)"
+
+  def column(self, name: str) -> np.ndarray:
+    if name not in self.columns:
+      raise ValueError(f"Unknown news field {name!r}, expected one of {list(FIELDS)}")
+    return self.columns[name]
+
+  def rows(self) -> Iterator[Tuple[Any, ...]]:
+    """One tuple per article in News.FIELDS order, e.g. for ``executemany``"""
+    return zip(*(self.columns[field] for field in FIELDS))
+
+  def to_records(self) -> List[Dict[str, Any]]:
+    return [dict(zip(FIELDS, row)) for row in self.rows()]
+
+  def to_pandas(self, copy: bool = False) -> pd.DataFrame:
+    """DataFrame over the columns; without ``copy`` it shares their memory"""
+    return pd.DataFrame(self.columns, columns=list(FIELDS), copy=copy)
+
+  def to_arrow(self):
+    """pyarrow Table with string columns (lists of authors joined with ', ', dates as text)"""
+    try:
+      import pyarrow as pa
+    except ImportError:
+      raise ImportError("NewsBatch.to_arrow needs pyarrow, install it with: pip install pyarrow")
+    arrays = {}
+    for field in FIELDS:
+      values = self.columns[field]
+      if field == 'author':
+        values = [', '.join(value) if isinstance(value, list) else value for value in values]
+      elif field == 'date':
+        values = [value.isoformat() if hasattr(value, 'isoformat') else value for value in values]
+      arrays[field] = pa.array(values, type=pa.string(), from_pandas=True)
+    return pa.table(arrays)
@@ -0,0 +1,205 @@
+"""
+Duplicate and near-duplicate news detection.
+
+    dedup = NewsDeduplicator(window=6 * 3600)
+    fresh = dedup.filter(bloomberg_news + newsapi_articles + coindesk_headlines)
+    dedup.ratio            # share of the items seen so far that were duplicates
+
+An item is a duplicate when its normalized URL or normalized title was seen
+before (exact), or when the word pairs of its title and content overlap
+those of one seen before by at least ``threshold`` (near: rewrites,
+syndicated copies with a different headline suffix, ...; Jaccard similarity
+estimated with MinHash). Items can be News objects, NewsAPI article dicts or
+plain headline strings.
+
+Only items added in the last ``window`` seconds, and at most ``max_entries``
+of them, are remembered. Near duplicates are looked up through band tables
+(MinHash LSH): an item is only compared with the remembered items that share
+a whole band of its signature.
+"""
+import hashlib
+import re
+import threading
+import time
+import unicodedata
+from collections import deque
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import numpy as np
+
+# Fewer words than this are too little text to compare by overlap
+MIN_NEAR_TOKENS = 4
+TRACKING_PARAMS = re.compile(r'^(utm_.*|fbclid|gclid|mc_cid|mc_eid|ref|cmpid|src|taid|srnd|leadsource)$', re.I)
+_NON_WORD = re.compile(r'[^\w\s]+')
+
+
+def _hash64(text: str) -> int:
+  return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def normalize_url(url: str) -> str:
+  """Lower-case host without 'www.', no fragment, tracking parameters or trailing slash, sorted query"""
+  if not url:
+    return ''
+  parts = urlsplit(url.strip())
+  host = parts.netloc.lower()
+  host = host[4:] if host.startswith('www.') else host
+  query = sorted((key, value) for key, value in parse_qsl(parts.query) if not TRACKING_PARAMS.match(key))
+  return urlunsplit(('', host, parts.path.rstrip('/'), urlencode(query), ''))
+
+
+def normalize_text(text: str) -> str:
+  """Case-folded words without punctuation or accents, single spaced"""
+  if not text:
+    return ''
+  text = unicodedata.normalize('NFKD', text.casefold())
+  text = ''.join(c for c in text if not unicodedata.combining(c))
+  return ' '.join(_NON_WORD.sub(' ', text).split())
+
+
+def shingles(text: str) -> Set[str]:
+  """Word pairs of normalized text (the words themselves for one-word texts)"""
+  tokens = text.split()
+  return {' '.join(pair) for pair in zip(tokens, tokens[1:])} or set(tokens)
+
+
+class MinHash:
+  """``num_perm`` multiply-shift hash functions; the signature is their minimum over the shingles."""
+
+  def __init__(self, num_perm: int = 64, seed: int = 1):
+    rng = np.random.default_rng(seed)
+    self.a = rng.integers(1, 2**63, num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+    self.b = rng.integers(0, 2**63, num_perm, dtype=np.uint64)
+
+  def signature(self, items: Set[str]) -> np.ndarray:
+    hashes = np.fromiter((_hash64(item) for item in items), dtype=np.uint64, count=len(items))
+    # uint64 arithmetic wraps, which is the multiply-shift scheme
+    return ((hashes[:, None] * self.a + self.b) >> np.uint64(32)).min(axis=0).astype(np.uint32)
+
+
+def _fields(item: Any) -> Tuple[str, str, str]:
+  """(url, title, content) of a News, an article dict or a headline string"""
+  if isinstance(item, str):
+    return '', item, ''
+  if isinstance(item, dict):
+    return (item.get('url') or item.get('article_url') or '', item.get('title') or '',
+            item.get('content') or item.get('description') or '')
+  return item.article_url or '', item.title or '', item.content or ''
+
+
+class NewsDeduplicator:
+  """Remembers recent news items and tells whether a new one repeats one of them."""
+
+  def __init__(self, window: float = 6 * 3600, max_entries: int = 10_000, threshold: float = 0.7,
+               num_perm: int = 64, bands: int = 16, clock: Callable[[], float] = time.time):
+    if not 0 < threshold <= 1:
+      raise ValueError('threshold must be in (0, 1]')
+    if num_perm % bands:
+      raise ValueError('num_perm must be a multiple of bands')
+    self.window = window
+    self.max_entries = max_entries
+    self.threshold = threshold
+    self.clock = clock
+    self._minhash = MinHash(num_perm)
+    self._rows = num_perm // bands
+    self._lock = threading.Lock()
+    self._next_id = 0
+    # id -> (time, url hash, title hash, signature or None, key)
+    self._entries: Dict[int, tuple] = {}
+    self._order: deque = deque()
+    self._urls: Dict[int, int] = {}
+    self._titles: Dict[int, int] = {}
+    self._band_tables: List[Dict[bytes, Set[int]]] = [{} for _ in range(bands)]
+    self.seen = 0
+    self.exact = 0
+    self.near = 0
+
+  @property
+  def ratio(self) -> float:
+    """Duplicates / items seen"""
+    return (self.exact + self.near) / self.seen if self.seen else 0.0
+
+  def stats(self) -> Dict[str, float]:
+    return {'seen': self.seen, 'unique': self.seen - self.exact - self.near, 'exact': self.exact,
+            'near': self.near, 'ratio': self.ratio, 'remembered': len(self._entries)}
+
+  def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+    return [signature[i:i + self._rows].tobytes() for i in range(0, len(signature), self._rows)]
+
+  def _expire(self, now: float) -> None:
+    while self._order and (len(self._order) > self.max_entries or self._entries[self._order[0]][0] < now - self.window):
+      entry_id = self._order.popleft()
+      _, url, title, signature, _ = self._entries.pop(entry_id)
+      if self._urls.get(url) == entry_id:
+        del self._urls[url]
+      if self._titles.get(title) == entry_id:
+        del self._titles[title]
+      if signature is not None:
+        for band, table in zip(self._band_keys(signature), self._band_tables):
+          ids = table.get(band)
+          if ids is not None:
+            ids.discard(entry_id)
+            if not ids:
+              del table[band]
+
+  def _near(self, signature: np.ndarray) -> Optional[int]:
+    candidates: Set[int] = set()
+    for band, table in zip(self._band_keys(signature), self._band_tables):
+      candidates |= table.get(band, set())
+    for entry_id in sorted(candidates):
+      # Share of equal MinHash values estimates the Jaccard similarity
+      if np.mean(self._entries[entry_id][3] == signature) >= self.threshold:
+        return entry_id
+    return None
+
+  def add(self, item: Any, key: Hashable = None) -> Optional[Hashable]:
+    """
+    Remember ``item`` unless it duplicates a remembered one. Returns None for
+    a new item, else the key of the item it repeats (``key`` defaults to the
+    item itself).
+    """
+    url, title, content = _fields(item)
+    url = normalize_url(url)
+    title = normalize_text(title)
+    text = normalize_text(f'{title} {content}') if content else title
+    url_hash = _hash64(url) if url else None
+    title_hash = _hash64(title) if title else None
+    signature = self._minhash.signature(shingles(text)) if len(text.split()) >= MIN_NEAR_TOKENS else None
+
+    with self._lock:
+      now = self.clock()
+      self._expire(now)
+      self.seen += 1
+      original = self._urls.get(url_hash) if url_hash is not None else None
+      if original is None and title_hash is not None:
+        original = self._titles.get(title_hash)
+      if original is not None:
+        self.exact += 1
+        return self._entries[original][4]
+      if signature is not None:
+        original = self._near(signature)
+        if original is not None:
+          self.near += 1
+          return self._entries[original][4]
+
+      entry_id = self._next_id
+      self._next_id += 1
+      self._entries[entry_id] = (now, url_hash, title_hash, signature, item if key is None else key)
+      self._order.append(entry_id)
+      if url_hash is not None:
+        self._urls[url_hash] = entry_id
+      if title_hash is not None:
+        self._titles[title_hash] = entry_id
+      if signature is not None:
+        for band, table in zip(self._band_keys(signature), self._band_tables):
+          table.setdefault(band, set()).add(entry_id)
+      return None
+
+  def is_duplicate(self, item: Any) -> bool:
+    """Whether ``item`` repeats a remembered item (a new one is remembered)"""
+    return self.add(item) is not None
+
+  def filter(self, items: Iterable[Any]) -> List[Any]:
+    """Items that are not duplicates, in order"""
+    return [item for item in items if self.add(item) is None]
@@ -0,0 +1,189 @@
+"""
+Single-pass article extraction for scraped search pages.
+
+    extractor = ArticleExtractor()
+    for fields in extractor.extract_page(html, limit=5):
+        fields['title'], fields['content'], fields['date'], fields['author'], fields['category']
+
+Every field has a list of selectors (a tag name set or a substring of the
+class attribute, case-insensitive), compiled once. Each article element is
+walked once: every descendant is tested against the selectors ranked above
+the field's current match, so a field ends up with the first node of its
+best ranked matching selector. The walk stops early once every field has
+matched its first ranked selector.
+
+Selector ranks are learned: a selector that wins on a page moves ahead of
+selectors that have won less often, so after a few pages the layout the site
+actually uses is tried first and the walk usually ends early. Since a field
+takes the node of its best ranked matching selector, learning can change the
+extracted node, not only the speed: when an article has both a ``<p>`` and a
+``class="summary"`` element and 'summary' has been winning, the summary is
+taken. Pass ``learn=False`` for the fixed order of ``SELECTORS``, which picks
+the same nodes as the previous find() chains.
+
+Pages are parsed by lxml directly when it is installed (most of the time
+goes into building the tree, and lxml builds it in C), else by
+BeautifulSoup's ``html.parser``; any other BeautifulSoup parser name also
+works as ``parser``.
+"""
+import threading
+from importlib.util import find_spec
+from typing import Dict, List, Optional, Tuple
+
+from bs4 import BeautifulSoup, Tag
+
+PARSER = 'lxml' if find_spec('lxml') is not None else 'html.parser'
+
+Selector = Tuple[str, object]
+
+# Field -> selectors in their initial order: ('tag', names) or ('class', substring)
+SELECTORS: Dict[str, List[Selector]] = {
+  'title': [('tag', frozenset(('h1', 'h2', 'h3'))), ('class', 'title'), ('class', 'headline'), ('class', 'name'),
+            ('class', 'articlename'), ('class', 'articletitle'), ('class', 'article_name'),
+            ('class', 'article_title')],
+  'content': [('tag', frozenset(('p',))), ('class', 'summary'), ('class', 'description'), ('class', 'content')],
+  'date': [('tag', frozenset(('time',))), ('class', 'time'), ('class', 'date'), ('class', 'publishedat'),
+           ('class', 'published_at'), ('class', 'uploadat'), ('class', 'upload_at')],
+  'author': [('class', 'author'), ('class', 'authors'), ('class', 'byline')],
+  'category': [('class', 'category'), ('class', 'categories'), ('class', 'tag'), ('class', 'tags'),
+               ('class', 'eyebrow')],
+}
+
+# Containers tried in order, the first one found on the page is used
+ARTICLE_SELECTORS: List[Selector] = [
+  ('tag', frozenset(('article',))), ('class', 'story'), ('class', 'article'), ('class', 'news'),
+]
+
+
+def _class_string(node: Tag) -> str:
+  classes = node.attrs.get('class')
+  if not classes:
+    return ''
+  return (classes if isinstance(classes, str) else ' '.join(classes)).lower()
+
+
+class _SoupTree:
+  """BeautifulSoup nodes"""
+
+  def __init__(self, parser: str):
+    self.parser = parser
+
+  def parse(self, html: str):
+    return BeautifulSoup(html, self.parser)
+
+  @staticmethod
+  def walk(root, include_root: bool = False):
+    return (node for node in root.descendants if isinstance(node, Tag))
+
+  @staticmethod
+  def node(node) -> Tuple[str, str]:
+    return node.name, _class_string(node)
+
+  @staticmethod
+  def text(node) -> str:
+    return node.get_text()
+
+
+class _LxmlTree:
+  """lxml.html elements, comments and processing instructions skipped"""
+
+  def __init__(self):
+    import lxml.html
+    self._html = lxml.html
+
+  def parse(self, html: str):
+    return self._html.document_fromstring(html) if html.strip() else None
+
+  @staticmethod
+  def walk(root, include_root: bool = False):
+    if root is None:
+      return ()
+    nodes = root.iter() if include_root else root.iterdescendants()
+    return (node for node in nodes if isinstance(node.tag, str))
+
+  @staticmethod
+  def node(node) -> Tuple[str, str]:
+    return node.tag, (node.get('class') or '').lower()
+
+  @staticmethod
+  def text(node) -> str:
+    return node.text_content()
+
+
+def _matches(selector: Selector, name: str, classes: str) -> bool:
+  kind, value = selector
+  return name in value if kind == 'tag' else value in classes
+
+
+class ArticleExtractor:
+  """Extracts title, content, date, author and category of each article on a page."""
+
+  def __init__(self, selectors: Optional[Dict[str, List[Selector]]] = None, parser: Optional[str] = None,
+               learn: bool = True):
+    self.selectors = {field: list(items) for field, items in (selectors or SELECTORS).items()}
+    self.parser = parser or PARSER
+    self._tree = _LxmlTree() if self.parser == 'lxml' else _SoupTree(self.parser)
+    self.learn = learn
+    self.wins: Dict[str, List[int]] = {field: [0] * len(items) for field, items in self.selectors.items()}
+    self._order = {field: list(range(len(items))) for field, items in self.selectors.items()}
+    self._lock = threading.Lock()
+
+  def order(self, field: str) -> List[Selector]:
+    """Selectors of ``field`` in the order they are currently ranked"""
+    return [self.selectors[field][i] for i in self._order[field]]
+
+  def parse(self, html: str):
+    return self._tree.parse(html)
+
+  def articles(self, root) -> list:
+    """Article containers of the first ARTICLE_SELECTORS entry that finds any, in one walk"""
+    found: List[list] = [[] for _ in ARTICLE_SELECTORS]
+    for node in self._tree.walk(root, include_root=True):
+      name, classes = self._tree.node(node)
+      for i, selector in enumerate(ARTICLE_SELECTORS):
+        if selector[0] == 'class' and name != 'div':
+          continue
+        if _matches(selector, name, classes):
+          found[i].append(node)
+    return next((nodes for nodes in found if nodes), [])
+
+  def extract(self, element) -> Dict[str, Optional[str]]:
+    """Text of every field in ``element``, None for fields nothing matched"""
+    with self._lock:
+      orders = {field: list(order) for field, order in self._order.items()}
+    plan = [(field, [self.selectors[field][i] for i in order]) for field, order in orders.items()]
+    found = {}
+    best = {field: len(selectors) for field, selectors in plan}
+    open_fields = len(plan)
+
+    for node in self._tree.walk(element):
+      name, classes = self._tree.node(node)
+      for field, selectors in plan:
+        # Only a better ranked selector than the current match can change the field
+        for rank in range(best[field]):
+          if _matches(selectors[rank], name, classes):
+            found[field] = node
+            best[field] = rank
+            open_fields -= rank == 0
+            break
+      if not open_fields:
+        break
+
+    result: Dict[str, Optional[str]] = {}
+    for field, _ in plan:
+      node = found.get(field)
+      result[field] = self._tree.text(node).strip() if node is not None else None
+      if self.learn and node is not None:
+        self._won(field, orders[field][best[field]])
+    return result
+
+  def _won(self, field: str, index: int) -> None:
+    with self._lock:
+      self.wins[field][index] += 1
+      wins = self.wins[field]
+      # Stable: ties keep the SELECTORS order
+      self._order[field] = sorted(range(len(wins)), key=lambda i: -wins[i])
+
+  def extract_page(self, html: str, limit: Optional[int] = None) -> List[Dict[str, Optional[str]]]:
+    """Fields of the first ``limit`` articles of a page"""
+    return [self.extract(element) for element in self.articles(self.parse(html))[:limit]]
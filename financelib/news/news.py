@@ -1,13 +1,22 @@
 import datetime
+import hashlib
 import requests
 
+import pandas as pd
+
 from newsapi import NewsApiClient
+from newsapi.newsapi_exception import NewsAPIException
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+import time, os, threading
 
-from bs4 import BeautifulSoup
-from typing import List, Dict
-import time, os
+from .dedup import NewsDeduplicator
+from .extract import ArticleExtractor
+from .ratelimit import LIMITER, HostLimiter
 
 from settings import (
+  logger,
   NEWS_API_APIKEY,
   news_api_setup,
   NEWS_TITLE_CHAR_LIMIT,
@@ -23,9 +32,15 @@ class News:
   article_url: str = ""
   article_thumbnail_url: str = ""
 
+  # Slots instead of a per-instance dict: archives hold millions of these
+  __slots__ = ('_title', '_content', '_date', '_author', '_category', '_source', '_article_url',
+               '_article_thumbnail_url')
+
+  FIELDS = ('title', 'content', 'date', 'author', 'category', 'source', 'article_url', 'article_thumbnail_url')
+  DEFAULTS = {'category': 'news', 'source': 'from god :)', 'article_url': '', 'article_thumbnail_url': ''}
+
   def __init__(self, data: Dict[str, str] = {}) -> None:
-    data =  {k.lower(): v for k, v in data.items()}
-    if data == {}:
+    if not data:
       self._title = ""
       self._content = ""
       self._date = ""
@@ -34,15 +49,50 @@ class News:
       self._source = "from god :)"
       self._article_thumbnail_url = ""
       self._article_url = ""
-    else:
-      self._title = data.get('title')
-      self._content = data.get('content')
-      self._date = data.get('date')
-      self._author = data.get('author')
-      self._category = data.get('category', 'news')
-      self._source = data.get('source', 'from god :)')
-      self._article_url = data.get('article_url', '')
-      self._article_thumbnail_url = data.get('article_thumbnail_url', '')
+      return
+    if not all(type(k) is str and k.islower() for k in data):
+      data = {k.lower(): v for k, v in data.items()}
+    self._title = data.get('title')
+    self._content = data.get('content')
+    self._date = data.get('date')
+    self._author = data.get('author')
+    self._category = data.get('category', 'news')
+    self._source = data.get('source', 'from god :)')
+    self._article_url = data.get('article_url', '')
+    self._article_thumbnail_url = data.get('article_thumbnail_url', '')
+
+  @classmethod
+  def _from_values(cls, title, content, date, author, category, source, article_url, article_thumbnail_url):
+    news = cls.__new__(cls)
+    news._title = title
+    news._content = content
+    news._date = date
+    news._author = author
+    news._category = category
+    news._source = source
+    news._article_url = article_url
+    news._article_thumbnail_url = article_thumbnail_url
+    return news
+
+  @classmethod
+  def from_records(cls, records: Iterable[Dict[str, Any]]) -> List['News']:
+    """
+    News for many dicts with lower-case keys (as from to_dict or a database
+    row), without the per-record key folding of News(data).
+    """
+    new, defaults = cls._from_values, cls.DEFAULTS
+    return [
+      new(get('title'), get('content'), get('date'), get('author'), get('category', defaults['category']),
+          get('source', defaults['source']), get('article_url', defaults['article_url']),
+          get('article_thumbnail_url', defaults['article_thumbnail_url']))
+      for get in (record.get for record in records)
+    ]
+
+  def to_dict(self) -> Dict[str, Any]:
+    return {field: getattr(self, f'_{field}') for field in self.FIELDS}
+
+  def __repr__(self) -> str:
+    return f"News(title={self._title!r}, source={self._source!r}, date={self._date!r})"
 
   @property
   def category(self) -> str:
@@ -141,16 +191,69 @@ class BaseQueryClass:
       'DNT': '1'
     }
 
+    # Requests per second (and burst) allowed on this source's host, shared by all instances
+    RATE: float = 1.0
+    BURST: int = 1
+    limiter: HostLimiter = LIMITER
+
     def search_articles(self, query: str, limit: int = 5, print_results: bool = False) -> List[News]:
         raise NotImplementedError("Please implement this method in your subclass")
 
+    def search_since(self, query: str, since: str = None, validators: Dict[str, Any] = None,
+                     **kwargs) -> Tuple[List[Any], Dict[str, Any]]:
+        """
+        (articles, validators) for incremental polling (see NewsPoller):
+        ``since`` is the newest publish time already seen, ``validators`` what
+        the previous call returned. Sources that support neither return all
+        articles.
+        """
+        return self.search_articles(query, **kwargs), validators
+
+    def wait_for_slot(self, url: str) -> float:
+        """Block until the host of ``url`` is under RATE again, instead of a fixed sleep"""
+        return self.limiter.acquire(url, rate=self.RATE, burst=self.BURST)
+
+    def iter_many(self, queries: Iterable[str], max_workers: int = 8, **kwargs) -> Iterator[Tuple[str, List[Any]]]:
+        """
+        Run search_articles for every query concurrently and yield
+        (query, articles) as each one finishes. A failing query is logged and
+        yields an empty list.
+        """
+        queries = list(dict.fromkeys(queries))
+        if not queries:
+            return
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(queries))) as executor:
+            futures = {executor.submit(self.search_articles, query, **kwargs): query for query in queries}
+            for future in as_completed(futures):
+                query = futures[future]
+                try:
+                    articles = future.result() or []
+                except Exception as e:
+                    logger.error(f"News search for {query!r} failed: {e}")
+                    articles = []
+                yield query, articles
+
+    def search_many(self, queries: Iterable[str], max_workers: int = 8, dedup: NewsDeduplicator = None,
+                    **kwargs) -> List[Any]:
+        """
+        Articles of every query merged in arrival order without duplicates. Pass
+        a long-lived ``dedup`` to also drop stories already returned by earlier calls.
+        """
+        dedup = dedup if dedup is not None else NewsDeduplicator()
+        merged = []
+        for _, articles in self.iter_many(queries, max_workers=max_workers, **kwargs):
+            merged.extend(dedup.filter(articles))
+        return merged
+
 
 class BloombergQuery(BaseQueryClass):
     BASE_URL = "https://www.bloomberg.com"
     SEARCH_URL = f"{BASE_URL}/search"
+    RATE = 0.5
 
-    def __init__(self):
+    def __init__(self, extractor: ArticleExtractor = None):
         self.session = requests.Session()
+        self.extractor = extractor or ArticleExtractor()
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
@@ -173,99 +276,44 @@ class BloombergQuery(BaseQueryClass):
         print()
 
 
-    def search_articles(self, query: str, limit: int = 5, print_results: bool = False) -> List[News]:
+    def _search_params(self, query: str) -> Dict[str, str]:
+        return {
+            'query': query,
+            'source': 'news',
+            'sort': 'relevancy'
+        }
+
+    def _parse_articles(self, html: str, limit: int) -> List[News]:
         articles = []
-        try:
-            params = {
-                'query': query,
-                'source': 'news',
-                'sort': 'relevancy'
-            }
+        # One walk per article element, see ArticleExtractor
+        for fields in self.extractor.extract_page(html, limit):
+            try:
+                if fields['title']:  # Only add if we found a title
+                    news = News({
+                        'title': fields['title'],
+                        'content': fields['content'] or "",
+                        'date': fields['date'] or "",
+                        'author': fields['author'] if fields['author'] is not None else "Bloomberg",
+                        'category': fields['category'].capitalize() if fields['category'] is not None else "news"
+                    })
+                    articles.append(news)
+
+            except Exception as e:
+                print(f"Error parsing article: {str(e)}")
+                continue
+        return articles
 
+    def search_articles(self, query: str, limit: int = 5, print_results: bool = False) -> List[News]:
+        try:
+            self.wait_for_slot(self.SEARCH_URL)
             response = self.session.get(
                 self.SEARCH_URL,
-                params=params,
+                params=self._search_params(query),
                 headers=self.headers
             )
             response.raise_for_status()
-            time.sleep(2)  # Add delay
-
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            # Try different article selectors
-            article_elements = (
-                soup.find_all('article') or
-                soup.find_all('div', class_=lambda x: x and 'story' in x.lower()) or
-                soup.find_all('div', class_=lambda x: x and 'article' in x.lower()) or
-                soup.find_all('div', class_=lambda x: x and 'news' in x.lower())
-            )
-
-            for article in article_elements[:limit]:
-                try:
-                    # More flexible title search
-                    title = (
-                        article.find(['h1', 'h2', 'h3']) or
-                        article.find(class_=lambda x: x and 'title' in x.lower()) or
-                        article.find(class_=lambda x: x and 'headline' in x.lower()) or
-                        article.find(class_=lambda x: x and 'name' in x.lower()) or
-                        article.find(class_=lambda x: x and 'articlename' in x.lower()) or
-                        article.find(class_=lambda x: x and 'articletitle' in x.lower()) or
-                        article.find(class_=lambda x: x and 'article_name' in x.lower()) or
-                        article.find(class_=lambda x: x and 'article_title' in x.lower())
-                    )
-                    title = title.get_text().strip() if title else ""
-
-                    # More flexible content search
-                    content = (
-                        article.find('p') or
-                        article.find(class_=lambda x: x and 'summary' in x.lower()) or
-                        article.find(class_=lambda x: x and 'description' in x.lower()) or
-                        article.find(class_=lambda x: x and 'content' in x.lower())
-                    )
-                    content = content.get_text().strip() if content else ""
-
-                    # More flexible date search
-                    date_element = (
-                        article.find('time') or
-                        article.find(class_=lambda x: x and 'time' in x.lower()) or
-                        article.find(class_=lambda x: x and 'date' in x.lower()) or
-                        article.find(class_=lambda x: x and 'publishedat' in x.lower()) or
-                        article.find(class_=lambda x: x and 'published_at' in x.lower()) or
-                        article.find(class_=lambda x: x and 'uploadat' in x.lower()) or
-                        article.find(class_=lambda x: x and 'upload_at' in x.lower())
-                    )
-                    date = date_element.get_text().strip() if date_element else ""
-
-                    # More flexible author search
-                    author_element = (
-                        article.find(class_=lambda x: x and 'author' in x.lower()) or
-                        article.find(class_=lambda x: x and 'authors' in x.lower()) or
-                        article.find(class_=lambda x: x and 'byline' in x.lower())
-                    )
-                    author = author_element.get_text().strip() if author_element else "Bloomberg"
-
-                    category_element = (
-                        article.find(class_=lambda x: x and 'category' in x.lower()) or
-                        article.find(class_=lambda x: x and 'categories' in x.lower()) or
-                        article.find(class_=lambda x: x and 'tag' in x.lower()) or
-                        article.find(class_=lambda x: x and 'tags' in x.lower()) or
-                        article.find(class_=lambda x: x and 'eyebrow' in x.lower())
-                    )
-                    category = category_element.get_text().strip().capitalize() if category_element else "news"
-
-                    if title:  # Only add if we found a title
-                        news = News({
-                            'title': title,
-                            'content': content,
-                            'date': date,
-                            'author': author,
-                            'category': category
-                        })
-                        articles.append(news)
 
-                except Exception as e:
-                    print(f"Error parsing article: {str(e)}")
-                    continue
+            articles = self._parse_articles(response.text, limit)
 
             if print_results:
               for article in articles:
@@ -286,12 +334,64 @@ class BloombergQuery(BaseQueryClass):
             print(f"Error fetching articles: {str(e)}")
             return []
 
+    def search_since(self, query: str, since: str = None, validators: Dict[str, Any] = None,
+                     limit: int = 5) -> Tuple[List[News], Dict[str, Any]]:
+        """
+        Search page fetched with If-None-Match / If-Modified-Since from the last
+        call's ETag and Last-Modified. A 304, or a body identical to the last
+        one, returns no articles without parsing. Bloomberg search has no date
+        filter, so ``since`` is not used. Errors are raised, not printed.
+        """
+        validators = dict(validators or {})
+        headers = dict(self.headers)
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+
+        self.wait_for_slot(self.SEARCH_URL)
+        response = self.session.get(self.SEARCH_URL, params=self._search_params(query), headers=headers)
+        if response.status_code == 304:
+            return [], validators
+        response.raise_for_status()
+
+        digest = hashlib.blake2b(response.content, digest_size=16).hexdigest()
+        unchanged = digest == validators.get('digest')
+        validators = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'digest': digest,
+        }
+        return ([] if unchanged else self._parse_articles(response.text, limit)), validators
+
+
+def _published(value) -> pd.Timestamp | None:
+  """UTC time of an ISO 8601 string ('...Z' included), date or datetime; None when it cannot be parsed"""
+  if value is None or value == '':
+    return None
+  try:
+    stamp = pd.Timestamp(value)
+  except (ValueError, TypeError):
+    return None
+  if pd.isna(stamp):
+    return None
+  return stamp.tz_localize('UTC') if stamp.tzinfo is None else stamp.tz_convert('UTC')
+
+
 class NewsAPIQuery(BaseQueryClass):
+  BASE_URL = "https://newsapi.org"
+  # NewsAPI's largest page
+  PAGE_SIZE = 100
+  # The sources catalogue rarely changes; fetch it at most once a day
+  SOURCES_TTL = 24 * 3600
+  clock = time.monotonic
 
   def __init__(self, api_key: str = ''):
     global NEWS_API_APIKEY
     _api_key: str  = news_api_setup(api_key)
     self.newsapi: NewsApiClient = NewsApiClient(api_key=_api_key)
+    self._sources_cache: Tuple[float, List[Dict[str, str]]] | None = None
+    self._sources_lock = threading.Lock()
 
   def print_article_details(self, article: News) -> None:
         print()
@@ -308,15 +408,18 @@ class NewsAPIQuery(BaseQueryClass):
         print("-----------------------------------")
         print()
 
-  def search_articles(self, query, sources_from_ids: str | List[str], limit: int = 5,
-                      print_results: bool = False) -> List[News]:
+  def search_articles(self, query, sources_from_ids: str | List[str] = None, limit: int = 5,
+                      print_results: bool = False, since: str = None) -> List[News]:
+    """``since`` (ISO 8601) asks NewsAPI only for articles published from then on"""
     sources = ''
     if sources_from_ids is not None and type(sources_from_ids) is list:
        sources=','.join(sources_from_ids)
 
+    self.wait_for_slot(self.BASE_URL)
     all_articles = self.newsapi.get_everything(
       q=query,
       sources=sources,
+      **({'from_param': since} if since else {})
     )
 
     if print_results:
@@ -324,13 +427,90 @@ class NewsAPIQuery(BaseQueryClass):
        self.print_article_details(article)
 
     return all_articles['articles']
-  def get_all_news_source_ids(self) -> List[str]:
-    sources = self.newsapi.get_sources()
-    return [source['id'] for source in sources['sources']]
 
-  def get_all_news_sources_detailed(self) -> List[Dict[str, str]]:
-    sources = self.newsapi.get_sources()
-    return sources['sources']
+  def search_since(self, query, since: str = None, validators: Dict[str, Any] = None, **kwargs):
+    """NewsAPI's ``from`` parameter set to the high-water mark; it has no ETag support"""
+    return self.search_articles(query, since=since, **kwargs), validators
+
+  def _get_page(self, page: int, page_size: int, params: Dict[str, Any]) -> Dict[str, Any]:
+    self.wait_for_slot(self.BASE_URL)
+    try:
+      return self.newsapi.get_everything(page=page, page_size=page_size, **params)
+    except NewsAPIException as e:
+      # Plans cap how deep a search can be paged; what was fetched so far stands
+      if e.get_exception().get('code') == 'maximumResultsReached':
+        logger.warning(f"NewsAPI result limit reached at page {page} for {params.get('q')!r}")
+        return {'totalResults': 0, 'articles': []}
+      raise
+
+  def iter_articles(self, query, sources_from_ids: str | List[str] = None, since=None, until=None,
+                    limit: int = None, page_size: int = PAGE_SIZE,
+                    sort_by: str = 'publishedAt') -> Iterator[Dict[str, Any]]:
+    """
+    Every article matching ``query`` published in [since, until], page after
+    page, fetching the next page in the background while the current one is
+    consumed. Stops after ``limit`` articles, after the last page or, newest
+    first, at the first article published before ``since``.
+    """
+    if not 1 <= page_size <= self.PAGE_SIZE:
+      raise ValueError(f"page_size must be between 1 and {self.PAGE_SIZE}")
+    if limit is not None and limit <= 0:
+      return
+
+    params: Dict[str, Any] = {'q': query, 'sort_by': sort_by}
+    if sources_from_ids:
+      params['sources'] = sources_from_ids if isinstance(sources_from_ids, str) else ','.join(sources_from_ids)
+    if since:
+      params['from_param'] = since.isoformat() if hasattr(since, 'isoformat') else since
+    if until:
+      params['to'] = until.isoformat() if hasattr(until, 'isoformat') else until
+    boundary = _published(since) if since and sort_by == 'publishedAt' else None
+
+    def before_boundary(article) -> bool:
+      published = _published(article.get('publishedAt'))
+      return boundary is not None and published is not None and published < boundary
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    future = executor.submit(self._get_page, 1, page_size, params)
+    page, count = 1, 0
+    try:
+      while future is not None:
+        response = future.result()
+        articles = response.get('articles') or []
+        future = None
+        last = (len(articles) < page_size or page * page_size >= (response.get('totalResults') or 0)
+                or (limit is not None and count + len(articles) >= limit)
+                or before_boundary(articles[-1]))
+        if not last:
+          page += 1
+          future = executor.submit(self._get_page, page, page_size, params)
+
+        for article in articles:
+          if before_boundary(article):
+            return
+          yield article
+          count += 1
+          if limit is not None and count >= limit:
+            return
+    finally:
+      if future is not None:
+        future.cancel()
+      executor.shutdown(wait=False, cancel_futures=True)
+
+  def _sources(self, refresh: bool = False) -> List[Dict[str, str]]:
+    """The sources catalogue, fetched again once older than SOURCES_TTL seconds"""
+    with self._sources_lock:
+      cached = self._sources_cache
+      if refresh or cached is None or self.clock() - cached[0] >= self.SOURCES_TTL:
+        self.wait_for_slot(self.BASE_URL)
+        cached = self._sources_cache = (self.clock(), self.newsapi.get_sources()['sources'])
+    return cached[1]
+
+  def get_all_news_source_ids(self, refresh: bool = False) -> List[str]:
+    return [source['id'] for source in self._sources(refresh)]
+
+  def get_all_news_sources_detailed(self, refresh: bool = False) -> List[Dict[str, str]]:
+    return list(self._sources(refresh))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,215 @@
+"""
+Incremental news polling.
+
+    poller = NewsPoller(NewsAPIQuery())
+    while True:
+        for article in poller.poll_many(['THYAO', 'GARAN']):   # only articles not returned before
+            ...
+        poller.save()
+        time.sleep(60)
+
+Per query the poller keeps a high-water mark (the newest publish time seen,
+sent as NewsAPI's ``from`` parameter) and the validators of the last
+response (ETag / Last-Modified, sent back as If-None-Match /
+If-Modified-Since, plus a digest of the body), see
+``BaseQueryClass.search_since``. An unchanged Bloomberg page therefore costs
+a 304 or at most a download, and no parsing.
+
+Articles that still come back (NewsAPI's ``from`` is inclusive, search pages
+repeat) are dropped by a Bloom filter of their normalized URLs (titles for
+articles without one). It keeps two generations of ``capacity`` keys and
+drops the older one when the newer fills up, so its false positive rate stays
+at ``error_rate`` while it remembers at least the last ``capacity`` articles.
+State and filter are saved under ``root`` (``~/.financelib/news`` by default).
+"""
+import hashlib
+import json
+import math
+import os
+import struct
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from settings import logger
+
+from .dedup import normalize_text, normalize_url
+
+DEFAULT_ROOT = os.path.join(os.path.expanduser('~'), '.financelib', 'news')
+_HEADER = struct.Struct('<8sQQQQ')
+_MAGIC = b'FLBLOOM1'
+
+
+class BloomFilter:
+  """Set membership with false positives at about ``error_rate``, in two rotating generations."""
+
+  def __init__(self, capacity: int = 100_000, error_rate: float = 0.001):
+    if capacity < 1 or not 0 < error_rate < 1:
+      raise ValueError('Bloom filter capacity must be positive and error_rate in (0, 1)')
+    self.capacity = capacity
+    self.error_rate = error_rate
+    # Each generation holds up to capacity keys; a lookup checks two, so halve the rate per generation
+    bits = math.ceil(-capacity * math.log(error_rate / 2) / math.log(2) ** 2)
+    self.size = (bits + 7) // 8 * 8
+    self.hashes = max(1, round(self.size / capacity * math.log(2)))
+    self._bits = np.zeros((2, self.size // 8), dtype=np.uint8)
+    self._count = 0
+    self._lock = threading.Lock()
+
+  def _positions(self, key: str) -> List[int]:
+    """Bit positions of ``key`` by double hashing one 128-bit digest"""
+    digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+    h1, h2 = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+    return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+  def _has(self, generation: int, positions) -> bool:
+    bits = self._bits[generation]
+    return all(bits[p >> 3] >> (p & 7) & 1 for p in positions)
+
+  def __contains__(self, key: str) -> bool:
+    positions = self._positions(key)
+    with self._lock:
+      return self._has(0, positions) or self._has(1, positions)
+
+  def add(self, key: str) -> bool:
+    """Add ``key``; returns whether it (probably) was there already"""
+    positions = self._positions(key)
+    with self._lock:
+      if self._has(0, positions) or self._has(1, positions):
+        return True
+      if self._count >= self.capacity:
+        self._bits[1] = self._bits[0]
+        self._bits[0] = 0
+        self._count = 0
+      for p in positions:
+        self._bits[0, p >> 3] |= 1 << (p & 7)
+      self._count += 1
+      return False
+
+  def save(self, path: str) -> None:
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with self._lock:
+      data = _HEADER.pack(_MAGIC, self.capacity, self.size, self.hashes, self._count) + self._bits.tobytes()
+    fd, temp = tempfile.mkstemp(dir=directory)
+    with os.fdopen(fd, 'wb') as f:
+      f.write(data)
+    os.replace(temp, path)
+
+  @classmethod
+  def load(cls, path: str, error_rate: float = 0.001) -> "BloomFilter":
+    with open(path, 'rb') as f:
+      data = f.read()
+    magic, capacity, size, hashes, count = _HEADER.unpack_from(data)
+    if magic != _MAGIC or len(data) != _HEADER.size + size // 4:
+      raise ValueError(f"{path} is not a saved BloomFilter")
+    bloom = cls(capacity, error_rate)
+    bloom.size, bloom.hashes, bloom._count = size, hashes, count
+    bloom._bits = np.frombuffer(data, dtype=np.uint8, offset=_HEADER.size).reshape(2, size // 8).copy()
+    return bloom
+
+
+def _article_fields(article: Any):
+  """(url, title, publish time) of a News or a NewsAPI article dict"""
+  if isinstance(article, dict):
+    return article.get('url') or '', article.get('title') or '', article.get('publishedAt')
+  return article.article_url or '', article.title or '', article.date
+
+
+def _timestamp(value) -> Optional[pd.Timestamp]:
+  if not value:
+    return None
+  try:
+    stamp = pd.Timestamp(value)
+  except (ValueError, TypeError):
+    return None
+  if pd.isna(stamp):
+    return None
+  return stamp.tz_localize('UTC') if stamp.tzinfo is None else stamp.tz_convert('UTC')
+
+
+class NewsPoller:
+  """Polls a news source and returns only what it has not returned before."""
+
+  def __init__(self, source, root: Optional[str] = DEFAULT_ROOT, name: Optional[str] = None,
+               capacity: int = 100_000, error_rate: float = 0.001):
+    self.source = source
+    name = name or type(source).__name__.lower()
+    self.state_path = os.path.join(root, f'{name}.json') if root else None
+    self.seen_path = os.path.join(root, f'{name}.bloom') if root else None
+    self._lock = threading.Lock()
+    self._queries: Dict[str, Dict[str, Any]] = {}
+    self.seen = BloomFilter(capacity, error_rate)
+    if self.state_path and os.path.exists(self.state_path):
+      with open(self.state_path) as f:
+        self._queries = json.load(f).get('queries', {})
+    if self.seen_path and os.path.exists(self.seen_path):
+      self.seen = BloomFilter.load(self.seen_path, error_rate)
+    self.stats = {'polls': 0, 'unchanged': 0, 'articles': 0, 'new': 0}
+
+  def high_water(self, query: str) -> Optional[str]:
+    return self._queries.get(query, {}).get('high_water')
+
+  def poll(self, query: str, **kwargs) -> List[Any]:
+    """New articles for ``query``; kwargs go to the source's search_since"""
+    with self._lock:
+      state = dict(self._queries.get(query, {}))
+    articles, validators = self.source.search_since(
+      query, since=state.get('high_water'), validators=state.get('validators'), **kwargs)
+
+    new = []
+    newest = _timestamp(state.get('high_water'))
+    for article in articles:
+      url, title, published = _article_fields(article)
+      key = normalize_url(url) or normalize_text(title)
+      if key and self.seen.add(key):
+        continue
+      new.append(article)
+      stamp = _timestamp(published)
+      if stamp is not None and (newest is None or stamp > newest):
+        newest = stamp
+
+    with self._lock:
+      self._queries[query] = {
+        'high_water': newest.strftime('%Y-%m-%dT%H:%M:%S') if newest is not None else None,
+        'validators': validators,
+      }
+      self.stats['polls'] += 1
+      self.stats['unchanged'] += not articles
+      self.stats['articles'] += len(articles)
+      self.stats['new'] += len(new)
+    return new
+
+  def poll_many(self, queries: Iterable[str], max_workers: int = 8, **kwargs) -> List[Any]:
+    """New articles of every query, polled concurrently; a failing query is logged and skipped"""
+    queries = list(dict.fromkeys(queries))
+    if not queries:
+      return []
+
+    def poll(query):
+      try:
+        return self.poll(query, **kwargs)
+      except Exception as e:
+        logger.error(f"Polling news for {query!r} failed: {e}")
+        return []
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(queries))) as executor:
+      return [article for articles in executor.map(poll, queries) for article in articles]
+
+  def save(self) -> None:
+    """Write the per-query state and the seen filter under ``root``"""
+    if not self.state_path:
+      return
+    directory = os.path.dirname(self.state_path)
+    os.makedirs(directory, exist_ok=True)
+    with self._lock:
+      state = json.dumps({'version': 1, 'queries': self._queries})
+    fd, temp = tempfile.mkstemp(dir=directory)
+    with os.fdopen(fd, 'w') as f:
+      f.write(state)
+    os.replace(temp, self.state_path)
+    self.seen.save(self.seen_path)
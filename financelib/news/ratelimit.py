@@ -0,0 +1,88 @@
+"""
+Per-host request rate limits for the news queries.
+
+    limiter = HostLimiter()
+    limiter.acquire('https://www.bloomberg.com/search', rate=0.5)   # waits only if the host is over its rate
+
+Every host gets a token bucket: ``rate`` requests per second on average with
+bursts of up to ``burst`` requests. Threads asking for the same host wait
+their turn, threads on different hosts never wait for each other.
+"""
+import threading
+import time
+from typing import Callable, Dict
+from urllib.parse import urlsplit
+
+
+class TokenBucket:
+  """``rate`` tokens per second, holding at most ``burst``."""
+
+  def __init__(self, rate: float, burst: float = 1, clock: Callable[[], float] = time.monotonic,
+               sleep: Callable[[float], None] = time.sleep):
+    if rate <= 0 or burst < 1:
+      raise ValueError('Token bucket rate must be positive and burst at least 1')
+    self.rate = rate
+    self.burst = burst
+    self._clock = clock
+    self._sleep = sleep
+    self._tokens = float(burst)
+    self._updated = clock()
+    self._lock = threading.Lock()
+
+  def _refill(self) -> None:
+    now = self._clock()
+    self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+    self._updated = now
+
+  def _reserve(self, tokens: float) -> float:
+    """Take ``tokens`` now (possibly going into debt) and return how long to wait for them"""
+    with self._lock:
+      self._refill()
+      self._tokens -= tokens
+      return max(0.0, -self._tokens / self.rate)
+
+  def acquire(self, tokens: float = 1) -> float:
+    """Block until ``tokens`` are available, returns the seconds waited"""
+    wait = self._reserve(tokens)
+    if wait:
+      self._sleep(wait)
+    return wait
+
+  def try_acquire(self, tokens: float = 1) -> bool:
+    """Take ``tokens`` if they are available right now"""
+    with self._lock:
+      self._refill()
+      if self._tokens < tokens:
+        return False
+      self._tokens -= tokens
+      return True
+
+
+class HostLimiter:
+  """One TokenBucket per host, created on first use with the rate asked for."""
+
+  def __init__(self, rate: float = 1.0, burst: float = 1, **bucket_options):
+    self.rate = rate
+    self.burst = burst
+    self._bucket_options = bucket_options
+    self._buckets: Dict[str, TokenBucket] = {}
+    self._lock = threading.Lock()
+
+  @staticmethod
+  def host(url: str) -> str:
+    return urlsplit(url).netloc.lower() if '//' in url else url.lower()
+
+  def bucket(self, url: str, rate: float = None, burst: float = None) -> TokenBucket:
+    host = self.host(url)
+    with self._lock:
+      if host not in self._buckets:
+        self._buckets[host] = TokenBucket(rate or self.rate, burst or self.burst, **self._bucket_options)
+      return self._buckets[host]
+
+  def acquire(self, url: str, rate: float = None, burst: float = None) -> float:
+    """Wait for a request slot on the host of ``url`` (a URL or a bare host name)"""
+    return self.bucket(url, rate, burst).acquire()
+
+
+# Shared by every query object, so two BloombergQuery instances still respect one limit
+LIMITER = HostLimiter()
@@ -15,7 +15,11 @@ LIBRARY_NAME = "financelib"
 import dotenv
 import os
 
-from .utils import today_str
+try:
+  from .utils import today_str
+except ImportError:
+  # Imported as the top-level ``settings`` module (package directory on sys.path)
+  from utils import today_str
 # CONSTANTS
 NEWS_TITLE_CHAR_LIMIT = 10
 NEWS_CONTENT_CHAR_LIMIT = 150
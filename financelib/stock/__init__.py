@@ -1 +1,3 @@
 from .stock import Stock
+from .universe import StockUniverse
+from .watchlist import Watchlist
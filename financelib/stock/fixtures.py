@@ -0,0 +1,149 @@
+"""
+Recorded provider responses for offline tests and benchmarks.
+
+    # Once, with a network: capture what the library asks for
+    with RecordingProvider(YahooProvider(), 'fixtures/bist.pkl.gz') as provider:
+        Stock.fetch_many(['THYAO', 'GARAN'], provider=provider)
+        Stock('THYAO.IS').history('2024-01-01', '2025-01-01', provider=provider)
+
+    # Anywhere: the same calls answered from the file
+    provider = ReplayProvider('fixtures/bist.pkl.gz', latency=0.05)
+
+A recording maps every call (method and arguments) to its response, or to
+the exception it raised, and is stored as a gzip compressed pickle. Only
+load recordings you made yourself: unpickling runs code.
+
+Replays run at full speed unless ``latency`` (seconds per call) is given or
+``recorded_latency`` asks for the durations measured while recording.
+History calls whose exact range was not recorded are served from any
+recorded range of the same symbol and interval, sliced to [start, end), so
+open-ended calls that end "now" replay too.
+"""
+import gzip
+import os
+import pickle
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+Key = Tuple[str, str]
+
+
+def _key(method: str, args: tuple, kwargs: dict) -> Key:
+    return method, repr((args, sorted(kwargs.items())))
+
+
+def _bar_times(frame: pd.DataFrame) -> pd.DatetimeIndex:
+    times = pd.DatetimeIndex(frame['timestamp'] if 'timestamp' in frame.columns else frame.index)
+    return times.tz_localize('UTC') if times.tz is None else times.tz_convert('UTC')
+
+
+def _utc(value) -> pd.Timestamp:
+    stamp = pd.Timestamp(value)
+    return stamp.tz_localize('UTC') if stamp.tzinfo is None else stamp.tz_convert('UTC')
+
+
+class RecordingProvider:
+    """Passes every call through to ``provider`` and records the response."""
+
+    def __init__(self, provider, path: str):
+        self.provider = provider
+        self.path = path
+        self._lock = threading.Lock()
+        # key -> (response, exception, seconds, method, args)
+        self._calls: Dict[Key, tuple] = {}
+
+    def __getattr__(self, method: str):
+        target = getattr(self.provider, method)
+        if not callable(target):
+            return target
+
+        def call(*args, **kwargs):
+            started = time.monotonic()
+            try:
+                response = target(*args, **kwargs)
+            except Exception as e:
+                with self._lock:
+                    self._calls[_key(method, args, kwargs)] = (None, e, time.monotonic() - started, method, args)
+                raise
+            with self._lock:
+                self._calls[_key(method, args, kwargs)] = (response, None, time.monotonic() - started, method, args)
+            return response
+
+        return call
+
+    def save(self, path: Optional[str] = None) -> None:
+        path = path or self.path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._lock:
+            calls = dict(self._calls)
+        fd, temp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)))
+        with os.fdopen(fd, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb') as f:
+            pickle.dump({'version': 1, 'calls': calls}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp, path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.save()
+
+
+class ReplayProvider:
+    """Answers provider calls from a recording, raising ValueError for calls it does not have."""
+
+    def __init__(self, path: str, latency: float = 0.0, recorded_latency: bool = False):
+        with gzip.open(path, 'rb') as f:
+            self._calls: Dict[Key, tuple] = pickle.load(f)['calls']
+        self.latency = latency
+        self.recorded_latency = recorded_latency
+        self.calls = 0
+        self._lock = threading.Lock()
+        self._histories: Dict[Tuple[str, str], list] = {}
+        for response, error, seconds, method, args in self._calls.values():
+            if method == 'history' and error is None and response is not None and len(args) >= 2:
+                self._histories.setdefault((args[0], args[1]), []).append((response, seconds))
+
+    def _wait(self, seconds: float) -> None:
+        delay = seconds if self.recorded_latency else self.latency
+        if delay:
+            time.sleep(delay)
+
+    def __getattr__(self, method: str):
+        if method.startswith('_'):
+            raise AttributeError(method)
+
+        def call(*args, **kwargs):
+            with self._lock:
+                self.calls += 1
+            recorded = self._calls.get(_key(method, args, kwargs))
+            if recorded is None and method == 'history':
+                return self._history(*args, **kwargs)
+            if recorded is None:
+                raise ValueError(f"No recorded response for {method}{args}")
+            response, error, seconds, _, _ = recorded
+            self._wait(seconds)
+            if error is not None:
+                raise error
+            return response
+
+        return call
+
+    def _history(self, symbol: str, interval: str, start, end) -> pd.DataFrame:
+        """Recorded bars of ``symbol``/``interval`` within [start, end)"""
+        frames = self._histories.get((symbol, interval))
+        if not frames:
+            raise ValueError(f"No recorded history for {symbol} {interval}")
+        self._wait(max(seconds for _, seconds in frames))
+        start, end = _utc(start), _utc(end)
+        parts = []
+        for frame, _ in frames:
+            times = _bar_times(frame)
+            parts.append(frame[(times >= start) & (times < end)])
+        bars = pd.concat(parts)
+        keep = ~_bar_times(bars).duplicated(keep='last')
+        bars = bars[keep]
+        return bars.iloc[_bar_times(bars).argsort()]
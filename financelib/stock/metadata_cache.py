@@ -0,0 +1,187 @@
+"""
+Metadata cache for Yahoo search results and ticker info.
+
+    cache = MetadataCache(path='~/.financelib/metadata.db')
+    info = cache.get('info', 'THYAO.IS', lambda: provider.info('THYAO.IS'),
+                     fields=('sector', 'longName'))
+
+Entries live in an in-memory LRU backed by a SQLite file, so they survive
+restarts. How long an entry stays fresh depends on the fields the caller
+needs: a price goes stale in a minute, a sector in a month (FIELD_TTLS).
+A stale entry is still returned at once while a background thread refreshes
+it (stale-while-revalidate); only entries older than ``max_stale`` (or the
+shorter KIND_MAX_STALE of their kind, e.g. prices) or never seen block on
+upstream.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from settings import logger
+
+MINUTE, HOUR, DAY = 60, 60 * 60, 24 * 60 * 60
+
+# Seconds a field stays fresh. Fields not listed use the TTL of their kind.
+FIELD_TTLS: Dict[str, float] = {
+    'currentPrice': MINUTE,
+    'regularMarketPrice': MINUTE,
+    'previousClose': HOUR,
+    'volume': MINUTE,
+    'marketCap': HOUR,
+    'symbol': 30 * DAY,
+    'shortName': 30 * DAY,
+    'longName': 30 * DAY,
+    'sector': 30 * DAY,
+    'industry': 30 * DAY,
+    'exchange': 30 * DAY,
+}
+
+KIND_TTLS: Dict[str, float] = {
+    'search': 7 * DAY,
+    'info': DAY,
+    'price': MINUTE,
+}
+
+# Longest a stale entry of a kind is served while it refreshes (max_stale
+# otherwise); older prices are fetched before returning.
+KIND_MAX_STALE: Dict[str, float] = {
+    'price': 5 * MINUTE,
+}
+
+
+class MetadataCache:
+    """TTL cache with an in-memory LRU, a SQLite backing store and background refresh."""
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 4096, max_stale: float = 30 * DAY,
+                 refresh_workers: int = 4, clock: Callable[[], float] = time.time):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_stale = max_stale
+        self.clock = clock
+        self._memory: "OrderedDict[Tuple[str, str], Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._executor = ThreadPoolExecutor(max_workers=refresh_workers, thread_name_prefix='metadata-refresh')
+        self._db = None
+        if path is not None:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS metadata ('
+                'kind TEXT, key TEXT, value TEXT, fetched_at REAL, PRIMARY KEY (kind, key))'
+            )
+            self._db.commit()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.errors = 0
+
+    def ttl(self, kind: str, fields: Optional[Iterable[str]] = None) -> float:
+        """Freshness window for ``fields`` of a ``kind`` entry (the shortest one wins)"""
+        default = KIND_TTLS.get(kind, DAY)
+        if not fields:
+            return default
+        return min(FIELD_TTLS.get(field, default) for field in fields)
+
+    def _lookup(self, key: Tuple[str, str]) -> Optional[Tuple[Any, float]]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                return entry
+            if self._db is None:
+                return None
+            row = self._db.execute('SELECT value, fetched_at FROM metadata WHERE kind = ? AND key = ?', key).fetchone()
+            if row is None:
+                return None
+            entry = (json.loads(row[0]), row[1])
+            self._remember(key, entry)
+            return entry
+
+    def _remember(self, key: Tuple[str, str], entry: Tuple[Any, float]) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def put(self, kind: str, key: str, value: Any) -> None:
+        entry = (value, self.clock())
+        with self._lock:
+            self._remember((kind, key), entry)
+            if self._db is not None:
+                self._db.execute('INSERT OR REPLACE INTO metadata VALUES (?, ?, ?, ?)',
+                                 (kind, key, json.dumps(value, default=str), entry[1]))
+                self._db.commit()
+
+    def _refresh(self, kind: str, key: str, fetch: Callable[[], Any]) -> None:
+        try:
+            value = fetch()
+            if value is not None:
+                self.put(kind, key, value)
+            with self._lock:
+                self.refreshes += 1
+        except Exception as e:
+            logger.error(f"Error refreshing {kind} metadata for {key}: {e}")
+            with self._lock:
+                self.errors += 1
+        finally:
+            with self._lock:
+                self._refreshing.discard((kind, key))
+
+    def get(self, kind: str, key: str, fetch: Callable[[], Any], fields: Optional[Iterable[str]] = None) -> Any:
+        """
+        Cached value of ``kind``/``key``, calling ``fetch()`` when needed.
+
+        Fresh: returned as is. Stale but younger than ``max_stale`` (see
+        KIND_MAX_STALE): returned as is while one background refresh runs.
+        Missing or too old: fetched now (None results are not cached).
+        """
+        entry = self._lookup((kind, key))
+        age = self.clock() - entry[1] if entry is not None else None
+        if entry is not None and age < self.ttl(kind, fields):
+            with self._lock:
+                self.hits += 1
+            return entry[0]
+
+        if entry is not None and age < min(self.max_stale, KIND_MAX_STALE.get(kind, self.max_stale)):
+            with self._lock:
+                self.stale_hits += 1
+                start = (kind, key) not in self._refreshing
+                self._refreshing.add((kind, key))
+            if start:
+                self._executor.submit(self._refresh, kind, key, fetch)
+            return entry[0]
+
+        with self._lock:
+            self.misses += 1
+        value = fetch()
+        if value is not None:
+            self.put(kind, key, value)
+        return value
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses,
+                'refreshes': self.refreshes,
+                'errors': self.errors,
+                'entries': len(self._memory),
+                'hit_rate': (self.hits + self.stale_hits) / lookups if lookups else 0.0,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute('DELETE FROM metadata')
+                self._db.commit()
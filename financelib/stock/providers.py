@@ -0,0 +1,158 @@
+"""
+Market data providers.
+
+A provider answers the upstream calls the library makes: symbol search,
+ticker info, batched quotes and price history (``MarketDataProvider``).
+``YahooProvider`` is the default for Stock, ``CCXTProvider`` serves the crypto
+DataFetcher and ``SabahProvider`` the BIST symbol list from sabah.com.tr.
+Tests and benchmarks can pass any object with the same methods instead, e.g.
+a local stand-in that serves canned answers or a ``ReplayProvider`` (see
+``fixtures``) that serves recorded ones without a network.
+"""
+from typing import Any, Dict, List, Optional, Protocol
+
+import pandas as pd
+import yfinance as yf
+import yahooquery as yq
+
+
+class MarketDataProvider(Protocol):
+    """Calls a provider answers; a provider may raise NotImplementedError for the ones its source lacks."""
+
+    def search(self, query: str) -> Optional[Dict[str, Any]]:
+        """Search result with a 'quotes' list of {'symbol', 'shortname', 'exchange', ...}, best match first"""
+        ...
+
+    def info(self, symbol: str) -> Dict[str, Any]:
+        """Ticker info dict (shortName, currentPrice, sector, ...)"""
+        ...
+
+    def quotes(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """{'price', 'change', 'change_percent', 'volume', 'currency', 'market_time'} per known symbol"""
+        ...
+
+    def history(self, symbol: str, interval: str, start, end) -> pd.DataFrame:
+        """OHLCV bars in [start, end)"""
+        ...
+
+
+class YahooProvider:
+    """yahooquery for search, yfinance for ticker info and history."""
+
+    def search(self, query: str) -> Optional[Dict[str, Any]]:
+        """Search result with a 'quotes' list, best match first"""
+        return yq.search(query)
+
+    def info(self, symbol: str) -> Dict[str, Any]:
+        """Ticker info dict (shortName, currentPrice, sector, ...)"""
+        return yf.Ticker(symbol).info
+
+    def quotes(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Latest price of many symbols in one request, symbols Yahoo does not know are left out"""
+        prices = yq.Ticker(symbols).price
+        quotes = {}
+        for symbol, price in prices.items():
+            if not isinstance(price, dict) or price.get('regularMarketPrice') is None:
+                continue
+            quotes[symbol] = {
+                'price': price.get('regularMarketPrice'),
+                'change': price.get('regularMarketChange'),
+                'change_percent': (price.get('regularMarketChangePercent') or 0) * 100,
+                'volume': price.get('regularMarketVolume'),
+                'currency': price.get('currency'),
+                'market_time': price.get('regularMarketTime'),
+            }
+        return quotes
+
+    def history(self, symbol: str, interval: str, start, end) -> pd.DataFrame:
+        """OHLCV bars in [start, end)"""
+        return yf.Ticker(symbol).history(start=start, end=end, interval=interval)
+
+
+class CCXTProvider:
+    """A ccxt exchange (Binance by default) behind the provider calls."""
+
+    def __init__(self, exchange=None):
+        if exchange is None:
+            import ccxt
+            exchange = ccxt.binance({'enableRateLimit': True})
+        self.exchange = exchange
+
+    def search(self, query: str) -> Optional[Dict[str, Any]]:
+        """Markets whose symbol or base currency starts with ``query``"""
+        query = query.upper()
+        markets = self.exchange.load_markets()
+        quotes = [
+            {'symbol': symbol, 'shortname': market.get('base'), 'exchange': self.exchange.id}
+            for symbol, market in markets.items()
+            if symbol.startswith(query) or (market.get('base') or '').startswith(query)
+        ]
+        return {'quotes': quotes}
+
+    def info(self, symbol: str) -> Dict[str, Any]:
+        ticker = self.exchange.fetch_ticker(symbol)
+        return {'symbol': symbol, 'shortName': symbol, 'currentPrice': ticker.get('last'),
+                'volume': ticker.get('baseVolume')}
+
+    def quotes(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        tickers = self.exchange.fetch_tickers(symbols)
+        return {
+            symbol: {
+                'price': ticker.get('last'),
+                'change': ticker.get('change'),
+                'change_percent': ticker.get('percentage'),
+                'volume': ticker.get('baseVolume'),
+                'currency': symbol.split('/')[-1],
+                'market_time': ticker.get('datetime'),
+            }
+            for symbol, ticker in tickers.items() if ticker.get('last') is not None
+        }
+
+    def history(self, symbol: str, interval: str, start, end) -> pd.DataFrame:
+        """Candles in [start, end), paging through the exchange limit."""
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        rows, since, end_ms = [], start.value // 10**6, end.value // 10**6
+        while since < end_ms:
+            page = self.exchange.fetch_ohlcv(symbol, interval, since=since, limit=1000)
+            page = [row for row in page if row[0] < end_ms]
+            if not page:
+                break
+            rows.extend(page)
+            since = page[-1][0] + 1
+        df = pd.DataFrame(rows, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms', utc=True)
+        return df
+
+
+class SabahProvider:
+    """BIST symbol list from sabah.com.tr; it has no prices, info or history."""
+
+    def __init__(self):
+        self._symbols: Optional[List[Dict[str, Any]]] = None
+
+    def symbols(self) -> List[Dict[str, Any]]:
+        """[{'symbol': 'THYAO', 'name': ...}, ...], fetched once"""
+        if self._symbols is None:
+            from ..livedata.sabah_com import get_stock_symbols
+            self._symbols = get_stock_symbols()
+        return self._symbols
+
+    def search(self, query: str) -> Optional[Dict[str, Any]]:
+        query = query.upper()
+        return {'quotes': [
+            {'symbol': f"{item['symbol']}.IS", 'shortname': item['name'], 'exchange': 'IST'}
+            for item in self.symbols()
+            if item['symbol'].startswith(query) or (item['name'] or '').upper().startswith(query)
+        ]}
+
+    def info(self, symbol: str) -> Dict[str, Any]:
+        raise NotImplementedError("sabah.com.tr only provides the symbol list")
+
+    def quotes(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        raise NotImplementedError("sabah.com.tr only provides the symbol list")
+
+    def history(self, symbol: str, interval: str, start, end) -> pd.DataFrame:
+        raise NotImplementedError("sabah.com.tr only provides the symbol list")
+
+
+DEFAULT_PROVIDER = YahooProvider()
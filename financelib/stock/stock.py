@@ -4,19 +4,63 @@ Simple finance library for stock market data
 import yfinance as yf
 import yahooquery as yq
 
+import os
+import time
+import threading
 import numpy as np
 import pandas as pd
 
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 
 from settings import logger
+from .providers import DEFAULT_PROVIDER, SabahProvider
+from .metadata_cache import MetadataCache
+from .symbol_index import SymbolIndex, fold
+from .watchlist import Watchlist
+from ..database.history import HistoryStore
+
+INFO_FIELDS = ("symbol", "short_name", "long_name", "score", "exchange",
+               "current_price", "market_cap", "sector", "industry")
+# Ticker.info keys behind INFO_FIELDS. Prices are cached apart from the rest so
+# a month-long sector TTL does not keep a month-old price around.
+STATIC_INFO_FIELDS = ("symbol", "shortName", "longName", "marketCap", "sector", "industry")
+PRICE_INFO_FIELDS = ("currentPrice",)
+
+
+def _info_record(quote: Dict[str, Any], stock_info: Dict[str, Any]) -> Dict[str, Any]:
+    """Fields we show for a search quote and its ticker info"""
+    return {
+        "symbol": stock_info.get("symbol"),
+        "short_name": stock_info.get("shortName"),
+        "long_name": stock_info.get("longName"),
+        "score": quote.get("score"),
+        "exchange": quote.get("exchange"),
+        "current_price": stock_info.get("currentPrice"),
+        "market_cap": stock_info.get("marketCap"),
+        "sector": stock_info.get("sector"),
+        "industry": stock_info.get("industry"),
+    }
 
 class Stock:
+    # No instance dict: a Stock is just its symbol until data is asked for
+    __slots__ = ('symbol', '_ticker_instance')
+
     def __init__(self, symbol: str):
         """Initialize stock with symbol"""
         self.symbol = symbol.upper()
-        self._ticker = yf.Ticker(symbol)
+        self._ticker_instance = None
+
+    def __repr__(self) -> str:
+        return f"Stock({self.symbol!r})"
+
+    @property
+    def _ticker(self) -> yf.Ticker:
+        """yfinance Ticker, created on first use"""
+        if self._ticker_instance is None:
+            self._ticker_instance = yf.Ticker(self.symbol)
+        return self._ticker_instance
 
     # Common BIST stocks for quick access
     COMMON_STOCKS: Dict[str, str] = {
@@ -37,71 +81,213 @@ class Stock:
         'FROTO': 'Ford Otosan',
     }
 
+    SYMBOL_INDEX_PATH = os.path.join(os.path.expanduser('~'), '.financelib', 'symbols.json')
+    _symbol_index: Optional[SymbolIndex] = None
+    _symbol_index_lock = threading.Lock()
+
+    @classmethod
+    def symbol_index(cls) -> SymbolIndex:
+        """Local symbol index, loaded from SYMBOL_INDEX_PATH or seeded with COMMON_STOCKS"""
+        with cls._symbol_index_lock:
+            if cls._symbol_index is None:
+                if os.path.exists(cls.SYMBOL_INDEX_PATH):
+                    cls._symbol_index = SymbolIndex.load(cls.SYMBOL_INDEX_PATH)
+                else:
+                    cls._symbol_index = SymbolIndex.from_common_stocks(cls.COMMON_STOCKS, path=cls.SYMBOL_INDEX_PATH)
+            return cls._symbol_index
+
+    @classmethod
+    def refresh_symbol_index(cls, provider=None) -> int:
+        """Add the full BIST list (sabah.com.tr by default) to the index, returns the number of new symbols"""
+        provider = provider or SabahProvider()
+        return cls.symbol_index().extend(
+            {'symbol': f"{item['symbol']}.IS", 'name': item['name'], 'exchange': 'IST'}
+            for item in provider.symbols()
+        )
+
+    METADATA_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.financelib', 'metadata.db')
+    _metadata_cache: Optional[MetadataCache] = None
+
+    @classmethod
+    def metadata_cache(cls) -> MetadataCache:
+        """Cache of upstream search results and ticker info, stored at METADATA_CACHE_PATH"""
+        with cls._symbol_index_lock:
+            if cls._metadata_cache is None:
+                cls._metadata_cache = MetadataCache(cls.METADATA_CACHE_PATH)
+            return cls._metadata_cache
+
+    @classmethod
+    def _search(cls, query: str, provider=None) -> Optional[Dict[str, Any]]:
+        """Upstream search result for ``query``, cached"""
+        provider = provider or DEFAULT_PROVIDER
+        return cls.metadata_cache().get('search', fold(query) or query, lambda: provider.search(query))
+
+    @classmethod
+    def _info(cls, symbol: str, provider=None) -> Dict[str, Any]:
+        """Ticker info for ``symbol``: static fields and price cached with their own TTLs"""
+        provider = provider or DEFAULT_PROVIDER
+        cache = cls.metadata_cache()
+
+        def fetch() -> Dict[str, Any]:
+            info = provider.info(symbol)
+            cache.put('price', symbol, {field: info.get(field) for field in PRICE_INFO_FIELDS})
+            return info
+
+        info = cache.get('info', symbol, fetch, fields=STATIC_INFO_FIELDS)
+        price = cache.get('price', symbol, lambda: {field: fetch().get(field) for field in PRICE_INFO_FIELDS},
+                          fields=PRICE_INFO_FIELDS)
+        return dict(info, **price)
+
+    # Lowest local search score trusted without asking upstream: an exact code
+    # or a name prefix. Short prefixes ('F', 'AA') and fuzzy matches go to Yahoo.
+    LOCAL_MIN_SCORE = 2
+
+    @classmethod
+    def _resolve(cls, query: str, provider=None, exact: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Best quote for a code or company name: local index first, upstream
+        search when it has no confident match. With ``exact`` only a known
+        code counts as a local match.
+        """
+        if exact:
+            match = cls.symbol_index().lookup(query)
+            if match is not None:
+                return match
+        else:
+            matches = cls.symbol_index().search(query, limit=1)
+            if matches and matches[0]['score'] >= cls.LOCAL_MIN_SCORE:
+                return matches[0]
+
+        search_result = cls._search(query, provider)
+        if not search_result or not search_result.get('quotes'):
+            return None
+        quote = search_result['quotes'][0]
+        cls.symbol_index().add_quote(quote)
+        return quote
+
     def get_data(self):
         """Get current price score"""
         if self.symbol in ['', None]:
             raise ValueError({"error": "No stock symbol provided"})
 
-        data: dict = yq.search(self.symbol)
-        if data is None:
+        quote = self._resolve(self.symbol, exact=True)
+        if quote is None:
             raise ValueError({"error": "No matching company found"})
 
-        quote = data['quotes'][0]
         return quote
 
     @classmethod
-    def display_stock_infos(cls, query_list: List[str], return_info: bool = False) -> Optional[List[Dict[str, Any]]]:
-        try:
-            info = []
-            for query in query_list:
-                if return_info:
-                    temp = cls.display_stock_info(query, return_info=return_info)
-                    info.append(temp)
-                else:
-                    cls.display_stock_info(query)
+    def display_stock_infos(cls, query_list: List[str], return_info: bool = False,
+                            max_workers: int = 8, provider=None) -> Optional[List[Any]]:
+        """
+        Info of every search match for every query, like display_stock_info
+        per query: a list of records, or an {"error": ...} dict when the
+        query has no match. Searches and info calls run concurrently.
+        """
+        def search(query: str) -> List[Dict[str, Any]]:
+            search_result = cls._search(query, provider)
+            return (search_result or {}).get('quotes') or []
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            searches = [executor.submit(search, query) for query in query_list]
+
+        info: List[Any] = []
+        matches = []
+        for position, future in enumerate(searches):
+            try:
+                quotes = future.result()
+            except Exception as e:
+                info.append({"error": str(e)})
+                continue
+            info.append([] if quotes else {"error": "No matching company found"})
+            matches.extend((position, quote) for quote in quotes)
+
+        fetched = cls.fetch_many([quote.get("symbol") for _, quote in matches], max_workers=max_workers,
+                                resolve=False, provider=provider)
+        for (position, quote), record in zip(matches, fetched):
+            entry = {field: record[field] for field in INFO_FIELDS}
+            entry.update(score=quote.get("score"), exchange=quote.get("exchange"))
+            if record["error"]:
+                entry["error"] = record["error"]
+            info[position].append(entry)
+
+        if return_info:
+            return info
+
+        __import__('pprint').pprint(info)
 
-            if return_info:
-                return info
-        except Exception as e:
-            return {"error": str(e), "info": e.with_traceback()}
+    @classmethod
+    def fetch_many(cls, queries: List[str], max_workers: int = 8, timeout: float = 10.0,
+                   resolve: bool = True, provider=None) -> List[Dict[str, Any]]:
+        """
+        Resolve and fetch many stocks concurrently.
+
+        Every query is searched (or used as the symbol when resolve=False) and
+        the info of its best match is fetched, with at most ``max_workers``
+        upstream calls in flight. Results come back in the order of
+        ``queries``; a query that fails or takes longer than ``timeout``
+        seconds gets its message in "error" instead of failing the batch.
+        A timed out call keeps its worker until upstream answers.
+        """
+        provider = provider or DEFAULT_PROVIDER
+        results = [dict({"query": query, "error": None}, **dict.fromkeys(INFO_FIELDS)) for query in queries]
+        started: Dict[int, float] = {}
+
+        def fetch(position: int, query: str) -> Dict[str, Any]:
+            started[position] = time.monotonic()
+            quote = {"symbol": query}
+            if resolve:
+                quote = cls._resolve(query, provider)
+                if quote is None:
+                    raise LookupError("No matching company found")
+            return _info_record(quote, cls._info(quote.get("symbol"), provider))
+
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            pending = {executor.submit(fetch, position, query): position for position, query in enumerate(queries)}
+            while pending:
+                deadlines = [started[position] + timeout for position in pending.values() if position in started]
+                wait_for = max(min(deadlines) - time.monotonic(), 0) if deadlines else timeout
+                done, _ = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    position = pending.pop(future)
+                    try:
+                        results[position].update(future.result())
+                    except Exception as e:
+                        logger.error(f"Error fetching {queries[position]}: {e}")
+                        results[position]["error"] = str(e) or type(e).__name__
+
+                now = time.monotonic()
+                for future, position in list(pending.items()):
+                    if position in started and now - started[position] >= timeout:
+                        del pending[future]
+                        results[position]["error"] = f"Timed out after {timeout} seconds"
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        return results
 
     @classmethod
     def display_stock_info(cls, company_name: str, return_info: bool = False) -> List[Dict[str, Any]]:
         try:
             info = []
             # Search for the company by name
-            search_result = yq.search(company_name)
+            search_result = cls._search(company_name)
 
             # Check if there are any results
             if not search_result or 'quotes' not in search_result or len(search_result['quotes']) == 0:
                 return {"error": "No matching company found"}
 
-            # Get the first result (assuming it's the best match)
-            if search_result is not None:
-                for quote in search_result['quotes']:
-                    stock = yf.Ticker(quote.get("symbol"))
-                    print(stock)
-                    stock_info = stock.info
-
-                    # Extract and return relevant information
-                    info.append({
-                        "symbol": stock_info.get("symbol"),
-                        "short_name": stock_info.get("shortName"),
-                        "long_name": stock_info.get("longName"),
-                        "score": quote.get("score"),
-                        "exchange": quote.get("exchange"),
-                        "current_price": stock_info.get("currentPrice"),
-                        "market_cap": stock_info.get("marketCap"),
-                        "sector": stock_info.get("sector"),
-                        "industry": stock_info.get("industry"),
-                    })
+            for quote in search_result['quotes']:
+                # Extract and return relevant information
+                info.append(_info_record(quote, cls._info(quote.get("symbol"))))
 
             if return_info:
                 return info
 
             __import__('pprint').pprint(info)
         except Exception as e:
-            return {"error": str(e), "info": e.with_traceback()}
+            return {"error": str(e)}
 
 
     @classmethod
@@ -128,6 +314,30 @@ class Stock:
         else:
             print(f"\nUnable to fetch data for {symbol}")
 
+    @classmethod
+    def watch(cls, symbols: List[str], callback=None, **kwargs) -> Watchlist:
+        """
+        Started Watchlist publishing live snapshots of ``symbols`` to ``callback``.
+
+        Unlike get_live_stock_state it polls all symbols in batched requests,
+        as often as their market hours and price moves call for.
+        """
+        watchlist = Watchlist(symbols, callback=callback, **kwargs)
+        watchlist.start()
+        return watchlist
+
+    def history(self, start, end=None, interval: str = '1d', store: Optional[HistoryStore] = None,
+                provider=None) -> pd.DataFrame:
+        """
+        OHLCV bars in [start, end) served from the local history store.
+
+        Only ranges the store does not cover yet (usually just the tail since
+        the last call) are downloaded. ``end`` defaults to now.
+        """
+        provider = provider or DEFAULT_PROVIDER
+        store = store or HistoryStore()
+        return store.get(self.symbol, interval, start, end, fetch=provider.history)
+
     def _get_stock(self) -> Optional[Dict[str, Any]]:
         """Get current price and basic info"""
         try:
@@ -154,35 +364,14 @@ class Stock:
             logger.error(f"Error fetching price data for {self.symbol}: {e}")
             return None
 
-    @classmethod
-    def display_stock_info(cls, symbol: str) -> None:
-        """Display formatted stock information"""
-        stock = cls(symbol)
-        data = stock.get_price_data()
-
-        if data:
-            change_symbol = '▲' if data['change'] > 0 else '▼' if data['change'] < 0 else '■'
-            change_color = '\033[92m' if data['change'] > 0 else '\033[91m' if data['change'] < 0 else '\033[0m'
-
-            print(f"\n{data['symbol']} - {data['timestamp']}")
-            print(f"Price: {data['price']} {data['currency']}")
-            print(f"Change: {change_color}{change_symbol} {data['change']} ({data['change_percent']}%)\033[0m")
-            print(f"Volume: {data['volume']:,}")
-        else:
-            print(f"\nUnable to fetch data for {symbol}")
-
     @classmethod
     def search_stock(cls, company_name: str) -> Dict[str, Any]:
         try:
-            # Search for the company by name
-            search_result = yq.search(company_name)
-
-            # Check if there are any results
-            if not search_result or 'quotes' not in search_result or len(search_result['quotes']) == 0:
+            # Local index first, Yahoo search only when it has no match
+            first_match = cls._resolve(company_name)
+            if first_match is None:
                 return {"error": "No matching company found"}
 
-            # Get the first result (assuming it's the best match)
-            first_match = search_result.get('quotes')[0]
             return first_match
 
         except Exception as e:
@@ -0,0 +1,239 @@
+"""
+Offline symbol search.
+
+    index = SymbolIndex.from_common_stocks()
+    index.search('turk hava')       # [{'symbol': 'THYAO.IS', 'shortname': 'Türk Hava Yolları', ...}]
+    index.search('THYAO')
+    index.search('gara')            # prefixes work too
+
+Names and codes are folded (lowercase, Turkish diacritics removed: "Türk Hava
+Yolları" -> "turk hava yollari") and split into tokens. Tokens live in one
+sorted array, so every prefix is a contiguous slice found with two binary
+searches, the flattened equivalent of a trie. Every query token has to prefix
+one of an entry's tokens. When nothing matches, a character trigram index
+finds near misses such as typos.
+
+The index is saved as JSON and rebuilt on load, which takes milliseconds for
+the whole BIST list. Lookups read one immutable snapshot of the index, so they
+need no lock while another thread adds symbols; added symbols are indexed by
+the next lookup and written out every ``SAVE_EVERY`` symbols, on ``flush``
+and at exit.
+"""
+import atexit
+import json
+import os
+import re
+import threading
+from bisect import bisect_left, bisect_right
+import heapq
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional
+
+_FOLD = str.maketrans({
+    'ç': 'c', 'Ç': 'c', 'ğ': 'g', 'Ğ': 'g', 'ı': 'i', 'I': 'i', 'İ': 'i',
+    'ö': 'o', 'Ö': 'o', 'ş': 's', 'Ş': 's', 'ü': 'u', 'Ü': 'u',
+    'â': 'a', 'Â': 'a', 'î': 'i', 'Î': 'i', 'û': 'u', 'Û': 'u',
+})
+
+# Share of the query's trigrams an entry needs for a fuzzy match.
+FUZZY_THRESHOLD = 0.5
+# Shortest query that counts as a name prefix match (score 2) rather than a
+# mere token prefix (score 1): 'turk hava' names THYAO, 'f' or 'ford' do not.
+MIN_NAME_PREFIX = 5
+
+# Scores of search results: exact codes get 10 or more, name prefixes 2,
+# token prefixes 1 and fuzzy matches less than 1.
+EXACT_SCORE = 10
+
+# Learned symbols written to the index file in one go
+SAVE_EVERY = 20
+
+
+def fold(text: str) -> str:
+    """Lowercase ASCII form of a name: 'Türk Hava Yolları' -> 'turk hava yollari'"""
+    text = text.translate(_FOLD).lower()
+    return ' '.join(re.findall(r'[a-z0-9]+', text))
+
+
+def _trigrams(text: str) -> set:
+    padded = f'  {text} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class _Snapshot:
+    """Search structures of one version of the index; never modified once built."""
+
+    __slots__ = ('entries', 'tokens', 'token_ids', 'codes', 'names', 'grams')
+
+    def __init__(self, entries, tokens, token_ids, codes, names, grams):
+        self.entries = entries
+        self.tokens = tokens
+        self.token_ids = token_ids
+        self.codes = codes
+        self.names = names
+        self.grams = grams
+
+
+class SymbolIndex:
+    """In-memory symbol/name index with prefix and fuzzy lookups."""
+
+    def __init__(self, entries: Iterable[Dict[str, Any]] = (), path: Optional[str] = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: List[Dict[str, Any]] = []
+        self._by_symbol: Dict[str, int] = {}
+        self._stale = False
+        self._unsaved = 0
+        for entry in entries:
+            self._add(entry)
+        self._build()
+        if path:
+            atexit.register(self.flush)
+
+    def __len__(self) -> int:
+        return len(self._current().entries)
+
+    @classmethod
+    def from_common_stocks(cls, common_stocks: Optional[Dict[str, str]] = None, path: Optional[str] = None):
+        """Index seeded with BIST codes and names, e.g. Stock.COMMON_STOCKS"""
+        if common_stocks is None:
+            from .stock import Stock
+            common_stocks = Stock.COMMON_STOCKS
+        entries = [{'symbol': f'{code}.IS', 'name': name, 'exchange': 'IST'} for code, name in common_stocks.items()]
+        return cls(entries, path=path)
+
+    @classmethod
+    def load(cls, path: str):
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f)['entries'], path=path)
+
+    def save(self, path: Optional[str] = None) -> None:
+        with self._lock:
+            self._save(path or self.path)
+
+    def _save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        temp = f'{path}.tmp'
+        with open(temp, 'w', encoding='utf-8') as f:
+            json.dump({'entries': self._entries}, f, ensure_ascii=False)
+        os.replace(temp, path)
+        if path == self.path:
+            self._unsaved = 0
+
+    def flush(self) -> None:
+        """Write symbols added since the last save to the index file"""
+        with self._lock:
+            if self.path and self._unsaved:
+                self._save(self.path)
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Every indexed {'symbol', 'name', 'exchange'} entry"""
+        return list(self._current().entries)
+
+    def _add(self, entry: Dict[str, Any]) -> bool:
+        symbol = entry['symbol'].upper()
+        if symbol in self._by_symbol:
+            return False
+        self._by_symbol[symbol] = len(self._entries)
+        self._entries.append({'symbol': symbol, 'name': entry.get('name') or symbol,
+                              'exchange': entry.get('exchange')})
+        return True
+
+    def _build(self) -> None:
+        """Index the entries into a new snapshot and publish it with one assignment"""
+        entries = tuple(self._entries)
+        tokens, codes, grams = [], {}, {}
+        for position, entry in enumerate(entries):
+            code = entry['symbol'].split('.')[0].lower()
+            codes.setdefault(code, position)
+            codes.setdefault(fold(entry['symbol']), position)
+            text = fold(f"{code} {entry['name']}")
+            tokens.extend((token, position) for token in set(text.split()))
+            for gram in _trigrams(text):
+                grams.setdefault(gram, []).append(position)
+        tokens.sort()
+        self._snapshot = _Snapshot(entries, [token for token, _ in tokens], [position for _, position in tokens],
+                                   codes, [fold(entry['name']) for entry in entries], grams)
+        self._stale = False
+
+    def _current(self) -> _Snapshot:
+        """The latest snapshot, rebuilt first when symbols were added since"""
+        if self._stale:
+            with self._lock:
+                if self._stale:
+                    self._build()
+        return self._snapshot
+
+    def add(self, symbol: str, name: Optional[str] = None, exchange: Optional[str] = None) -> None:
+        """Add (or ignore an already known) symbol; it is indexed lazily and saved in batches"""
+        with self._lock:
+            if not self._add({'symbol': symbol, 'name': name, 'exchange': exchange}):
+                return
+            self._stale = True
+            self._unsaved += 1
+            if self.path and self._unsaved >= SAVE_EVERY:
+                self._save(self.path)
+
+    def extend(self, entries: Iterable[Dict[str, Any]]) -> int:
+        """Add many {'symbol', 'name', 'exchange'} entries at once, returns how many were new"""
+        with self._lock:
+            added = sum(self._add(entry) for entry in entries)
+            if added or self._stale:
+                self._build()
+            if self.path and (added or self._unsaved):
+                self._save(self.path)
+            return added
+
+    def add_quote(self, quote: Dict[str, Any]) -> None:
+        """Learn a quote from a yahooquery search result"""
+        if quote.get('symbol'):
+            self.add(quote['symbol'], quote.get('longname') or quote.get('shortname'), quote.get('exchange'))
+
+    @staticmethod
+    def _prefixed(snapshot: _Snapshot, prefix: str) -> set:
+        start = bisect_left(snapshot.tokens, prefix)
+        end = bisect_right(snapshot.tokens, prefix + '\uffff', lo=start)
+        return set(snapshot.token_ids[start:end])
+
+    @staticmethod
+    def _quote(snapshot: _Snapshot, position: int, score: float) -> Dict[str, Any]:
+        entry = snapshot.entries[position]
+        return {'symbol': entry['symbol'], 'shortname': entry['name'], 'longname': entry['name'],
+                'exchange': entry['exchange'], 'score': score}
+
+    def lookup(self, code: str) -> Optional[Dict[str, Any]]:
+        """Quote of an exact code ('THYAO' or 'THYAO.IS'), None when unknown"""
+        snapshot = self._current()
+        position = snapshot.codes.get(fold(code))
+        return None if position is None else self._quote(snapshot, position, float(EXACT_SCORE))
+
+    def search(self, query: str, limit: int = 10, fuzzy: bool = True) -> List[Dict[str, Any]]:
+        """Best matches for a code, a name or a prefix, as yahooquery-like quotes"""
+        text = fold(query)
+        if not text:
+            return []
+
+        snapshot = self._current()
+        exact = snapshot.codes.get(text)
+        scores: Counter = Counter()
+        if exact is not None:
+            scores[exact] += EXACT_SCORE
+
+        candidates = None
+        for token in text.split():
+            matches = self._prefixed(snapshot, token)
+            candidates = matches if candidates is None else candidates & matches
+        names = snapshot.names
+        for position in candidates or ():
+            named = len(text) >= MIN_NAME_PREFIX and names[position].startswith(text)
+            scores[position] += 2 if named else 1
+
+        if not scores and fuzzy:
+            grams = _trigrams(text)
+            overlap = Counter(position for gram in grams for position in snapshot.grams.get(gram, ()))
+            for position, shared in overlap.items():
+                if shared / len(grams) >= FUZZY_THRESHOLD:
+                    scores[position] = shared / len(grams)
+
+        ranked = heapq.nsmallest(limit, scores, key=lambda position: (-scores[position], len(names[position])))
+        return [self._quote(snapshot, position, float(scores[position])) for position in ranked]
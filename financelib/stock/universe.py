@@ -0,0 +1,108 @@
+"""
+Symbol universes for screeners.
+
+    universe = StockUniverse.from_symbol_index(Stock.symbol_index())
+    banks = universe.filter(exchange='IST', sector=['Financial Services'])
+    large = banks.between('market_cap', 1e10)
+    for stock in large:          # Stock objects are only built here
+        ...
+
+Symbols and metadata are stored column-wise in NumPy arrays (text fields as
+fixed-width unicode, numbers as float64 with NaN for missing), so a universe
+of tens of thousands of symbols costs a few arrays instead of one object per
+symbol, and filters are single vectorized comparisons.
+"""
+from numbers import Number
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .stock import Stock
+
+
+def _column(values: List[Any]) -> np.ndarray:
+    """float64 array for numeric metadata, unicode array for everything else"""
+    if all(value is None or (isinstance(value, Number) and not isinstance(value, bool)) for value in values):
+        return np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+    return np.array(['' if value is None else str(value) for value in values], dtype=str)
+
+
+class StockUniverse:
+    """Symbols plus metadata columns, filtered with boolean masks."""
+
+    def __init__(self, symbols: Iterable[str], **columns: Iterable[Any]):
+        self.symbols = np.array([symbol.upper() for symbol in symbols], dtype=str)
+        self.columns: Dict[str, np.ndarray] = {}
+        for name, values in columns.items():
+            values = values if isinstance(values, np.ndarray) else _column(list(values))
+            if len(values) != len(self.symbols):
+                raise ValueError(f"Column {name!r} has {len(values)} values for {len(self.symbols)} symbols")
+            self.columns[name] = values
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]):
+        """Universe from dicts with a 'symbol' key, every other key becomes a column"""
+        records = list(records)
+        names = list(dict.fromkeys(key for record in records for key in record if key != 'symbol'))
+        return cls([record['symbol'] for record in records],
+                   **{name: [record.get(name) for record in records] for name in names})
+
+    @classmethod
+    def from_symbol_index(cls, index=None):
+        """Universe of every symbol in a SymbolIndex (Stock.symbol_index() by default)"""
+        index = index if index is not None else Stock.symbol_index()
+        return cls.from_records(index.entries())
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __iter__(self) -> Iterator[Stock]:
+        return (Stock(symbol) for symbol in self.symbols)
+
+    def __getitem__(self, key):
+        """Stock for an integer position, sub-universe for a mask, slice or index array"""
+        if isinstance(key, (int, np.integer)):
+            return Stock(self.symbols[key])
+        return StockUniverse(self.symbols[key], **{name: values[key] for name, values in self.columns.items()})
+
+    def __repr__(self) -> str:
+        return f"StockUniverse({len(self)} symbols, columns={list(self.columns)})"
+
+    def column(self, name: str) -> np.ndarray:
+        if name == 'symbol':
+            return self.symbols
+        if name not in self.columns:
+            raise ValueError(f"Unknown column {name!r}, available: {['symbol', *self.columns]}")
+        return self.columns[name]
+
+    def mask(self, **criteria: Any) -> np.ndarray:
+        """Boolean mask of rows whose columns equal (or, for lists, are in) the given values"""
+        mask = np.ones(len(self), dtype=bool)
+        for name, wanted in criteria.items():
+            values = self.column(name)
+            if isinstance(wanted, (list, tuple, set, np.ndarray)):
+                # No dtype=values.dtype: a fixed-width column would truncate 'ISTANBUL' to 'IST'
+                mask &= np.isin(values, list(wanted))
+            else:
+                mask &= values == wanted
+        return mask
+
+    def filter(self, **criteria: Any) -> "StockUniverse":
+        """Sub-universe matching every criterion, e.g. filter(exchange='IST', sector=['Energy', 'Utilities'])"""
+        return self[self.mask(**criteria)]
+
+    def between(self, name: str, low: Optional[float] = None, high: Optional[float] = None) -> "StockUniverse":
+        """Sub-universe whose numeric column is within [low, high]; NaN never matches"""
+        values = self.column(name)
+        if values.dtype.kind != 'f':
+            raise ValueError(f"Column {name!r} is not numeric")
+        mask = ~np.isnan(values)
+        if low is not None:
+            mask &= values >= low
+        if high is not None:
+            mask &= values <= high
+        return self[mask]
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.columns, index=pd.Index(self.symbols, name='symbol'))
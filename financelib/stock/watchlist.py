@@ -0,0 +1,229 @@
+"""
+Live quotes for many symbols from one poller.
+
+    watchlist = Watchlist(['THYAO.IS', 'GARAN.IS', 'AAPL'], callback=print)
+    watchlist.start()            # background thread, snapshots go to callback
+    ...
+    watchlist.metrics()          # per-symbol latency, staleness, interval
+    watchlist.stop()
+
+    for snapshot in Watchlist(['THYAO.IS']).stream():   # or pull them
+        ...
+
+Symbols that are due are fetched together, ``batch_size`` per upstream
+request. Each symbol has its own polling interval: while its market is open
+the interval shrinks as the price moves more between polls (between
+``min_interval`` and ``max_interval``), and outside market hours it is
+``closed_interval``.
+"""
+import threading
+import time
+from datetime import datetime, time as dtime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+from zoneinfo import ZoneInfo
+
+from settings import logger
+from .providers import DEFAULT_PROVIDER
+
+# Trading sessions by symbol suffix, '' for symbols without one (US listings)
+MARKET_SESSIONS = {
+    '.IS': ('Europe/Istanbul', dtime(10, 0), dtime(18, 10)),
+    '': ('America/New_York', dtime(9, 30), dtime(16, 0)),
+}
+
+# Typical move between polls (percent) at which an open symbol is polled every
+# max_interval; larger moves shorten the interval proportionally.
+REFERENCE_MOVE = 0.1
+# Weight of the latest move in the typical move average
+MOVE_SMOOTHING = 0.3
+
+
+def market_open(symbol: str, now: Optional[float] = None) -> bool:
+    """Whether the session of ``symbol`` is open at ``now`` (a UNIX time, default now); holidays are not known"""
+    suffix = '.' + symbol.rsplit('.', 1)[1] if '.' in symbol else ''
+    zone, opens, closes = MARKET_SESSIONS.get(suffix, MARKET_SESSIONS[''])
+    local = datetime.fromtimestamp(time.time() if now is None else now, ZoneInfo(zone))
+    return local.weekday() < 5 and opens <= local.time() < closes
+
+
+class _State:
+    __slots__ = ('due', 'interval', 'move', 'snapshot', 'fetched_at', 'latency', 'polls', 'errors')
+
+    def __init__(self, due: float, interval: float):
+        self.due = due
+        self.interval = interval
+        self.move = None
+        self.snapshot = None
+        self.fetched_at = None
+        self.latency = None
+        self.polls = 0
+        self.errors = 0
+
+
+class Watchlist:
+    """Polls quotes for a set of symbols in batches and publishes snapshots."""
+
+    def __init__(self, symbols: Iterable[str], callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 provider=None, batch_size: int = 50, min_interval: float = 5.0, max_interval: float = 60.0,
+                 closed_interval: float = 600.0, clock: Callable[[], float] = time.time):
+        if min_interval <= 0 or min_interval > max_interval:
+            raise ValueError("Intervals must satisfy 0 < min_interval <= max_interval")
+        self.callback = callback
+        self.provider = provider or DEFAULT_PROVIDER
+        self.batch_size = batch_size
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.closed_interval = closed_interval
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._states: Dict[str, _State] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        for symbol in symbols:
+            self.add(symbol)
+
+    def add(self, symbol: str) -> None:
+        """Watch ``symbol``, it is polled on the next round"""
+        with self._lock:
+            self._states.setdefault(symbol.upper(), _State(self.clock(), self.min_interval))
+
+    def remove(self, symbol: str) -> None:
+        with self._lock:
+            self._states.pop(symbol.upper(), None)
+
+    @property
+    def symbols(self) -> List[str]:
+        with self._lock:
+            return list(self._states)
+
+    def _interval(self, symbol: str, state: _State, now: float) -> float:
+        if not market_open(symbol, now):
+            return self.closed_interval
+        if not state.move:
+            return self.max_interval
+        interval = self.max_interval * REFERENCE_MOVE / state.move
+        return min(max(interval, self.min_interval), self.max_interval)
+
+    def _update(self, symbol: str, state: _State, quote: Dict[str, Any], now: float, latency: float) -> Dict[str, Any]:
+        previous = state.snapshot
+        if previous is not None and previous['price']:
+            move = abs(quote['price'] / previous['price'] - 1) * 100
+            state.move = move if state.move is None else MOVE_SMOOTHING * move + (1 - MOVE_SMOOTHING) * state.move
+
+        state.snapshot = {
+            'symbol': symbol,
+            'price': quote['price'],
+            'change': quote.get('change'),
+            'change_percent': quote.get('change_percent'),
+            'currency': quote.get('currency'),
+            'volume': quote.get('volume'),
+            'market_time': quote.get('market_time'),
+            'timestamp': datetime.fromtimestamp(now).strftime('%H:%M:%S'),
+        }
+        state.fetched_at = now
+        state.latency = latency
+        state.polls += 1
+        return state.snapshot
+
+    def poll(self) -> List[Dict[str, Any]]:
+        """Fetch every due symbol, publish and return the new snapshots"""
+        now = self.clock()
+        with self._lock:
+            due = [symbol for symbol, state in self._states.items() if state.due <= now]
+
+        snapshots = []
+        for start in range(0, len(due), self.batch_size):
+            batch = due[start:start + self.batch_size]
+            requested = time.monotonic()
+            try:
+                quotes = self.provider.quotes(batch)
+            except Exception as e:
+                logger.error(f"Error fetching quotes for {len(batch)} symbols: {e}")
+                quotes = {}
+            latency = time.monotonic() - requested
+            now = self.clock()
+
+            with self._lock:
+                for symbol in batch:
+                    state = self._states.get(symbol)
+                    if state is None:
+                        continue
+                    quote = quotes.get(symbol)
+                    if quote is None:
+                        state.errors += 1
+                    else:
+                        snapshots.append(self._update(symbol, state, quote, now, latency))
+                    state.interval = self._interval(symbol, state, now)
+                    state.due = now + state.interval
+
+        if self.callback is not None:
+            for snapshot in snapshots:
+                try:
+                    self.callback(snapshot)
+                except Exception as e:
+                    logger.error(f"Watchlist callback failed for {snapshot['symbol']}: {e}")
+        return snapshots
+
+    def next_due(self) -> Optional[float]:
+        with self._lock:
+            return min((state.due for state in self._states.values()), default=None)
+
+    def _wait(self) -> bool:
+        """Sleep until a symbol is due, False when stopped"""
+        due = self.next_due()
+        delay = self.max_interval if due is None else max(due - self.clock(), 0)
+        return not self._stop.wait(delay)
+
+    def stream(self) -> Iterator[Dict[str, Any]]:
+        """Snapshots as they arrive, until stop() is called"""
+        self._stop.clear()
+        while True:
+            yield from self.poll()
+            if not self._wait():
+                return
+
+    def start(self) -> None:
+        """Poll on a background thread, publishing to the callback"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+
+        def run():
+            while True:
+                self.poll()
+                if not self._wait():
+                    return
+
+        self._thread = threading.Thread(target=run, name='watchlist', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def snapshot(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Latest snapshot of ``symbol``"""
+        with self._lock:
+            state = self._states.get(symbol.upper())
+            return state.snapshot if state else None
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-symbol 'latency' of the last upstream call, 'staleness' (seconds
+        since the last snapshot), current polling 'interval', 'polls' and
+        'errors'.
+        """
+        now = self.clock()
+        with self._lock:
+            return {
+                symbol: {
+                    'latency': state.latency,
+                    'staleness': None if state.fetched_at is None else now - state.fetched_at,
+                    'interval': state.interval,
+                    'polls': state.polls,
+                    'errors': state.errors,
+                }
+                for symbol, state in self._states.items()
+            }
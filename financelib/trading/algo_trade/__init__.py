@@ -9,6 +9,30 @@ from .stochastic import stochastic
 from .williams_r import williams_r
 from .cci import cci
 from .aroon import aroon
+from .adx_wilder import adx_wilder
+from .vwap import vwap
+from .obv import obv
+from .supertrend import supertrend
+from .parabolic_sar import parabolic_sar
+from .ichimoku import ichimoku
+from . import panel
+from . import sweep
+from . import parallel
+from .plan import FeaturePlan
+from .cache import IndicatorCache
+from .incremental import (
+    IncrementalSMA,
+    IncrementalEMA,
+    IncrementalRSI,
+    IncrementalMACD,
+    IncrementalBollingerBands,
+    IncrementalATR,
+    IncrementalADX,
+    IncrementalStochastic,
+    IncrementalWilliamsR,
+    IncrementalCCI,
+    IncrementalAroon
+)
 
 __all__ = [
     'bollinger_bands',
@@ -21,5 +45,27 @@ __all__ = [
     'stochastic',
     'williams_r',
     'cci',
-    'aroon'
+    'aroon',
+    'adx_wilder',
+    'vwap',
+    'obv',
+    'supertrend',
+    'parabolic_sar',
+    'ichimoku',
+    'panel',
+    'sweep',
+    'parallel',
+    'FeaturePlan',
+    'IndicatorCache',
+    'IncrementalSMA',
+    'IncrementalEMA',
+    'IncrementalRSI',
+    'IncrementalMACD',
+    'IncrementalBollingerBands',
+    'IncrementalATR',
+    'IncrementalADX',
+    'IncrementalStochastic',
+    'IncrementalWilliamsR',
+    'IncrementalCCI',
+    'IncrementalAroon'
 ]
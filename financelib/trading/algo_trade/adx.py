@@ -1,7 +1,15 @@
 import pandas as pd
 
-def adx(high, low, close, period=14):
-  """Calculate Average Directional Index. (ADX)"""
+from . import compact
+
+def adx(high, low, close, period=14, dtype=None, out=None):
+  """Calculate Average Directional Index. (ADX)
+
+  Pass ``dtype`` (e.g. 'float32') and/or a preallocated ``out`` buffer to
+  run the chunked compact-memory kernels instead, see ``compact``.
+  """
+  if dtype is not None or out is not None:
+    return compact.adx(high, low, close, period, dtype=dtype, out=out)
 
   plus_dm = high.diff()
   minus_dm = low.diff()
@@ -0,0 +1,18 @@
+import numpy as np
+import pandas as pd
+
+from . import loops
+
+def adx_wilder(high, low, close, period=14):
+  """Calculate Average Directional Index the way Wilder defined it.
+
+  Unlike ``adx``, only the larger of the up and down move counts as
+  directional movement (negative moves count as zero), and TR, +DM, -DM and
+  DX are smoothed with Wilder's running average instead of a rolling mean.
+  The first value is at bar ``2 * period - 1``.
+  """
+
+  close = pd.Series(close)
+  values = [np.ascontiguousarray(s, dtype=np.float64) for s in (high, low, close)]
+  kernel = loops.adx_wilder_loop if loops.NUMBA else loops.adx_wilder_numpy
+  return pd.Series(kernel(*values, period), index=close.index)
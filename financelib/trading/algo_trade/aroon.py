@@ -1,8 +1,29 @@
 import pandas as pd
 
-def aroon(high, low, period=25):
-  """Calculate Aroon Indicator."""
+from . import compact
+from .kernels import check_backend, rolling_argmax, rolling_argmin
 
-  aroon_up = 100 * (period - high.rolling(period + 1).apply(lambda x: x.argmax())) / period
-  aroon_down = 100 * (period - low.rolling(period + 1).apply(lambda x: x.argmin())) / period
-  return aroon_up, aroon_down
+def aroon(high, low, period=25, backend='numpy', dtype=None, out=None):
+  """Calculate Aroon Indicator.
+
+  backend='numpy' runs a vectorized kernel, backend='pandas' uses the
+  original rolling apply with a Python callback per window.
+  Passing ``dtype`` and/or ``out`` runs the compact-memory kernels, see
+  ``compact``.
+  """
+
+  if dtype is not None or out is not None:
+    return compact.aroon(high, low, period, dtype=dtype, out=out)
+
+  if check_backend(backend) == 'pandas':
+    aroon_up = 100 * (period - high.rolling(period + 1).apply(lambda x: x.argmax())) / period
+    aroon_down = 100 * (period - low.rolling(period + 1).apply(lambda x: x.argmin())) / period
+    return aroon_up, aroon_down
+
+  high, low = pd.Series(high), pd.Series(low)
+  aroon_up = 100 * (period - rolling_argmax(high.to_numpy(dtype=float), period + 1)) / period
+  aroon_down = 100 * (period - rolling_argmin(low.to_numpy(dtype=float), period + 1)) / period
+  return (
+    pd.Series(aroon_up, index=high.index, name=high.name),
+    pd.Series(aroon_down, index=low.index, name=low.name)
+  )
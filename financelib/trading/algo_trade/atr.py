@@ -1,7 +1,15 @@
 import pandas as pd
 
-def atr(high, low, close, period=14):
-  """Calculate Average True Range."""
+from . import compact
+
+def atr(high, low, close, period=14, dtype=None, out=None):
+  """Calculate Average True Range.
+
+  Pass ``dtype`` (e.g. 'float32') and/or a preallocated ``out`` buffer to
+  run the chunked compact-memory kernels instead, see ``compact``.
+  """
+  if dtype is not None or out is not None:
+    return compact.atr(high, low, close, period, dtype=dtype, out=out)
 
   tr = pd.DataFrame({
     'HL': high - low,
@@ -1,7 +1,15 @@
 import pandas as pd
 
-def bollinger_bands(data, period=20, std_dev=2):
-  """Calculate Bollinger Bands."""
+from . import compact
+
+def bollinger_bands(data, period=20, std_dev=2, dtype=None, out=None):
+  """Calculate Bollinger Bands.
+
+  Pass ``dtype`` (e.g. 'float32') and/or a preallocated ``out`` buffer to
+  run the chunked compact-memory kernels instead, see ``compact``.
+  """
+  if dtype is not None or out is not None:
+    return compact.bollinger_bands(data, period, std_dev, dtype=dtype, out=out)
 
   middle_band = pd.Series(data).rolling(window=period).mean()
   std = pd.Series(data).rolling(window=period).std()
@@ -0,0 +1,288 @@
+"""
+Opt-in memoization for indicator calls.
+
+    cache = IndicatorCache(max_bytes=64 * 1024 * 1024)
+    value = cache(rsi, df['close'], period=14)
+    cached_atr = cache.wrap(atr)
+
+Results are keyed by the indicator, its parameters and a fingerprint of the
+input data (values and labels of Series, DataFrames and arrays), so the dashboards, the bot and the screener
+asking for the same thing on the same candles only pay for it once.
+
+When the input is the cached input with new bars appended, only the tail is
+computed: the indicator runs on the new bars plus the warm-up it needs and
+the result is joined onto the cached prefix. EMA based indicators depend on
+the whole history and are recomputed in full in that case.
+
+Returned Series share memory with the cache; treat them as read-only.
+"""
+import hashlib
+import inspect
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from . import panel
+from .adx import adx
+from .aroon import aroon
+from .atr import atr
+from .bollinger_bands import bollinger_bands
+from .cci import cci
+from .ema import ema
+from .macd import macd
+from .rsi import rsi
+from .sma import sma
+from .stochastic import stochastic
+from .williams_r import williams_r
+
+# Rows of history each indicator needs before the first bar it recomputes,
+# or None when the value depends on the whole history. Keyed by the function
+# itself: ``sweep.sma`` shares a name with ``sma`` but not its parameters.
+# The panel versions give the same numbers per column, so they share rules.
+_RULES = {
+  'sma': lambda p: p['period'] - 1,
+  'ema': lambda p: None,
+  'rsi': lambda p: p['period'],
+  'macd': lambda p: None,
+  'bollinger_bands': lambda p: p['period'] - 1,
+  'atr': lambda p: p['period'],
+  'adx': lambda p: 2 * p['period'],
+  'stochastic': lambda p: p['k_period'] + p['d_period'] - 2,
+  'williams_r': lambda p: p['period'] - 1,
+  'cci': lambda p: p['period'] - 1,
+  'aroon': lambda p: p['period'],
+}
+LOOKBACK = {}
+for _func in (sma, ema, rsi, macd, bollinger_bands, atr, adx, stochastic, williams_r, cci, aroon):
+  LOOKBACK[_func] = _rules = _RULES[_func.__name__]
+  LOOKBACK[getattr(panel, _func.__name__)] = _rules
+
+# How many same-indicator entries are checked for an append-only extension.
+EXTENSION_CANDIDATES = 4
+
+
+def _is_data(value):
+  return isinstance(value, (pd.Series, pd.DataFrame, np.ndarray))
+
+
+def _rows(value, start=None, stop=None):
+  if isinstance(value, (pd.Series, pd.DataFrame)):
+    return value.iloc[start:stop]
+  return value[start:stop]
+
+
+def _freeze(value):
+  """Hashable form of a parameter (lists and dicts become tuples, sets frozensets)"""
+  if isinstance(value, (list, tuple)):
+    return tuple(_freeze(item) for item in value)
+  if isinstance(value, (set, frozenset)):
+    return frozenset(_freeze(item) for item in value)
+  if isinstance(value, dict):
+    return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+  return value
+
+
+def _hash_array(digest, values):
+  values = np.asarray(values)
+  if values.dtype.kind in 'biufcmM':
+    digest.update(values.dtype.str.encode())
+    digest.update(np.ascontiguousarray(values).view(np.uint8))
+  else:
+    digest.update(pd.util.hash_array(values.astype(object)).view(np.uint8))
+
+
+def _hash_index(digest, index):
+  if isinstance(index, pd.RangeIndex):
+    digest.update(repr((index.start, index.step)).encode())
+  else:
+    _hash_array(digest, index.to_numpy())
+
+
+def fingerprint(data, length=None):
+  """Fingerprint of a Series, DataFrame or array (values and labels), optionally of its first rows."""
+  if length is not None:
+    data = _rows(data, stop=length)
+  digest = hashlib.blake2b(digest_size=16)
+  digest.update(repr(data.shape).encode())
+  if isinstance(data, np.ndarray):
+    _hash_array(digest, data)
+    return digest.hexdigest()
+  if isinstance(data, pd.DataFrame):
+    for _, column in data.items():
+      _hash_array(digest, column.to_numpy())
+    _hash_index(digest, data.columns)
+  else:
+    _hash_array(digest, data.to_numpy())
+  _hash_index(digest, data.index)
+  return digest.hexdigest()
+
+
+def _nbytes(result):
+  if isinstance(result, tuple):
+    return sum(_nbytes(part) for part in result)
+  if isinstance(result, (pd.Series, pd.DataFrame)):
+    return int(np.asarray(result.memory_usage(index=True)).sum())
+  return int(getattr(result, 'nbytes', 0))
+
+
+def _splice(prefix, tail, offset):
+  if isinstance(prefix, tuple):
+    return tuple(_splice(head, rest, offset) for head, rest in zip(prefix, tail))
+  if isinstance(prefix, np.ndarray):
+    return np.concatenate([prefix, tail[offset:]])
+  return pd.concat([prefix, tail.iloc[offset:]])
+
+
+def _share(result):
+  if isinstance(result, tuple):
+    return tuple(_share(part) for part in result)
+  return result.copy(deep=False) if isinstance(result, (pd.Series, pd.DataFrame)) else result
+
+
+class _Entry:
+  __slots__ = ('call', 'length', 'fingerprints', 'result', 'nbytes')
+
+  def __init__(self, call, length, fingerprints, result):
+    self.call = call
+    self.length = length
+    self.fingerprints = fingerprints
+    self.result = result
+    self.nbytes = _nbytes(result)
+
+
+class IndicatorCache:
+  """Bounded LRU cache for indicator results with hit/miss counters."""
+
+  def __init__(self, max_bytes=256 * 1024 * 1024, max_entries=4096):
+    self.max_bytes = max_bytes
+    self.max_entries = max_entries
+    self._entries = OrderedDict()
+    self._by_call = {}
+    self._bytes = 0
+    self._lock = threading.Lock()
+    self.hits = 0
+    self.misses = 0
+    self.extensions = 0
+    self.evictions = 0
+
+  def __call__(self, func, *args, **kwargs):
+    signature = inspect.signature(func).bind(*args, **kwargs)
+    signature.apply_defaults()
+    if signature.arguments.get('out') is not None:
+      raise ValueError('Cached results are shared, please call the indicator directly to fill an out buffer')
+    data = {name: value for name, value in signature.arguments.items() if _is_data(value)}
+    params = tuple(sorted((name, _freeze(value)) for name, value in signature.arguments.items() if name not in data))
+    call = (f'{func.__module__}.{func.__qualname__}', tuple(data), params)
+    try:
+      hash(params)
+    except TypeError:
+      # Parameters we cannot key on, e.g. an object argument
+      return func(*args, **kwargs)
+    if not data:
+      return func(*args, **kwargs)
+
+    lengths = {len(value) for value in data.values()}
+    length = lengths.pop() if len(lengths) == 1 else None
+    fingerprints = tuple(fingerprint(value) for value in data.values())
+    key = (call, fingerprints)
+
+    with self._lock:
+      entry = self._entries.get(key)
+      if entry is not None:
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return _share(entry.result)
+      candidates = self._candidates(call, length)
+
+    result = None
+    if candidates:
+      result = self._extend(func, signature, data, candidates)
+    if result is None:
+      result = func(*args, **kwargs)
+      with self._lock:
+        self.misses += 1
+    else:
+      with self._lock:
+        self.extensions += 1
+
+    self._store(key, _Entry(call, length, fingerprints, result))
+    return _share(result)
+
+  def wrap(self, func):
+    """Return ``func`` with every call going through this cache."""
+    def cached(*args, **kwargs):
+      return self(func, *args, **kwargs)
+
+    cached.__name__ = func.__name__
+    cached.__doc__ = func.__doc__
+    cached.__wrapped__ = func
+    return cached
+
+  @property
+  def stats(self):
+    with self._lock:
+      lookups = self.hits + self.misses + self.extensions
+      return {
+        'hits': self.hits,
+        'misses': self.misses,
+        'extensions': self.extensions,
+        'evictions': self.evictions,
+        'entries': len(self._entries),
+        'bytes': self._bytes,
+        'hit_rate': (self.hits + self.extensions) / lookups if lookups else 0.0,
+      }
+
+  def clear(self):
+    with self._lock:
+      self._entries.clear()
+      self._by_call.clear()
+      self._bytes = 0
+
+  def _candidates(self, call, length):
+    if length is None:
+      return []
+    keys = self._by_call.get(call, ())
+    entries = [self._entries[key] for key in keys if self._entries[key].length < length]
+    entries.sort(key=lambda entry: entry.length, reverse=True)
+    return entries[:EXTENSION_CANDIDATES]
+
+  def _extend(self, func, signature, data, candidates):
+    lookback_rule = LOOKBACK.get(func)
+    params = dict(signature.arguments)
+    if lookback_rule is None or params.get('dtype') is not None:
+      return None
+    lookback = lookback_rule(params)
+    if lookback is None:
+      return None
+
+    for entry in candidates:
+      start = entry.length - lookback
+      if start < 0:
+        continue
+      prefix = tuple(fingerprint(value, entry.length) for value in data.values())
+      if prefix != entry.fingerprints:
+        continue
+      for name, value in data.items():
+        # 1-D arrays run as Series so the tail keeps its row labels
+        value = pd.Series(value) if isinstance(value, np.ndarray) and value.ndim == 1 else value
+        params[name] = _rows(value, start)
+      tail = func(**params)
+      return _splice(entry.result, tail, lookback)
+    return None
+
+  def _store(self, key, entry):
+    with self._lock:
+      if key in self._entries:
+        return
+      self._entries[key] = entry
+      self._by_call.setdefault(entry.call, set()).add(key)
+      self._bytes += entry.nbytes
+      while self._entries and (self._bytes > self.max_bytes or len(self._entries) > self.max_entries):
+        old_key, old = self._entries.popitem(last=False)
+        self._by_call[old.call].discard(old_key)
+        if not self._by_call[old.call]:
+          del self._by_call[old.call]
+        self._bytes -= old.nbytes
+        self.evictions += 1
@@ -1,9 +1,28 @@
+import numpy as np
 import pandas as pd
 
-def cci(high, low, close, period=20):
-  """Calculate Commodity Channel Index."""
+from . import compact
+from .kernels import check_backend, rolling_mad, rolling_mean
+
+def cci(high, low, close, period=20, backend='numpy', dtype=None, out=None):
+  """Calculate Commodity Channel Index.
+
+  backend='numpy' runs a vectorized kernel, backend='pandas' uses a rolling
+  apply with a Python callback per window. Passing ``dtype`` and/or ``out``
+  runs the compact-memory kernels, see ``compact``.
+  """
+
+  if dtype is not None or out is not None:
+    return compact.cci(high, low, close, period, dtype=dtype, out=out)
 
   tp = (high + low + close) / 3
-  sma_tp = tp.rolling(period).mean()
-  mad = tp.rolling(period).apply(lambda x: pd.Series(x).mad())
-  return (tp - sma_tp) / (0.015 * mad)
+  if check_backend(backend) == 'pandas':
+    sma_tp = tp.rolling(period).mean()
+    mad = tp.rolling(period).apply(lambda x: np.abs(x - x.mean()).mean(), raw=True)
+    return (tp - sma_tp) / (0.015 * mad)
+
+  tp = pd.Series(tp)
+  values = tp.to_numpy(dtype=float)
+  with np.errstate(divide='ignore', invalid='ignore'):
+    result = (values - rolling_mean(values, period)) / (0.015 * rolling_mad(values, period))
+  return pd.Series(result, index=tp.index, name=tp.name)
@@ -0,0 +1,344 @@
+"""
+Compact-memory kernels behind the ``dtype=`` / ``out=`` options.
+
+The regular indicator functions build several full-length float64 Series
+(delta, gain, loss, rs, ...) before the result. These kernels walk the data
+in chunks of ``CHUNK_SIZE`` rows instead: every temporary lives only for one
+chunk, sums and EMA state are carried in float64, and only the result is
+written at full length, in the requested dtype and, when given, straight into
+the caller's buffer.
+
+    buffer = np.empty(len(close), dtype=np.float32)
+    rsi(close, 14, out=buffer)           # Series backed by ``buffer``
+    bollinger_bands(close, dtype='float32')
+
+Precision in float32 (about 7 significant digits):
+
+- sma, bollinger_bands, atr: window sums are accumulated in float64, so the
+  only loss is rounding the inputs and the result to float32.
+- ema, macd: the recursion runs in float64; the MACD signal line is computed
+  from the unrounded MACD line.
+- rsi, adx: ratios of float64 window sums; only the result is rounded.
+- stochastic, williams_r, cci: differences like ``close - lowest_low`` cancel
+  when the bar range is tiny compared to the price, so the relative error
+  grows to roughly 1e-7 * price / range.
+- aroon: positions are exact, but ties created by rounding the inputs to
+  float32 can move the reported high or low to an earlier bar.
+"""
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .kernels import CHUNK_SIZE, rolling_argmax, rolling_argmin, rolling_mad
+
+# EMA blocks are kept short enough that decay ** -block stays below this.
+_EWM_MAX_SCALE = 1e100
+
+
+def _index(data):
+  return data.index if isinstance(data, pd.Series) else pd.RangeIndex(len(data))
+
+
+def _name(data):
+  return data.name if isinstance(data, pd.Series) else None
+
+
+def _dtype(dtype, out):
+  if dtype is None:
+    dtype = (out[0] if isinstance(out, tuple) else out).dtype
+  dtype = np.dtype(dtype)
+  if dtype.kind != 'f':
+    raise ValueError(f'dtype must be a floating point type, got {dtype}')
+  return dtype
+
+
+def _outputs(out, count, length, dtype):
+  """Caller buffers (validated) or fresh ones, always a tuple of ``count``."""
+  if out is None:
+    return tuple(np.empty(length, dtype=dtype) for _ in range(count))
+  buffers = out if isinstance(out, tuple) else (out,)
+  if len(buffers) != count:
+    raise ValueError(f'out must hold {count} array(s), got {len(buffers)}')
+  for buffer in buffers:
+    if not isinstance(buffer, np.ndarray) or buffer.shape != (length,) or buffer.dtype != dtype:
+      raise ValueError(f'out arrays must be 1-D numpy arrays of length {length} and dtype {dtype}')
+  return buffers
+
+
+def _series(buffers, data, named=True):
+  index, name = _index(data), _name(data) if named else None
+  result = tuple(pd.Series(buffer, index=index, name=name, copy=False) for buffer in buffers)
+  return result if len(result) > 1 else result[0]
+
+
+def _chunks(length, size=None):
+  size = size or CHUNK_SIZE
+  for start in range(0, length, size):
+    yield start, min(start + size, length)
+
+
+def _reader(values):
+  """Rows ``a:b`` of ``values`` as float64."""
+  return lambda a, b: np.asarray(values[a:b], dtype=np.float64)
+
+
+def _previous(values, a, b):
+  """Rows ``a-1:b-1`` of ``values`` as float64, NaN before the first row."""
+  if a > 0:
+    return np.asarray(values[a - 1:b - 1], dtype=np.float64)
+  return np.concatenate(([np.nan], np.asarray(values[:b - 1], dtype=np.float64)))
+
+
+def _window_stats(rows, period, a, b, std=False):
+  """Trailing window mean (and sample std) for rows ``a:b``.
+
+  Windows that are incomplete or contain NaN or inf give NaN, like pandas.
+  """
+  first = max(a - period + 1, 0)
+  values = rows(first, b)
+  offset = a - first
+  mean = np.full(b - a, np.nan)
+  deviation = np.full(b - a, np.nan) if std else None
+  begin = max(offset, period - 1)
+  if begin >= len(values):
+    return mean, deviation
+
+  nan = ~np.isfinite(values)
+  valid = values[~nan]
+  shift = valid[0] if len(valid) else 0.0
+  shifted = np.where(nan, 0.0, values - shift)
+  ends = slice(begin + 1, len(values) + 1)
+  starts = slice(begin + 1 - period, len(values) + 1 - period)
+
+  sums = np.concatenate(([0.0], np.cumsum(shifted)))
+  total = sums[ends] - sums[starts]
+  counts = np.concatenate(([0], np.cumsum(nan)))
+  missing = (counts[ends] - counts[starts]) > 0
+
+  result = mean[begin - offset:]
+  result[:] = total / period + shift
+  result[missing] = np.nan
+  if std and period > 1:
+    squares = np.concatenate(([0.0], np.cumsum(shifted * shifted)))
+    variance = ((squares[ends] - squares[starts]) - total * total / period) / (period - 1)
+    result = deviation[begin - offset:]
+    result[:] = np.sqrt(np.maximum(variance, 0.0))
+    result[missing] = np.nan
+  return mean, deviation
+
+
+def _window_kernel(rows, period, a, b, kernel):
+  """Apply a full-array rolling ``kernel`` and keep rows ``a:b``."""
+  first = max(a - period + 1, 0)
+  return kernel(rows(first, b), period)[a - first:]
+
+
+def _rolling_max(values, period):
+  out = np.full(len(values), np.nan)
+  if len(values) >= period:
+    out[period - 1:] = sliding_window_view(values, period).max(axis=-1)
+  return out
+
+
+def _rolling_min(values, period):
+  out = np.full(len(values), np.nan)
+  if len(values) >= period:
+    out[period - 1:] = sliding_window_view(values, period).min(axis=-1)
+  return out
+
+
+class _Ewm:
+  """Adjusted EWM mean (``ewm(span).mean()``) carried across blocks."""
+
+  def __init__(self, span):
+    self.decay = 1 - 2 / (span + 1)
+    if self.decay <= 0:
+      self.block_size = 1
+    else:
+      self.block_size = max(1, min(CHUNK_SIZE, int(np.log(_EWM_MAX_SCALE) / -np.log(self.decay))))
+    self._num = 0.0
+    self._den = 0.0
+
+  def step(self, values):
+    """EWM of the next ``len(values) <= block_size`` rows."""
+    valid = ~np.isnan(values)
+    steps = np.arange(len(values))
+    weight = self.decay ** steps
+    carry = self.decay * weight
+    scale = 1.0 / weight if self.decay > 0 else np.ones(len(values))
+    num = carry * self._num + weight * np.cumsum(np.where(valid, values, 0.0) * scale)
+    den = carry * self._den + weight * np.cumsum(valid * scale)
+    self._num, self._den = num[-1], den[-1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+      return num / den
+
+
+def sma(data, period=20, dtype=None, out=None):
+  dtype = _dtype(dtype, out)
+  values = np.asarray(data, dtype=dtype)
+  (result,) = _outputs(out, 1, len(values), dtype)
+  rows = _reader(values)
+  for start, stop in _chunks(len(values)):
+    result[start:stop] = _window_stats(rows, period, start, stop)[0]
+  return _series((result,), data)
+
+
+def ema(data, period=20, dtype=None, out=None):
+  dtype = _dtype(dtype, out)
+  values = np.asarray(data, dtype=dtype)
+  (result,) = _outputs(out, 1, len(values), dtype)
+  ewm = _Ewm(period)
+  for start, stop in _chunks(len(values), ewm.block_size):
+    result[start:stop] = ewm.step(np.asarray(values[start:stop], dtype=np.float64))
+  return _series((result,), data)
+
+
+def macd(data, fast_period=12, slow_period=26, signal_period=9, dtype=None, out=None):
+  dtype = _dtype(dtype, out)
+  values = np.asarray(data, dtype=dtype)
+  macd_out, signal_out = _outputs(out, 2, len(values), dtype)
+  fast, slow, signal = _Ewm(fast_period), _Ewm(slow_period), _Ewm(signal_period)
+  block = min(fast.block_size, slow.block_size, signal.block_size)
+  for start, stop in _chunks(len(values), block):
+    chunk = np.asarray(values[start:stop], dtype=np.float64)
+    macd_line = fast.step(chunk) - slow.step(chunk)
+    macd_out[start:stop] = macd_line
+    signal_out[start:stop] = signal.step(macd_line)
+  return _series((macd_out, signal_out), data)
+
+
+def rsi(data, period=14, dtype=None, out=None):
+  dtype = _dtype(dtype, out)
+  values = np.asarray(data, dtype=dtype)
+  (result,) = _outputs(out, 1, len(values), dtype)
+
+  def change(a, b):
+    return np.asarray(values[a:b], dtype=np.float64) - _previous(values, a, b)
+
+  def gain(a, b):
+    delta = change(a, b)
+    return np.where(delta > 0, delta, 0.0)
+
+  def loss(a, b):
+    delta = change(a, b)
+    return np.where(delta < 0, -delta, 0.0)
+
+  with np.errstate(divide='ignore', invalid='ignore'):
+    for start, stop in _chunks(len(values)):
+      rs = _window_stats(gain, period, start, stop)[0] / _window_stats(loss, period, start, stop)[0]
+      result[start:stop] = 100 - (100 / (1 + rs))
+  return _series((result,), data)
+
+
+def bollinger_bands(data, period=20, std_dev=2, dtype=None, out=None):
+  dtype = _dtype(dtype, out)
+  values = np.asarray(data, dtype=dtype)
+  upper, middle, lower = _outputs(out, 3, len(values), dtype)
+  rows = _reader(values)
+  for start, stop in _chunks(len(values)):
+    mean, std = _window_stats(rows, period, start, stop, std=True)
+    middle[start:stop] = mean
+    upper[start:stop] = mean + std * std_dev
+    lower[start:stop] = mean - std * std_dev
+  return _series((upper, middle, lower), data)
+
+
+def _true_range(high, low, close):
+  def rows(a, b):
+    h = np.asarray(high[a:b], dtype=np.float64)
+    l = np.asarray(low[a:b], dtype=np.float64)
+    prev_close = _previous(close, a, b)
+    return np.fmax(np.fmax(h - l, np.abs(h - prev_close)), np.abs(l - prev_close))
+  return rows
+
+
+def atr(high, low, close, period=14, dtype=None, out=None):
+  dtype = _dtype(dtype, out)
+  h, l, c = (np.asarray(s, dtype=dtype) for s in (high, low, close))
+  (result,) = _outputs(out, 1, len(c), dtype)
+  tr = _true_range(h, l, c)
+  for start, stop in _chunks(len(c)):
+    result[start:stop] = _window_stats(tr, period, start, stop)[0]
+  return _series((result,), close, named=False)
+
+
+def adx(high, low, close, period=14, dtype=None, out=None):
+  dtype = _dtype(dtype, out)
+  h, l, c = (np.asarray(s, dtype=dtype) for s in (high, low, close))
+  (result,) = _outputs(out, 1, len(c), dtype)
+  tr = _true_range(h, l, c)
+
+  def plus_dm(a, b):
+    return np.asarray(h[a:b], dtype=np.float64) - _previous(h, a, b)
+
+  def minus_dm(a, b):
+    return np.asarray(l[a:b], dtype=np.float64) - _previous(l, a, b)
+
+  def dx(a, b):
+    atr_values = _window_stats(tr, period, a, b)[0]
+    plus_di = 100 * (_window_stats(plus_dm, period, a, b)[0] / atr_values)
+    minus_di = 100 * (_window_stats(minus_dm, period, a, b)[0] / atr_values)
+    return 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+
+  with np.errstate(divide='ignore', invalid='ignore'):
+    for start, stop in _chunks(len(c)):
+      result[start:stop] = _window_stats(dx, period, start, stop)[0]
+  return _series((result,), close, named=False)
+
+
+def _range_rows(high, low, close, period, formula):
+  def rows(a, b):
+    highest = _window_kernel(_reader(high), period, a, b, _rolling_max)
+    lowest = _window_kernel(_reader(low), period, a, b, _rolling_min)
+    return formula(np.asarray(close[a:b], dtype=np.float64), lowest, highest)
+  return rows
+
+
+def stochastic(high, low, close, k_period=14, d_period=3, dtype=None, out=None):
+  dtype = _dtype(dtype, out)
+  h, l, c = (np.asarray(s, dtype=dtype) for s in (high, low, close))
+  k_out, d_out = _outputs(out, 2, len(c), dtype)
+  k = _range_rows(h, l, c, k_period, lambda close_, lowest, highest: 100 * (close_ - lowest) / (highest - lowest))
+  with np.errstate(divide='ignore', invalid='ignore'):
+    for start, stop in _chunks(len(c)):
+      k_out[start:stop] = k(start, stop)
+      d_out[start:stop] = _window_stats(k, d_period, start, stop)[0]
+  return _series((k_out, d_out), close, named=False)
+
+
+def williams_r(high, low, close, period=14, dtype=None, out=None):
+  dtype = _dtype(dtype, out)
+  h, l, c = (np.asarray(s, dtype=dtype) for s in (high, low, close))
+  (result,) = _outputs(out, 1, len(c), dtype)
+  rows = _range_rows(h, l, c, period, lambda close_, lowest, highest: -100 * (highest - close_) / (highest - lowest))
+  with np.errstate(divide='ignore', invalid='ignore'):
+    for start, stop in _chunks(len(c)):
+      result[start:stop] = rows(start, stop)
+  return _series((result,), close, named=False)
+
+
+def cci(high, low, close, period=20, dtype=None, out=None):
+  dtype = _dtype(dtype, out)
+  h, l, c = (np.asarray(s, dtype=dtype) for s in (high, low, close))
+  (result,) = _outputs(out, 1, len(c), dtype)
+
+  def typical_price(a, b):
+    return (np.asarray(h[a:b], dtype=np.float64) + l[a:b] + c[a:b]) / 3
+
+  with np.errstate(divide='ignore', invalid='ignore'):
+    for start, stop in _chunks(len(c)):
+      tp = typical_price(start, stop)
+      mean = _window_stats(typical_price, period, start, stop)[0]
+      mad = _window_kernel(typical_price, period, start, stop, rolling_mad)
+      result[start:stop] = (tp - mean) / (0.015 * mad)
+  return _series((result,), close, named=False)
+
+
+def aroon(high, low, period=25, dtype=None, out=None):
+  dtype = _dtype(dtype, out)
+  h, l = np.asarray(high, dtype=dtype), np.asarray(low, dtype=dtype)
+  up, down = _outputs(out, 2, len(h), dtype)
+  for start, stop in _chunks(len(h)):
+    up[start:stop] = 100 * (period - _window_kernel(_reader(h), period + 1, start, stop, rolling_argmax)) / period
+    down[start:stop] = 100 * (period - _window_kernel(_reader(l), period + 1, start, stop, rolling_argmin)) / period
+  return _series((up,), high), _series((down,), low)
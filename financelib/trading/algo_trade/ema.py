@@ -1,5 +1,13 @@
 import pandas as pd
 
-def ema(data, period=20):
-  """Calculate Exponential Moving Average."""
+from . import compact
+
+def ema(data, period=20, dtype=None, out=None):
+  """Calculate Exponential Moving Average.
+
+  Pass ``dtype`` (e.g. 'float32') and/or a preallocated ``out`` buffer to
+  run the chunked compact-memory kernels instead, see ``compact``.
+  """
+  if dtype is not None or out is not None:
+    return compact.ema(data, period, dtype=dtype, out=out)
   return pd.Series(data).ewm(span=period).mean()
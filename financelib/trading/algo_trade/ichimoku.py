@@ -0,0 +1,19 @@
+import numpy as np
+import pandas as pd
+
+from . import loops
+
+def ichimoku(high, low, close, tenkan_period=9, kijun_period=26, senkou_period=52):
+  """Calculate Ichimoku Cloud.
+
+  Returns tenkan-sen, kijun-sen, senkou span A, senkou span B and chikou span.
+  The senkou spans are shifted ``kijun_period`` bars forward and the chikou
+  span ``kijun_period`` bars back, all on the input index, so the cloud
+  projected past the last bar is not included.
+  """
+
+  close = pd.Series(close)
+  values = [np.ascontiguousarray(s, dtype=np.float64) for s in (high, low, close)]
+  kernel = loops.ichimoku_loop if loops.NUMBA else loops.ichimoku_numpy
+  lines = kernel(*values, tenkan_period, kijun_period, senkou_period)
+  return tuple(pd.Series(line, index=close.index) for line in lines)
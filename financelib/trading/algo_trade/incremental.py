@@ -0,0 +1,431 @@
+"""
+Streaming counterparts of the batch indicators.
+
+Each class keeps just enough state (running sums, EMA numerators, monotonic
+deques) to produce the next value in constant time when a new bar arrives,
+and gives the same numbers as the matching batch function. Call ``seed`` with
+the history you already have, then ``update`` on every new bar.
+"""
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from .ema import ema
+
+NaN = float('nan')
+
+
+def _isnan(x):
+  return x != x
+
+
+def _div(a, b):
+  """Divide like numpy does on float arrays (x/0 -> +-inf, 0/0 -> NaN)."""
+  if b == 0 or _isnan(b):
+    if _isnan(b) or a == 0 or _isnan(a):
+      return NaN
+    return float('inf') if (a > 0) == (b >= 0) else float('-inf')
+  return a / b
+
+
+def _nanmax(*values):
+  values = [v for v in values if not _isnan(v)]
+  return max(values) if values else NaN
+
+
+def _as_array(data):
+  return np.asarray(data, dtype=float)
+
+
+class _RollingWindow:
+  """Fixed-size window with a running (shifted) sum and sum of squares."""
+
+  def __init__(self, period):
+    self.period = period
+    self.values = deque()
+    self.nans = 0
+    self._shift = None
+    self._sum = 0.0
+    self._sumsq = 0.0
+
+  def push(self, x):
+    if len(self.values) == self.period:
+      old = self.values.popleft()
+      if _isnan(old):
+        self.nans -= 1
+      else:
+        old -= self._shift
+        self._sum -= old
+        self._sumsq -= old * old
+    self.values.append(x)
+    if _isnan(x):
+      self.nans += 1
+    else:
+      if self._shift is None:
+        self._shift = x
+      x -= self._shift
+      self._sum += x
+      self._sumsq += x * x
+
+  @property
+  def ready(self):
+    return len(self.values) == self.period and self.nans == 0
+
+  def mean(self):
+    if not self.ready:
+      return NaN
+    return self._shift + self._sum / self.period
+
+  def std(self):
+    if not self.ready or self.period < 2:
+      return NaN
+    var = (self._sumsq - self._sum * self._sum / self.period) / (self.period - 1)
+    return var ** 0.5 if var > 0 else 0.0
+
+
+class _MonotonicWindow:
+  """Rolling max (or min) over the last ``period`` values with its position."""
+
+  def __init__(self, period, mode='max'):
+    self.period = period
+    self._better = (lambda a, b: a < b) if mode == 'max' else (lambda a, b: a > b)
+    self._deque = deque()
+    self._nans = deque()
+    self._index = -1
+
+  def push(self, x):
+    self._index += 1
+    start = self._index - self.period + 1
+    while self._deque and self._deque[0][0] < start:
+      self._deque.popleft()
+    while self._nans and self._nans[0] < start:
+      self._nans.popleft()
+    if _isnan(x):
+      self._nans.append(self._index)
+      return
+    # Keep the earliest of equal values in front, like numpy's argmax/argmin.
+    while self._deque and self._better(self._deque[-1][1], x):
+      self._deque.pop()
+    self._deque.append((self._index, x))
+
+  @property
+  def ready(self):
+    return self._index + 1 >= self.period and not self._nans
+
+  def value(self):
+    return self._deque[0][1] if self.ready else NaN
+
+  def position(self):
+    """Offset of the extreme inside the window (0 is the oldest bar)."""
+    if not self.ready:
+      return NaN
+    return self._deque[0][0] - (self._index - self.period + 1)
+
+
+class IncrementalSMA:
+  """Streaming Simple Moving Average, matches ``sma``."""
+
+  def __init__(self, period=20):
+    self.period = period
+    self._window = _RollingWindow(period)
+    self.value = NaN
+
+  def seed(self, data):
+    for price in _as_array(data)[-self.period:]:
+      self.update(price)
+    return self
+
+  def update(self, price):
+    self._window.push(float(price))
+    self.value = self._window.mean()
+    return self.value
+
+
+class IncrementalEMA:
+  """Streaming Exponential Moving Average, matches ``ema`` (adjusted ewm)."""
+
+  def __init__(self, period=20):
+    self.period = period
+    self._decay = 1 - 2 / (period + 1)
+    self._num = 0.0
+    self._den = 0.0
+    self.value = NaN
+
+  def seed(self, data):
+    values = _as_array(data)
+    if len(values) == 0:
+      return self
+    valid = ~np.isnan(values)
+    age = np.arange(len(values) - 1, -1, -1)
+    self._den = float((self._decay ** age[valid]).sum())
+    self.value = float(ema(values, self.period).iloc[-1])
+    self._num = self.value * self._den if self._den else 0.0
+    return self
+
+  def update(self, price):
+    price = float(price)
+    self._num *= self._decay
+    self._den *= self._decay
+    if not _isnan(price):
+      self._num += price
+      self._den += 1.0
+    self.value = self._num / self._den if self._den else NaN
+    return self.value
+
+
+class IncrementalRSI:
+  """Streaming Relative Strength Index, matches ``rsi``."""
+
+  def __init__(self, period=14):
+    self.period = period
+    self._gain = _RollingWindow(period)
+    self._loss = _RollingWindow(period)
+    self._prev = NaN
+    self.value = NaN
+
+  def seed(self, data):
+    for price in _as_array(data)[-(self.period + 1):]:
+      self.update(price)
+    return self
+
+  def update(self, price):
+    price = float(price)
+    delta = price - self._prev
+    self._prev = price
+    self._gain.push(delta if delta > 0 else 0.0)
+    self._loss.push(-delta if delta < 0 else 0.0)
+    rs = _div(self._gain.mean(), self._loss.mean())
+    self.value = 100 - _div(100, 1 + rs)
+    return self.value
+
+
+class IncrementalMACD:
+  """Streaming MACD, matches ``macd``. ``update`` returns (macd, signal)."""
+
+  def __init__(self, fast_period=12, slow_period=26, signal_period=9):
+    self._fast = IncrementalEMA(fast_period)
+    self._slow = IncrementalEMA(slow_period)
+    self._signal = IncrementalEMA(signal_period)
+    self.value = (NaN, NaN)
+
+  def seed(self, data):
+    values = _as_array(data)
+    if len(values) == 0:
+      return self
+    macd_line = ema(values, self._fast.period) - ema(values, self._slow.period)
+    self._fast.seed(values)
+    self._slow.seed(values)
+    self._signal.seed(macd_line)
+    self.value = (float(macd_line.iloc[-1]), self._signal.value)
+    return self
+
+  def update(self, price):
+    macd_line = self._fast.update(price) - self._slow.update(price)
+    self.value = (macd_line, self._signal.update(macd_line))
+    return self.value
+
+
+class IncrementalBollingerBands:
+  """Streaming Bollinger Bands, matches ``bollinger_bands``.
+
+  ``update`` returns (upper, middle, lower).
+  """
+
+  def __init__(self, period=20, std_dev=2):
+    self.period = period
+    self.std_dev = std_dev
+    self._window = _RollingWindow(period)
+    self.value = (NaN, NaN, NaN)
+
+  def seed(self, data):
+    for price in _as_array(data)[-self.period:]:
+      self.update(price)
+    return self
+
+  def update(self, price):
+    self._window.push(float(price))
+    middle = self._window.mean()
+    std = self._window.std()
+    self.value = (middle + std * self.std_dev, middle, middle - std * self.std_dev)
+    return self.value
+
+
+class _TrueRange:
+  """True range of the latest bar, like the frame built in ``atr``/``adx``."""
+
+  def __init__(self):
+    self._prev_close = NaN
+
+  def update(self, high, low, close):
+    tr = _nanmax(high - low, abs(high - self._prev_close), abs(low - self._prev_close))
+    self._prev_close = close
+    return tr
+
+
+class IncrementalATR:
+  """Streaming Average True Range, matches ``atr``."""
+
+  def __init__(self, period=14):
+    self.period = period
+    self._tr = _TrueRange()
+    self._window = _RollingWindow(period)
+    self.value = NaN
+
+  def seed(self, high, low, close):
+    bars = zip(*(_as_array(s)[-(self.period + 1):] for s in (high, low, close)))
+    for h, l, c in bars:
+      self.update(h, l, c)
+    return self
+
+  def update(self, high, low, close):
+    self._window.push(self._tr.update(float(high), float(low), float(close)))
+    self.value = self._window.mean()
+    return self.value
+
+
+class IncrementalADX:
+  """Streaming Average Directional Index, matches ``adx``."""
+
+  def __init__(self, period=14):
+    self.period = period
+    self._tr = _TrueRange()
+    self._atr = _RollingWindow(period)
+    self._plus_dm = _RollingWindow(period)
+    self._minus_dm = _RollingWindow(period)
+    self._dx = _RollingWindow(period)
+    self._prev_high = NaN
+    self._prev_low = NaN
+    self.value = NaN
+
+  def seed(self, high, low, close):
+    bars = zip(*(_as_array(s)[-2 * self.period:] for s in (high, low, close)))
+    for h, l, c in bars:
+      self.update(h, l, c)
+    return self
+
+  def update(self, high, low, close):
+    high, low, close = float(high), float(low), float(close)
+    self._plus_dm.push(high - self._prev_high)
+    self._minus_dm.push(low - self._prev_low)
+    self._prev_high, self._prev_low = high, low
+    self._atr.push(self._tr.update(high, low, close))
+
+    atr = self._atr.mean()
+    plus_di = 100 * _div(self._plus_dm.mean(), atr)
+    minus_di = 100 * _div(self._minus_dm.mean(), atr)
+    self._dx.push(100 * _div(abs(plus_di - minus_di), plus_di + minus_di))
+    self.value = self._dx.mean()
+    return self.value
+
+
+class IncrementalStochastic:
+  """Streaming Stochastic Oscillator, matches ``stochastic``.
+
+  ``update`` returns (k, d).
+  """
+
+  def __init__(self, k_period=14, d_period=3):
+    self.k_period = k_period
+    self.d_period = d_period
+    self._lowest = _MonotonicWindow(k_period, 'min')
+    self._highest = _MonotonicWindow(k_period, 'max')
+    self._d = _RollingWindow(d_period)
+    self.value = (NaN, NaN)
+
+  def seed(self, high, low, close):
+    size = self.k_period + self.d_period - 1
+    bars = zip(*(_as_array(s)[-size:] for s in (high, low, close)))
+    for h, l, c in bars:
+      self.update(h, l, c)
+    return self
+
+  def update(self, high, low, close):
+    self._highest.push(float(high))
+    self._lowest.push(float(low))
+    lowest_low = self._lowest.value()
+    k = 100 * _div(float(close) - lowest_low, self._highest.value() - lowest_low)
+    self._d.push(k)
+    self.value = (k, self._d.mean())
+    return self.value
+
+
+class IncrementalWilliamsR:
+  """Streaming Williams %R, matches ``williams_r``."""
+
+  def __init__(self, period=14):
+    self.period = period
+    self._lowest = _MonotonicWindow(period, 'min')
+    self._highest = _MonotonicWindow(period, 'max')
+    self.value = NaN
+
+  def seed(self, high, low, close):
+    bars = zip(*(_as_array(s)[-self.period:] for s in (high, low, close)))
+    for h, l, c in bars:
+      self.update(h, l, c)
+    return self
+
+  def update(self, high, low, close):
+    self._highest.push(float(high))
+    self._lowest.push(float(low))
+    highest_high = self._highest.value()
+    self.value = -100 * _div(highest_high - float(close), highest_high - self._lowest.value())
+    return self.value
+
+
+class IncrementalCCI:
+  """Streaming Commodity Channel Index, matches ``cci``.
+
+  The mean absolute deviation has no running form, so each update costs
+  O(period) instead of O(history).
+  """
+
+  def __init__(self, period=20):
+    self.period = period
+    self._window = _RollingWindow(period)
+    self.value = NaN
+
+  def seed(self, high, low, close):
+    bars = zip(*(_as_array(s)[-self.period:] for s in (high, low, close)))
+    for h, l, c in bars:
+      self.update(h, l, c)
+    return self
+
+  def update(self, high, low, close):
+    tp = (float(high) + float(low) + float(close)) / 3
+    self._window.push(tp)
+    sma_tp = self._window.mean()
+    if _isnan(sma_tp):
+      self.value = NaN
+    else:
+      mad = sum(abs(x - sma_tp) for x in self._window.values) / self.period
+      self.value = _div(tp - sma_tp, 0.015 * mad)
+    return self.value
+
+
+class IncrementalAroon:
+  """Streaming Aroon Indicator, matches ``aroon``.
+
+  ``update`` returns (aroon_up, aroon_down).
+  """
+
+  def __init__(self, period=25):
+    self.period = period
+    self._highest = _MonotonicWindow(period + 1, 'max')
+    self._lowest = _MonotonicWindow(period + 1, 'min')
+    self.value = (NaN, NaN)
+
+  def seed(self, high, low):
+    bars = zip(*(_as_array(s)[-(self.period + 1):] for s in (high, low)))
+    for h, l in bars:
+      self.update(h, l)
+    return self
+
+  def update(self, high, low):
+    self._highest.push(float(high))
+    self._lowest.push(float(low))
+    self.value = (
+      100 * (self.period - self._highest.position()) / self.period,
+      100 * (self.period - self._lowest.position()) / self.period
+    )
+    return self.value
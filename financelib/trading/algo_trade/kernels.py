@@ -0,0 +1,88 @@
+"""
+Vectorized NumPy kernels shared by the indicator functions.
+
+The kernels work on plain float arrays and never call back into Python per
+window. Axis 0 is time, so a 2-D (time x symbols) array is processed for all
+columns at once. Windows containing NaN produce NaN, like pandas ``rolling``.
+"""
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Number of windows materialised at once by kernels that need a
+# (windows x period) temporary, to keep memory bounded on long histories.
+CHUNK_SIZE = 1 << 16
+
+BACKENDS = ('numpy', 'pandas')
+
+
+def check_backend(backend):
+  if backend not in BACKENDS:
+    raise ValueError(f"Unknown backend '{backend}'. Available backends: {', '.join(BACKENDS)}")
+  return backend
+
+
+def _windows(values, period):
+  """Trailing windows along the time axis, window contents on the last axis."""
+  return sliding_window_view(values, period, axis=0)
+
+
+def _window_has_nan(values, period):
+  """Boolean mask over the windows that contain at least one NaN."""
+  nan_count = np.cumsum(np.isnan(values), axis=0)
+  nan_count = np.concatenate((np.zeros_like(nan_count[:1]), nan_count))
+  return (nan_count[period:] - nan_count[:-period]) > 0
+
+
+def rolling_argmax(values, period):
+  """Position of the first maximum inside each trailing window."""
+  return _rolling_arg(values, period, np.argmax)
+
+
+def rolling_argmin(values, period):
+  """Position of the first minimum inside each trailing window."""
+  return _rolling_arg(values, period, np.argmin)
+
+
+def _rolling_arg(values, period, arg_func):
+  values = np.asarray(values, dtype=float)
+  out = np.full(values.shape, np.nan)
+  if len(values) < period:
+    return out
+
+  windows = _windows(values, period)
+  result = out[period - 1:]
+  # arg_func copies the strided windows it is given, so hand it CHUNK_SIZE at a time
+  step = max(1, CHUNK_SIZE // max(1, values[0].size))
+  for start in range(0, len(windows), step):
+    result[start:start + step] = arg_func(windows[start:start + step], axis=-1)
+  result[_window_has_nan(values, period)] = np.nan
+  return out
+
+
+def rolling_mean(values, period):
+  """Trailing mean over ``period`` values."""
+  values = np.asarray(values, dtype=float)
+  out = np.full(values.shape, np.nan)
+  if len(values) < period:
+    return out
+
+  out[period - 1:] = _windows(values, period).mean(axis=-1)
+  return out
+
+
+def rolling_mad(values, period):
+  """Trailing mean absolute deviation around the window mean."""
+  values = np.asarray(values, dtype=float)
+  out = np.full(values.shape, np.nan)
+  if len(values) < period:
+    return out
+
+  windows = _windows(values, period)
+  result = out[period - 1:]
+  step = max(1, CHUNK_SIZE // max(1, values[0].size))
+  for start in range(0, len(windows), step):
+    chunk = windows[start:start + step]
+    deviation = chunk - chunk.mean(axis=-1, keepdims=True)
+    np.abs(deviation, out=deviation)
+    result[start:start + step] = deviation.mean(axis=-1)
+  return out
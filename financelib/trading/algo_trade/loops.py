@@ -0,0 +1,275 @@
+"""
+Single-pass kernels for path-dependent indicators.
+
+Each ``*_loop`` kernel walks the bars once and writes its outputs straight
+into preallocated arrays: no intermediate Series, no second pass. They are
+compiled with Numba when it is installed (``pip install numba``). Without it,
+indicators with a closed form (VWAP, OBV, Ichimoku, Wilder smoothing) use the
+vectorized NumPy versions below and the rest (SuperTrend, Parabolic SAR) run
+the same loop as plain Python.
+
+Inputs are float64 arrays. NaNs are not skipped: a NaN bar poisons Wilder
+smoothed values from that bar on.
+"""
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+try:
+  import numba
+except ImportError:
+  numba = None
+
+NUMBA = numba is not None
+
+# Blocked Wilder smoothing keeps (1 - 1/period) ** -block below this.
+_MAX_SCALE = 1e100
+
+
+def _compiled(func):
+  return numba.njit(cache=True, nogil=True)(func) if NUMBA else func
+
+
+@_compiled
+def _true_range(high, low, close, i):
+  return max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+
+
+@_compiled
+def adx_wilder_loop(high, low, close, period):
+  n = len(close)
+  out = np.full(n, np.nan)
+  atr = plus = minus = adx = 0.0
+  for i in range(1, n):
+    up = high[i] - high[i - 1]
+    down = low[i - 1] - low[i]
+    plus_dm = up if up > down and up > 0 else 0.0
+    minus_dm = down if down > up and down > 0 else 0.0
+    tr = _true_range(high, low, close, i)
+    if i <= period:
+      atr += tr / period
+      plus += plus_dm / period
+      minus += minus_dm / period
+      if i < period:
+        continue
+    else:
+      atr += (tr - atr) / period
+      plus += (plus_dm - plus) / period
+      minus += (minus_dm - minus) / period
+
+    plus_di = 100 * plus / atr
+    minus_di = 100 * minus / atr
+    total = plus_di + minus_di
+    dx = 100 * abs(plus_di - minus_di) / total if total != 0 else 0.0
+    if i < 2 * period - 1:
+      adx += dx / period
+    elif i == 2 * period - 1:
+      adx += dx / period
+      out[i] = adx
+    else:
+      adx += (dx - adx) / period
+      out[i] = adx
+  return out
+
+
+def _wilder(values, period, first):
+  """Wilder smoothing of ``values[first:]`` seeded with the mean of its first ``period`` values."""
+  out = np.full(len(values), np.nan)
+  seed = first + period - 1
+  if seed >= len(values):
+    return out
+  out[seed] = values[first:seed + 1].mean()
+  decay = 1 - 1 / period
+  if decay <= 0:
+    out[seed:] = values[seed:]
+    return out
+
+  block = max(1, int(np.log(_MAX_SCALE) / -np.log(decay)))
+  previous = out[seed]
+  for start in range(seed + 1, len(values), block):
+    chunk = values[start:start + block]
+    steps = np.arange(1, len(chunk) + 1)
+    weight = decay ** steps
+    smoothed = weight * (previous + np.cumsum(chunk / weight) / period)
+    out[start:start + len(chunk)] = smoothed
+    previous = smoothed[-1]
+  return out
+
+
+def adx_wilder_numpy(high, low, close, period):
+  up = np.diff(high, prepend=np.nan)
+  down = -np.diff(low, prepend=np.nan)
+  plus_dm = np.where((up > down) & (up > 0), up, 0.0)
+  minus_dm = np.where((down > up) & (down > 0), down, 0.0)
+  prev_close = np.concatenate(([np.nan], close[:-1]))
+  tr = np.maximum(np.maximum(high - low, np.abs(high - prev_close)), np.abs(low - prev_close))
+
+  atr = _wilder(tr, period, 1)
+  with np.errstate(divide='ignore', invalid='ignore'):
+    plus_di = 100 * _wilder(plus_dm, period, 1) / atr
+    minus_di = 100 * _wilder(minus_dm, period, 1) / atr
+    total = plus_di + minus_di
+    dx = np.where(total != 0, 100 * np.abs(plus_di - minus_di) / total, 0.0)
+  return _wilder(dx, period, period)
+
+
+@_compiled
+def vwap_loop(high, low, close, volume, resets):
+  n = len(close)
+  out = np.empty(n)
+  price_volume = total_volume = 0.0
+  for i in range(n):
+    if resets[i]:
+      price_volume = total_volume = 0.0
+    price_volume += (high[i] + low[i] + close[i]) / 3 * volume[i]
+    total_volume += volume[i]
+    out[i] = price_volume / total_volume if total_volume != 0 else np.nan
+  return out
+
+
+def vwap_numpy(high, low, close, volume, resets):
+  sessions = np.cumsum(resets) - 1
+  starts = np.flatnonzero(resets)
+  price_volume = np.cumsum((high + low + close) / 3 * volume)
+  total_volume = np.cumsum(volume)
+  price_volume -= np.concatenate(([0.0], price_volume))[starts][sessions]
+  total_volume -= np.concatenate(([0.0], total_volume))[starts][sessions]
+  with np.errstate(divide='ignore', invalid='ignore'):
+    return np.where(total_volume != 0, price_volume / total_volume, np.nan)
+
+
+@_compiled
+def obv_loop(close, volume):
+  n = len(close)
+  out = np.empty(n)
+  total = 0.0
+  for i in range(n):
+    if i > 0:
+      if close[i] > close[i - 1]:
+        total += volume[i]
+      elif close[i] < close[i - 1]:
+        total -= volume[i]
+    out[i] = total
+  return out
+
+
+def obv_numpy(close, volume):
+  change = np.diff(close, prepend=np.nan)
+  direction = np.where(change > 0, 1.0, np.where(change < 0, -1.0, 0.0))
+  return np.cumsum(np.where(direction != 0, direction * volume, 0.0))
+
+
+@_compiled
+def supertrend_loop(high, low, close, period, multiplier):
+  n = len(close)
+  line = np.full(n, np.nan)
+  direction = np.full(n, np.nan)
+  atr = upper = lower = 0.0
+  trend = 1.0
+  for i in range(1, n):
+    tr = _true_range(high, low, close, i)
+    if i <= period:
+      atr += tr / period
+      if i < period:
+        continue
+    else:
+      atr += (tr - atr) / period
+
+    middle = (high[i] + low[i]) / 2
+    basic_upper = middle + multiplier * atr
+    basic_lower = middle - multiplier * atr
+    if i == period:
+      upper, lower = basic_upper, basic_lower
+    else:
+      if close[i] > upper:
+        trend = 1.0
+      elif close[i] < lower:
+        trend = -1.0
+      if basic_upper < upper or close[i - 1] > upper:
+        upper = basic_upper
+      if basic_lower > lower or close[i - 1] < lower:
+        lower = basic_lower
+    direction[i] = trend
+    line[i] = lower if trend > 0 else upper
+  return line, direction
+
+
+@_compiled
+def parabolic_sar_loop(high, low, step, max_step):
+  n = len(high)
+  out = np.full(n, np.nan)
+  if n < 2:
+    return out
+  rising = high[1] + low[1] >= high[0] + low[0]
+  sar = low[0] if rising else high[0]
+  extreme = high[0] if rising else low[0]
+  factor = step
+  for i in range(1, n):
+    sar = sar + factor * (extreme - sar)
+    if rising:
+      sar = min(sar, low[i - 1], low[i - 2]) if i > 1 else min(sar, low[i - 1])
+      if low[i] < sar:
+        rising, sar, extreme, factor = False, extreme, low[i], step
+      elif high[i] > extreme:
+        extreme = high[i]
+        factor = min(factor + step, max_step)
+    else:
+      sar = max(sar, high[i - 1], high[i - 2]) if i > 1 else max(sar, high[i - 1])
+      if high[i] > sar:
+        rising, sar, extreme, factor = True, extreme, high[i], step
+      elif low[i] < extreme:
+        extreme = low[i]
+        factor = min(factor + step, max_step)
+    out[i] = sar
+  return out
+
+
+@_compiled
+def _midpoint(high, low, i, period):
+  """(highest high + lowest low) / 2 over the ``period`` bars ending at ``i``."""
+  highest = -np.inf
+  lowest = np.inf
+  for j in range(i - period + 1, i + 1):
+    if high[j] != high[j] or low[j] != low[j]:
+      return np.nan
+    highest = max(highest, high[j])
+    lowest = min(lowest, low[j])
+  return (highest + lowest) / 2
+
+
+@_compiled
+def ichimoku_loop(high, low, close, tenkan, kijun, senkou):
+  n = len(close)
+  out = np.full((5, n), np.nan)
+  for i in range(n):
+    if i >= tenkan - 1:
+      out[0, i] = _midpoint(high, low, i, tenkan)
+    if i >= kijun - 1:
+      out[1, i] = _midpoint(high, low, i, kijun)
+    if i + kijun < n:
+      out[2, i + kijun] = (out[0, i] + out[1, i]) / 2
+      if i >= senkou - 1:
+        out[3, i + kijun] = _midpoint(high, low, i, senkou)
+    if i >= kijun:
+      out[4, i - kijun] = close[i]
+  return out
+
+
+def _midpoints(high, low, period):
+  out = np.full(len(high), np.nan)
+  if len(high) >= period:
+    highest = sliding_window_view(high, period).max(axis=-1)
+    lowest = sliding_window_view(low, period).min(axis=-1)
+    out[period - 1:] = (highest + lowest) / 2
+  return out
+
+
+def ichimoku_numpy(high, low, close, tenkan, kijun, senkou):
+  n = len(close)
+  out = np.full((5, n), np.nan)
+  out[0] = _midpoints(high, low, tenkan)
+  out[1] = _midpoints(high, low, kijun)
+  if kijun < n:
+    out[2, kijun:] = (out[0, :n - kijun] + out[1, :n - kijun]) / 2
+    out[3, kijun:] = _midpoints(high, low, senkou)[:n - kijun]
+    out[4, :n - kijun] = close[kijun:]
+  return out
@@ -1,7 +1,15 @@
 import pandas as pd
 
-def macd(data, fast_period=12, slow_period=26, signal_period=9):
-  """Calculate MACD (Moving Average Convergence Divergence)."""
+from . import compact
+
+def macd(data, fast_period=12, slow_period=26, signal_period=9, dtype=None, out=None):
+  """Calculate MACD (Moving Average Convergence Divergence).
+
+  Pass ``dtype`` (e.g. 'float32') and/or a preallocated ``out`` buffer to
+  run the chunked compact-memory kernels instead, see ``compact``.
+  """
+  if dtype is not None or out is not None:
+    return compact.macd(data, fast_period, slow_period, signal_period, dtype=dtype, out=out)
 
   fast_ema = pd.Series(data).ewm(span=fast_period).mean()
   slow_ema = pd.Series(data).ewm(span=slow_period).mean()
@@ -0,0 +1,12 @@
+import numpy as np
+import pandas as pd
+
+from . import loops
+
+def obv(close, volume):
+  """Calculate On-Balance Volume, starting from 0 at the first bar."""
+
+  close = pd.Series(close)
+  values = [np.ascontiguousarray(s, dtype=np.float64) for s in (close, volume)]
+  kernel = loops.obv_loop if loops.NUMBA else loops.obv_numpy
+  return pd.Series(kernel(*values), index=close.index)
@@ -0,0 +1,130 @@
+"""
+Indicators over a whole panel of symbols at once.
+
+Inputs are aligned (time x symbols) data: a wide DataFrame with one column
+per symbol, or a 2-D array with the same layout. Every indicator runs once
+over all columns instead of once per symbol. Leading NaNs (a symbol that
+listed late) are treated as "no history yet", so each column gives the same
+numbers as the single-symbol function applied to that symbol alone. NaNs
+inside a series (halts) are handled the way the single-symbol functions
+handle them.
+
+Results come back in the same form as the input: DataFrames for DataFrames,
+arrays for arrays.
+"""
+import numpy as np
+import pandas as pd
+
+from .kernels import rolling_argmax, rolling_argmin, rolling_mad
+
+
+def _frame(data):
+  if isinstance(data, pd.DataFrame):
+    return data.astype(float)
+  data = np.asarray(data, dtype=float)
+  if data.ndim != 2:
+    raise ValueError('Panel data must be 2-D with time on the rows and symbols on the columns')
+  return pd.DataFrame(data)
+
+
+def _like(result, data):
+  return result if isinstance(data, pd.DataFrame) else result.to_numpy()
+
+
+def _true_range(high, low, close):
+  prev_close = close.shift(1)
+  return np.fmax(np.fmax(high - low, (high - prev_close).abs()), (low - prev_close).abs())
+
+
+def sma(data, period=20):
+  """Simple Moving Average for every column."""
+  frame = _frame(data)
+  return _like(frame.rolling(window=period).mean(), data)
+
+
+def ema(data, period=20):
+  """Exponential Moving Average for every column."""
+  frame = _frame(data)
+  return _like(frame.ewm(span=period).mean(), data)
+
+
+def rsi(data, period=14):
+  """Relative Strength Index for every column."""
+  frame = _frame(data)
+  delta = frame.diff()
+  # ``rsi`` counts a missing change (its first row, or a bar next to a gap
+  # such as a trading halt) as a flat bar; rows before a symbol's first
+  # price are not part of its history at all.
+  listed = frame.notna().cummax()
+  gain = delta.where(delta > 0, 0).where(listed).rolling(window=period).mean()
+  loss = (-delta.where(delta < 0, 0)).where(listed).rolling(window=period).mean()
+  rs = gain / loss
+  return _like(100 - (100 / (1 + rs)), data)
+
+
+def macd(data, fast_period=12, slow_period=26, signal_period=9):
+  """MACD line and signal line for every column."""
+  frame = _frame(data)
+  macd_line = frame.ewm(span=fast_period).mean() - frame.ewm(span=slow_period).mean()
+  signal_line = macd_line.ewm(span=signal_period).mean()
+  return _like(macd_line, data), _like(signal_line, data)
+
+
+def bollinger_bands(data, period=20, std_dev=2):
+  """Upper, middle and lower Bollinger Bands for every column."""
+  frame = _frame(data)
+  rolling = frame.rolling(window=period)
+  middle_band = rolling.mean()
+  std = rolling.std()
+  upper_band = middle_band + (std * std_dev)
+  lower_band = middle_band - (std * std_dev)
+  return _like(upper_band, data), _like(middle_band, data), _like(lower_band, data)
+
+
+def atr(high, low, close, period=14):
+  """Average True Range for every column."""
+  tr = _true_range(_frame(high), _frame(low), _frame(close))
+  return _like(tr.rolling(period).mean(), close)
+
+
+def adx(high, low, close, period=14):
+  """Average Directional Index for every column."""
+  high, low, frame = _frame(high), _frame(low), _frame(close)
+  atr = _true_range(high, low, frame).rolling(period).mean()
+  plus_di = 100 * (high.diff().rolling(period).mean() / atr)
+  minus_di = 100 * (low.diff().rolling(period).mean() / atr)
+  dx = 100 * (plus_di - minus_di).abs() / (plus_di + minus_di)
+  return _like(dx.rolling(period).mean(), close)
+
+
+def stochastic(high, low, close, k_period=14, d_period=3):
+  """Stochastic %K and %D for every column."""
+  lowest_low = _frame(low).rolling(k_period).min()
+  highest_high = _frame(high).rolling(k_period).max()
+  k = 100 * (_frame(close) - lowest_low) / (highest_high - lowest_low)
+  d = k.rolling(d_period).mean()
+  return _like(k, close), _like(d, close)
+
+
+def williams_r(high, low, close, period=14):
+  """Williams %R for every column."""
+  highest_high = _frame(high).rolling(period).max()
+  lowest_low = _frame(low).rolling(period).min()
+  return _like(-100 * (highest_high - _frame(close)) / (highest_high - lowest_low), close)
+
+
+def cci(high, low, close, period=20):
+  """Commodity Channel Index for every column."""
+  tp = (_frame(high) + _frame(low) + _frame(close)) / 3
+  mad = pd.DataFrame(rolling_mad(tp.to_numpy(), period), index=tp.index, columns=tp.columns)
+  return _like((tp - tp.rolling(period).mean()) / (0.015 * mad), close)
+
+
+def aroon(high, low, period=25):
+  """Aroon up and Aroon down for every column."""
+  high_frame, low_frame = _frame(high), _frame(low)
+  up = 100 * (period - rolling_argmax(high_frame.to_numpy(), period + 1)) / period
+  down = 100 * (period - rolling_argmin(low_frame.to_numpy(), period + 1)) / period
+  aroon_up = pd.DataFrame(up, index=high_frame.index, columns=high_frame.columns)
+  aroon_down = pd.DataFrame(down, index=low_frame.index, columns=low_frame.columns)
+  return _like(aroon_up, high), _like(aroon_down, low)
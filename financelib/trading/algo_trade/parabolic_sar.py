@@ -0,0 +1,15 @@
+import numpy as np
+import pandas as pd
+
+from . import loops
+
+def parabolic_sar(high, low, step=0.02, max_step=0.2):
+  """Calculate Parabolic SAR (Stop and Reverse).
+
+  The acceleration factor starts at ``step``, grows by ``step`` with every new
+  extreme point up to ``max_step`` and resets when the trend reverses.
+  """
+
+  high = pd.Series(high)
+  values = [np.ascontiguousarray(s, dtype=np.float64) for s in (high, low)]
+  return pd.Series(loops.parabolic_sar_loop(*values, float(step), float(max_step)), index=high.index)
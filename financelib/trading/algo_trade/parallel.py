@@ -0,0 +1,140 @@
+"""
+Indicators for many symbols on a process pool.
+
+    features = parallel.compute_many(
+      {'THYAO.IS': thyao, 'GARAN.IS': garan, ...},
+      ['rsi', ('bollinger_bands', {'period': 20}), ('atr', {'period': 14})],
+      workers=8
+    )
+
+The input columns of every symbol are copied once into a single
+``multiprocessing.shared_memory`` block and the results are written by the
+workers into a second one. Workers only receive the plan and the row ranges of
+their symbols, so no DataFrame is pickled in either direction. Symbols are
+grouped into chunks of similar row counts, a few per worker, to keep the pool
+busy until the end.
+"""
+import os
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from .plan import FeaturePlan
+
+# Chunks handed out per worker; more chunks balance uneven symbols better.
+CHUNKS_PER_WORKER = 4
+
+
+def _plan(indicators):
+  if isinstance(indicators, FeaturePlan):
+    return indicators
+  plan = FeaturePlan()
+  for indicator in indicators:
+    if isinstance(indicator, str):
+      plan.add(indicator)
+    else:
+      name, params = indicator
+      plan.add(name, **params)
+  return plan
+
+
+def _input_columns(plan):
+  return sorted({node[1] for node in plan.nodes if node[0] == 'input'})
+
+
+def _chunks(bounds, count):
+  """Split (start, stop) row ranges into ``count`` runs of similar size."""
+  total = sum(stop - start for start, stop in bounds)
+  target = total / count if count else total
+  chunks, current, size = [], [], 0
+  for start, stop in bounds:
+    current.append((start, stop))
+    size += stop - start
+    if size >= target and len(chunks) < count - 1:
+      chunks.append(current)
+      current, size = [], 0
+  if current:
+    chunks.append(current)
+  return chunks
+
+
+def _compute_chunk(plan, columns, inputs, outputs, bounds, dtype):
+  """Worker entry: run ``plan`` on each row range, reading and writing shared memory."""
+  source = shared_memory.SharedMemory(name=inputs[0])
+  target = shared_memory.SharedMemory(name=outputs[0])
+  try:
+    values = np.ndarray(inputs[1], dtype=np.float64, buffer=source.buf)
+    out = np.ndarray(outputs[1], dtype=dtype, buffer=target.buf)
+    for start, stop in bounds:
+      frame = pd.DataFrame({column: values[position, start:stop] for position, column in enumerate(columns)})
+      out[start:stop] = plan.compute(frame, dtype=dtype).to_numpy()
+    del values, out
+  finally:
+    source.close()
+    target.close()
+  return len(bounds)
+
+
+def compute_many(frames, indicators, workers=None, dtype=float):
+  """Compute ``indicators`` for every frame in ``frames`` on ``workers`` processes.
+
+  ``frames`` is a mapping of symbol to OHLCV DataFrame (or a list of frames)
+  with lowercase column names. ``indicators`` is a ``FeaturePlan`` or a list
+  of indicator names and ``(name, params)`` pairs as accepted by
+  ``FeaturePlan.add``. Returns the features of each frame, indexed like it, in
+  a dict keyed like ``frames`` (or a list). workers=1 computes in-process.
+  """
+  plan = _plan(indicators)
+  keys = list(frames) if isinstance(frames, Mapping) else None
+  frames = [frames[key] for key in keys] if keys is not None else list(frames)
+  workers = workers or os.cpu_count() or 1
+  dtype = np.dtype(dtype)
+  columns = _input_columns(plan)
+  for frame in frames:
+    missing = set(columns) - set(frame.columns)
+    if missing:
+      raise ValueError(f"Every frame needs the columns {columns}, missing {sorted(missing)}")
+
+  lengths = [len(frame) for frame in frames]
+  offsets = np.concatenate(([0], np.cumsum(lengths))).astype(int)
+  bounds = [(int(start), int(stop)) for start, stop in zip(offsets[:-1], offsets[1:])]
+  total, width = int(offsets[-1]), len(plan.columns)
+
+  source = shared_memory.SharedMemory(create=True, size=max(total * len(columns) * 8, 1))
+  target = shared_memory.SharedMemory(create=True, size=max(total * width * dtype.itemsize, 1))
+  try:
+    # One contiguous row per input column keeps the rolling kernels on unit strides.
+    values = np.ndarray((len(columns), total), dtype=np.float64, buffer=source.buf)
+    for frame, (start, stop) in zip(frames, bounds):
+      for position, column in enumerate(columns):
+        values[position, start:stop] = frame[column].to_numpy(dtype=np.float64)
+    del values
+
+    inputs = (source.name, (len(columns), total))
+    outputs = (target.name, (total, width))
+    chunks = _chunks(bounds, workers * CHUNKS_PER_WORKER)
+    if workers == 1:
+      for chunk in chunks:
+        _compute_chunk(plan, columns, inputs, outputs, chunk, dtype)
+    else:
+      with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_compute_chunk, plan, columns, inputs, outputs, chunk, dtype) for chunk in chunks]
+        for future in futures:
+          future.result()
+
+    out = np.ndarray((total, width), dtype=dtype, buffer=target.buf)
+    results = [
+      pd.DataFrame(out[start:stop].copy(), index=frame.index, columns=plan.columns)
+      for frame, (start, stop) in zip(frames, bounds)
+    ]
+    del out
+  finally:
+    source.close()
+    source.unlink()
+    target.close()
+    target.unlink()
+
+  return dict(zip(keys, results)) if keys is not None else results
@@ -0,0 +1,232 @@
+"""
+Feature plans: compute many indicators together and share the work.
+
+Indicators overlap a lot: ``atr`` and ``adx`` build the same true range,
+``stochastic`` and ``williams_r`` the same rolling high/low, Bollinger Bands
+the same rolling mean as ``sma``. A ``FeaturePlan`` describes each indicator
+as a small graph of intermediate series, merges the graphs, and computes every
+intermediate once before writing all outputs into a single frame.
+
+    plan = (FeaturePlan()
+            .add('rsi', period=14)
+            .add('atr', period=14)
+            .add('adx', period=14)
+            .add('bollinger_bands', period=20))
+    features = plan.compute(ohlcv)
+
+Input frames need lowercase ``high``, ``low`` and ``close`` columns (only the
+ones the requested indicators use). Every indicator gives the same numbers as
+its function in ``algo_trade``.
+"""
+import numpy as np
+import pandas as pd
+
+from .kernels import rolling_argmax, rolling_argmin, rolling_mad
+
+
+def _input(column):
+  return ('input', column)
+
+
+def _sma(period=20, column='close'):
+  return (('mean', _input(column), period),)
+
+
+def _ema(period=20, column='close', adjust=True):
+  return (('ewm', _input(column), period, adjust),)
+
+
+def _std(period=20, column='close'):
+  return (('std', _input(column), period),)
+
+
+def _rsi(period=14, column='close'):
+  delta = ('diff', _input(column))
+  gain = ('mean', ('gain', delta), period)
+  loss = ('mean', ('loss', delta), period)
+  return (('rsi', gain, loss),)
+
+
+def _macd(fast_period=12, slow_period=26, signal_period=9, column='close', adjust=True):
+  fast = ('ewm', _input(column), fast_period, adjust)
+  slow = ('ewm', _input(column), slow_period, adjust)
+  macd_line = ('sub', fast, slow)
+  return macd_line, ('ewm', macd_line, signal_period, adjust)
+
+
+def _bollinger_bands(period=20, std_dev=2, column='close'):
+  middle = ('mean', _input(column), period)
+  std = ('std', _input(column), period)
+  return ('band', middle, std, std_dev), middle, ('band', middle, std, -std_dev)
+
+
+def _true_range():
+  return ('true_range', _input('high'), _input('low'), _input('close'))
+
+
+def _atr(period=14):
+  return (('mean', _true_range(), period),)
+
+
+def _adx(period=14):
+  atr = ('mean', _true_range(), period)
+  plus_di = ('di', ('mean', ('diff', _input('high')), period), atr)
+  minus_di = ('di', ('mean', ('diff', _input('low')), period), atr)
+  return (('mean', ('dx', plus_di, minus_di), period),)
+
+
+def _extremes(period):
+  return ('min', _input('low'), period), ('max', _input('high'), period)
+
+
+def _stochastic(k_period=14, d_period=3):
+  k = ('stoch_k', _input('close'), *_extremes(k_period))
+  return k, ('mean', k, d_period)
+
+
+def _williams_r(period=14):
+  return (('williams_r', _input('close'), *_extremes(period)),)
+
+
+def _cci(period=20):
+  tp = ('typical_price', _input('high'), _input('low'), _input('close'))
+  return (('cci', tp, ('mean', tp, period), ('mad', tp, period)),)
+
+
+def _aroon(period=25):
+  return (
+    ('aroon', ('argmax', _input('high'), period + 1), period),
+    ('aroon', ('argmin', _input('low'), period + 1), period)
+  )
+
+
+INDICATORS = {
+  'sma': (_sma, ('sma',)),
+  'ema': (_ema, ('ema',)),
+  'std': (_std, ('std',)),
+  'rsi': (_rsi, ('rsi',)),
+  'macd': (_macd, ('macd', 'macd_signal')),
+  'bollinger_bands': (_bollinger_bands, ('bb_upper', 'bb_middle', 'bb_lower')),
+  'atr': (_atr, ('atr',)),
+  'adx': (_adx, ('adx',)),
+  'stochastic': (_stochastic, ('stoch_k', 'stoch_d')),
+  'williams_r': (_williams_r, ('williams_r',)),
+  'cci': (_cci, ('cci',)),
+  'aroon': (_aroon, ('aroon_up', 'aroon_down')),
+}
+
+
+def _kernel(func, values, period):
+  return pd.Series(func(values.to_numpy(dtype=float), period), index=values.index)
+
+
+def _typical_price(high, low, close):
+  return (high + low + close) / 3
+
+
+def _cci_value(tp, mean, mad):
+  return (tp - mean) / (0.015 * mad)
+
+
+OPERATIONS = {
+  'diff': lambda x: x.diff(),
+  'gain': lambda delta: delta.where(delta > 0, 0),
+  'loss': lambda delta: -delta.where(delta < 0, 0),
+  'sub': lambda a, b: a - b,
+  'mean': lambda x, period: x.rolling(period).mean(),
+  'std': lambda x, period: x.rolling(period).std(),
+  'min': lambda x, period: x.rolling(period).min(),
+  'max': lambda x, period: x.rolling(period).max(),
+  'ewm': lambda x, span, adjust: x.ewm(span=span, adjust=adjust).mean(),
+  'band': lambda middle, std, width: middle + (std * width),
+  'rsi': lambda gain, loss: 100 - (100 / (1 + gain / loss)),
+  'true_range': lambda high, low, close: np.fmax(
+    np.fmax(high - low, (high - close.shift(1)).abs()), (low - close.shift(1)).abs()
+  ),
+  'di': lambda dm, atr: 100 * (dm / atr),
+  'dx': lambda plus_di, minus_di: 100 * abs(plus_di - minus_di) / (plus_di + minus_di),
+  'stoch_k': lambda close, lowest, highest: 100 * (close - lowest) / (highest - lowest),
+  'williams_r': lambda close, lowest, highest: -100 * (highest - close) / (highest - lowest),
+  'typical_price': _typical_price,
+  'cci': _cci_value,
+  'mad': lambda tp, period: _kernel(rolling_mad, tp, period),
+  'argmax': lambda x, period: _kernel(rolling_argmax, x, period),
+  'argmin': lambda x, period: _kernel(rolling_argmin, x, period),
+  'aroon': lambda position, period: 100 * (period - position) / period,
+}
+
+
+def _is_node(value):
+  return isinstance(value, tuple)
+
+
+class FeaturePlan:
+  """A set of indicators computed together over one OHLCV frame."""
+
+  def __init__(self):
+    self._outputs = []
+
+  def add(self, indicator, name=None, **params):
+    """Add an indicator; ``name`` sets its output column(s).
+
+    Multi-output indicators (macd, bollinger_bands, stochastic, aroon) take a
+    tuple of names. Returns the plan so calls can be chained.
+    """
+    if indicator not in INDICATORS:
+      raise ValueError(f"Unknown indicator '{indicator}'. Available indicators: {', '.join(INDICATORS)}")
+
+    recipe, default_names = INDICATORS[indicator]
+    nodes = recipe(**params)
+    names = default_names if name is None else ((name,) if isinstance(name, str) else tuple(name))
+    if len(names) != len(nodes):
+      raise ValueError(f"'{indicator}' has {len(nodes)} output(s), got names {names}")
+
+    taken = set(self.columns)
+    for column in names:
+      if column in taken:
+        raise ValueError(f"Duplicate output column '{column}', pass name= to rename it")
+      taken.add(column)
+
+    self._outputs.extend(zip(names, nodes))
+    return self
+
+  @property
+  def columns(self):
+    return [column for column, _ in self._outputs]
+
+  @property
+  def nodes(self):
+    """Every distinct intermediate in evaluation order (dependencies first)."""
+    ordered, seen = [], set()
+
+    def visit(node):
+      if node in seen:
+        return
+      seen.add(node)
+      for arg in node[1:]:
+        if _is_node(arg):
+          visit(arg)
+      ordered.append(node)
+
+    for _, node in self._outputs:
+      visit(node)
+    return ordered
+
+  def compute(self, df, dtype=float):
+    """Compute all outputs into one frame indexed like ``df``.
+
+    Intermediates are float64; ``dtype`` only sets the output frame, so
+    dtype='float32' halves the memory the features keep.
+    """
+    values = {}
+    for node in self.nodes:
+      operation, args = node[0], node[1:]
+      if operation == 'input':
+        values[node] = df[args[0]].astype(float)
+        continue
+      values[node] = OPERATIONS[operation](*(values[arg] if _is_node(arg) else arg for arg in args))
+
+    out = np.empty((len(df), len(self._outputs)), dtype=dtype)
+    for position, (_, node) in enumerate(self._outputs):
+      out[:, position] = values[node]
+    return pd.DataFrame(out, index=df.index, columns=self.columns, copy=False)
@@ -1,7 +1,15 @@
 import pandas as pd
 
-def rsi(data, period=14):
-  """Calculate Relative Strength Index."""
+from . import compact
+
+def rsi(data, period=14, dtype=None, out=None):
+  """Calculate Relative Strength Index.
+
+  Pass ``dtype`` (e.g. 'float32') and/or a preallocated ``out`` buffer to
+  run the chunked compact-memory kernels instead, see ``compact``.
+  """
+  if dtype is not None or out is not None:
+    return compact.rsi(data, period, dtype=dtype, out=out)
 
   delta = pd.Series(data).diff()
   gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
@@ -1,5 +1,13 @@
 import pandas as pd
 
-def sma(data, period=20):
-  """Calculate Simple Moving Average."""
+from . import compact
+
+def sma(data, period=20, dtype=None, out=None):
+  """Calculate Simple Moving Average.
+
+  Pass ``dtype`` (e.g. 'float32') and/or a preallocated ``out`` buffer to
+  run the chunked compact-memory kernels instead, see ``compact``.
+  """
+  if dtype is not None or out is not None:
+    return compact.sma(data, period, dtype=dtype, out=out)
   return pd.Series(data).rolling(window=period).mean()
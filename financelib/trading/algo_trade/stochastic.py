@@ -1,7 +1,15 @@
 import pandas as pd
 
-def stochastic(high, low, close, k_period=14, d_period=3):
-  """Calculate Stochastic Oscillator."""
+from . import compact
+
+def stochastic(high, low, close, k_period=14, d_period=3, dtype=None, out=None):
+  """Calculate Stochastic Oscillator.
+
+  Pass ``dtype`` (e.g. 'float32') and/or a preallocated ``out`` buffer to
+  run the chunked compact-memory kernels instead, see ``compact``.
+  """
+  if dtype is not None or out is not None:
+    return compact.stochastic(high, low, close, k_period, d_period, dtype=dtype, out=out)
 
   lowest_low = low.rolling(k_period).min()
   highest_high = high.rolling(k_period).max()
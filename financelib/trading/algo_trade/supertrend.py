@@ -0,0 +1,17 @@
+import numpy as np
+import pandas as pd
+
+from . import loops
+
+def supertrend(high, low, close, period=10, multiplier=3.0):
+  """Calculate SuperTrend.
+
+  Bands are ``(high + low) / 2 -/+ multiplier * ATR`` with a Wilder ATR.
+  Returns the SuperTrend line (the lower band in an uptrend, the upper band
+  in a downtrend) and the direction, 1 for up and -1 for down.
+  """
+
+  close = pd.Series(close)
+  values = [np.ascontiguousarray(s, dtype=np.float64) for s in (high, low, close)]
+  line, direction = loops.supertrend_loop(*values, period, float(multiplier))
+  return pd.Series(line, index=close.index), pd.Series(direction, index=close.index)
@@ -0,0 +1,139 @@
+"""
+Parameter sweeps: one indicator over many periods in a single pass.
+
+    table = sweep.sma(close, periods=range(5, 201))
+
+Each function returns a DataFrame indexed like the input with one column per
+period, holding the same numbers as the single-period function. Rolling
+indicators are read off shared prefix sums, so the data is scanned once no
+matter how many periods are asked for; each extra period only costs one
+vectorized subtraction over the prefix array. Bollinger Bands take prefix
+sums per chunk of ``CHUNK_SIZE`` rows, each around its own first value: sums
+of squares over a whole long series would cancel away the variance of short
+windows.
+"""
+import numpy as np
+import pandas as pd
+
+# Rows per block of chunk-local prefix sums (Bollinger Bands)
+CHUNK_SIZE = 4096
+
+
+def _series(data):
+  return pd.Series(data).astype(float)
+
+
+def _periods(periods):
+  periods = [int(period) for period in periods]
+  if not periods or min(periods) < 1:
+    raise ValueError('Please give at least one period, all periods must be >= 1')
+  return periods
+
+
+class _PrefixSums:
+  """Prefix sums of a series (and optionally its squares) for window sums.
+
+  Values are shifted by the first valid value before summing, which keeps the
+  running totals small and the window differences accurate.
+  """
+
+  def __init__(self, values, squares=False):
+    nan = np.isnan(values)
+    valid = values[~nan]
+    self.shift = valid[0] if len(valid) else 0.0
+    shifted = np.where(nan, 0.0, values - self.shift)
+    self.sums = np.concatenate(([0.0], np.cumsum(shifted)))
+    self.squares = np.concatenate(([0.0], np.cumsum(shifted * shifted))) if squares else None
+    self.nans = np.concatenate(([0], np.cumsum(nan))) if nan.any() else None
+
+  def window(self, prefix, period):
+    """Sum over every complete trailing window (shifted values)."""
+    total = prefix[period:] - prefix[:-period]
+    if self.nans is not None:
+      total[(self.nans[period:] - self.nans[:-period]) > 0] = np.nan
+    return total
+
+
+def _frame(out, index, periods):
+  return pd.DataFrame(out, index=index, columns=pd.Index(periods, name='period'), copy=False)
+
+
+def sma(data, periods):
+  """Simple Moving Average for every period."""
+  series = _series(data)
+  periods = _periods(periods)
+  prefix = _PrefixSums(series.to_numpy())
+
+  out = np.full((len(series), len(periods)), np.nan, order='F')
+  for column, period in enumerate(periods):
+    if period <= len(series):
+      out[period - 1:, column] = prefix.window(prefix.sums, period) / period + prefix.shift
+  return _frame(out, series.index, periods)
+
+
+def ema(data, periods):
+  """Exponential Moving Average for every period.
+
+  EMAs are recursive and have no prefix-sum form, so each period is one
+  compiled pandas pass written into the shared output.
+  """
+  series = _series(data)
+  periods = _periods(periods)
+
+  out = np.empty((len(series), len(periods)), order='F')
+  for column, period in enumerate(periods):
+    out[:, column] = series.ewm(span=period).mean().to_numpy()
+  return _frame(out, series.index, periods)
+
+
+def rsi(data, periods):
+  """Relative Strength Index for every period."""
+  series = _series(data)
+  periods = _periods(periods)
+  delta = series.diff().to_numpy()
+  gains = np.concatenate(([0.0], np.cumsum(np.where(delta > 0, delta, 0.0))))
+  losses = np.concatenate(([0.0], np.cumsum(np.where(delta < 0, -delta, 0.0))))
+
+  out = np.full((len(series), len(periods)), np.nan, order='F')
+  with np.errstate(divide='ignore', invalid='ignore'):
+    for column, period in enumerate(periods):
+      if period <= len(series):
+        rs = (gains[period:] - gains[:-period]) / (losses[period:] - losses[:-period])
+        out[period - 1:, column] = 100 - (100 / (1 + rs))
+  return _frame(out, series.index, periods)
+
+
+def bollinger_bands(data, periods, std_dev=2):
+  """Upper, middle and lower Bollinger Bands for every period."""
+  series = _series(data)
+  periods = _periods(periods)
+  values = series.to_numpy()
+  longest = max(periods)
+  step = max(CHUNK_SIZE, 8 * longest)
+
+  shape = (len(values), len(periods))
+  upper, middle, lower = (np.full(shape, np.nan, order='F') for _ in range(3))
+  with np.errstate(divide='ignore', invalid='ignore'):
+    for start in range(0, len(values), step):
+      stop = min(start + step, len(values))
+      # Rows before ``start`` complete the first windows of the chunk
+      first = max(start - longest + 1, 0)
+      prefix = _PrefixSums(values[first:stop], squares=True)
+      for column, period in enumerate(periods):
+        begin = max(start, period - 1)
+        if begin >= stop:
+          continue
+        skip = begin - (first + period - 1)
+        total = prefix.window(prefix.sums, period)[skip:]
+        squares = prefix.window(prefix.squares, period)[skip:]
+        variance = np.maximum((squares - total * total / period) / (period - 1), 0.0)
+        mean = total / period + prefix.shift
+        std = np.sqrt(variance) if period > 1 else np.full_like(mean, np.nan)
+        middle[begin:stop, column] = mean
+        upper[begin:stop, column] = mean + std * std_dev
+        lower[begin:stop, column] = mean - std * std_dev
+  return (
+    _frame(upper, series.index, periods),
+    _frame(middle, series.index, periods),
+    _frame(lower, series.index, periods)
+  )
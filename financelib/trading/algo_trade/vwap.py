@@ -0,0 +1,25 @@
+import numpy as np
+import pandas as pd
+
+from . import loops
+
+def vwap(high, low, close, volume, anchor=None):
+  """Calculate Volume Weighted Average Price.
+
+  The typical price is weighted by volume from the first bar on, or from the
+  start of every session when ``anchor`` is a pandas period alias such as
+  'D' (daily) or 'W' (weekly); that needs a DatetimeIndex.
+  """
+
+  close = pd.Series(close)
+  resets = np.zeros(len(close), dtype=np.bool_)
+  resets[:1] = True
+  if anchor is not None:
+    if not isinstance(close.index, pd.DatetimeIndex):
+      raise ValueError('Please use a DatetimeIndex to anchor the VWAP to sessions')
+    periods = close.index.tz_localize(None).to_period(anchor)
+    resets[1:] = periods[1:] != periods[:-1]
+
+  values = [np.ascontiguousarray(s, dtype=np.float64) for s in (high, low, close, volume)]
+  kernel = loops.vwap_loop if loops.NUMBA else loops.vwap_numpy
+  return pd.Series(kernel(*values, resets), index=close.index)
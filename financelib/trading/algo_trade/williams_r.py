@@ -1,7 +1,15 @@
 import pandas as pd
 
-def williams_r(high, low, close, period=14):
-  """Calculate Williams %R."""
+from . import compact
+
+def williams_r(high, low, close, period=14, dtype=None, out=None):
+  """Calculate Williams %R.
+
+  Pass ``dtype`` (e.g. 'float32') and/or a preallocated ``out`` buffer to
+  run the chunked compact-memory kernels instead, see ``compact``.
+  """
+  if dtype is not None or out is not None:
+    return compact.williams_r(high, low, close, period, dtype=dtype, out=out)
 
   highest_high = high.rolling(period).max()
   lowest_low = low.rolling(period).min()
@@ -1,3 +1,188 @@
+"""
+BIST market scanner.
+
+    bot = BISTTradeBotv1(rules={'oversold': 'rsi < 30 and close < bb_lower'}, rank_by='rsi', ascending=True)
+    bot.load()                   # last ``lookback`` bars of every symbol from the HistoryStore
+    candidates = bot.scan()      # symbols matching a rule, best first
+
+    for bars in live_minute_bars:        # one row per symbol: open/high/low/close/volume
+        candidates = bot.on_bar(bars)
+
+Bars of the whole universe are held as aligned (time x symbols) panels, the
+indicator set is computed once per panel with ``algo_trade.panel`` and the
+rules are ``DataFrame.eval`` expressions over the latest row, so a scan costs
+a handful of vectorized operations however many symbols there are. Rules can
+use the OHLCV columns, every indicator output (``rsi``, ``bb_lower``,
+``macd_signal``, ...) and the previous bar's values with a ``prev_`` prefix
+(``macd > macd_signal and prev_macd <= prev_macd_signal``).
+"""
+import inspect
+import logging
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ...algo_trade import panel
+from ...algo_trade.plan import INDICATORS as OUTPUT_NAMES
+from ....database.history import COLUMNS, HistoryStore
+from ....stock.providers import DEFAULT_PROVIDER, SabahProvider
+from ....stock.stock import Stock
+
+# (indicator, params, output names or None for the FeaturePlan defaults)
+DEFAULT_INDICATORS = [
+  ('sma', {'period': 20}, None),
+  ('sma', {'period': 50}, 'sma_50'),
+  ('ema', {'period': 20}, None),
+  ('rsi', {'period': 14}, None),
+  ('macd', {}, None),
+  ('bollinger_bands', {'period': 20}, None),
+  ('atr', {'period': 14}, None),
+  ('adx', {'period': 14}, None),
+  ('stochastic', {}, None),
+  ('williams_r', {}, None),
+  ('cci', {}, None),
+  ('aroon', {}, None),
+]
+
+
+def _inputs(func):
+  """Panel fields a panel indicator takes, in order ('data' is the close)"""
+  fields = []
+  for name in inspect.signature(func).parameters:
+    if name in ('data', 'close'):
+      fields.append('close')
+    elif name in ('high', 'low'):
+      fields.append(name)
+  return fields
+
 
 class BISTTradeBotv1():
-  pass
+  """Scans the BIST universe on every bar with vectorized rules over panel indicators."""
+
+  def __init__(self, symbols: Optional[List[str]] = None, store: Optional[HistoryStore] = None,
+               interval: str = '1d', lookback: int = 250, indicators=None, rules: Optional[Dict[str, str]] = None,
+               rank_by: Optional[str] = None, ascending: bool = False):
+    self.symbols = list(symbols) if symbols is not None else self.universe()
+    self.store = store or HistoryStore()
+    self.interval = interval
+    self.lookback = lookback
+    self.indicators = []
+    for indicator, params, names in (DEFAULT_INDICATORS if indicators is None else indicators):
+      if not hasattr(panel, indicator) or indicator not in OUTPUT_NAMES:
+        raise ValueError(f"Unknown indicator '{indicator}'")
+      names = OUTPUT_NAMES[indicator][1] if names is None else ((names,) if isinstance(names, str) else tuple(names))
+      self.indicators.append((getattr(panel, indicator), params, names))
+    self.rules: Dict[str, str] = {}
+    for name, expression in (rules or {}).items():
+      self.add_rule(name, expression)
+    self.rank_by = rank_by
+    self.ascending = ascending
+    self.panels: Dict[str, pd.DataFrame] = {
+      field: pd.DataFrame(columns=self.symbols, dtype=float) for field in COLUMNS
+    }
+
+  @staticmethod
+  def universe(provider=None) -> List[str]:
+    """Stock.COMMON_STOCKS plus the sabah.com.tr list, as Yahoo symbols"""
+    codes = list(Stock.COMMON_STOCKS)
+    try:
+      codes.extend(item['symbol'] for item in (provider or SabahProvider()).symbols())
+    except Exception as e:
+      logging.error(f"BIST symbol list could not be loaded, scanning COMMON_STOCKS only: {e}")
+    return [f'{code}.IS' for code in dict.fromkeys(codes)]
+
+  def add_rule(self, name: str, expression: str):
+    """Add a rule such as 'rsi < 30 and close < bb_lower'; returns the bot so calls can be chained"""
+    if not expression.strip():
+      raise ValueError(f"Rule '{name}' is empty")
+    self.rules[name] = expression
+    return self
+
+  def load(self, end=None):
+    """Fill the panels with the last ``lookback`` stored bars of every symbol (before ``end``)"""
+    frames = {}
+    for symbol in self.symbols:
+      frame = self.store.read(symbol, self.interval, end=end).tail(self.lookback)
+      if len(frame):
+        frames[symbol] = frame
+    for field in COLUMNS:
+      columns = {symbol: frame[field] for symbol, frame in frames.items()}
+      wide = pd.DataFrame(columns).reindex(columns=self.symbols) if columns else pd.DataFrame(columns=self.symbols)
+      self.panels[field] = wide.tail(self.lookback).astype(float)
+    return self
+
+  def refresh(self, start, provider=None):
+    """Download what the store is missing since ``start`` for every symbol, then load"""
+    provider = provider or DEFAULT_PROVIDER
+    for symbol in self.symbols:
+      try:
+        self.store.get(symbol, self.interval, start, fetch=provider.history)
+      except Exception as e:
+        logging.error(f"{symbol} history could not be refreshed: {e}")
+    return self.load()
+
+  def on_bar(self, bars: pd.DataFrame, time=None, top: Optional[int] = None) -> pd.DataFrame:
+    """
+    Append the latest bar of every symbol (rows: symbols, columns: OHLCV) and scan.
+
+    Symbols missing from ``bars`` get a NaN bar.
+    """
+    time = pd.Timestamp.now(tz='UTC') if time is None else time
+    bars = bars.rename(columns=str.lower)
+    for field in COLUMNS:
+      row = bars[field].reindex(self.symbols).to_numpy(dtype=float) if field in bars else np.full(len(self.symbols), np.nan)
+      current = self.panels[field]
+      self.panels[field] = pd.concat([current, pd.DataFrame([row], index=[time], columns=self.symbols)]).tail(self.lookback)
+    return self.scan(top=top)
+
+  def features(self) -> Dict[str, pd.DataFrame]:
+    """Every indicator output as a (time x symbols) panel"""
+    features = {}
+    for func, params, names in self.indicators:
+      result = func(*(self.panels[field] for field in _inputs(func)), **params)
+      for name, values in zip(names, result if isinstance(result, tuple) else (result,)):
+        features[name] = values
+    return features
+
+  def snapshot(self) -> pd.DataFrame:
+    """Latest and previous ('prev_') OHLCV and indicator values, one row per symbol"""
+    panels = dict(self.panels, **self.features())
+    columns = {}
+    for name, values in panels.items():
+      array = values.to_numpy(dtype=float)
+      columns[name] = array[-1] if len(array) else np.full(len(self.symbols), np.nan)
+      columns[f'prev_{name}'] = array[-2] if len(array) > 1 else np.full(len(self.symbols), np.nan)
+    return pd.DataFrame(columns, index=pd.Index(self.symbols, name='symbol'))
+
+  def scan(self, top: Optional[int] = None) -> pd.DataFrame:
+    """
+    Symbols matching at least one rule with the names of the rules they
+    match, most rules first, then by ``rank_by`` (an expression, e.g. 'rsi').
+    """
+    if not self.rules:
+      raise ValueError("No rules to scan for, add one with add_rule")
+    snapshot = self.snapshot()
+    masks = {}
+    for name, expression in self.rules.items():
+      try:
+        mask = snapshot.eval(expression)
+      except Exception as e:
+        raise ValueError(f"Rule '{name}' could not be evaluated: {e}") from e
+      masks[name] = np.asarray(mask, dtype=bool)
+
+    matched = np.column_stack(list(masks.values()))
+    hits = matched.sum(axis=1)
+    selected = hits > 0
+    names = np.array(list(masks))
+    candidates = pd.DataFrame({
+      'rules': [', '.join(names[row]) for row in matched[selected]],
+      'matched': hits[selected],
+      'close': snapshot['close'].to_numpy()[selected],
+    }, index=snapshot.index[selected])
+    if self.rank_by is not None:
+      candidates['score'] = np.asarray(snapshot.eval(self.rank_by), dtype=float)[selected]
+      candidates = candidates.sort_values(['matched', 'score'], ascending=[False, self.ascending], kind='stable')
+    else:
+      candidates = candidates.sort_values('matched', ascending=False, kind='stable')
+    return candidates if top is None else candidates.head(top)
@@ -7,6 +7,7 @@ import logging
 from .data_fetcher import DataFetcher
 from .sentiment_analyzer import SentimentAnalyzer
 from .price_predictor import PricePredictor
+from ...algo_trade import FeaturePlan
 
 from settings import (
     BINANCE_API_KEY,
@@ -48,6 +49,17 @@ class CryptorTradeBot:
         self.margin_threshold = 0.2
         self.margin_buffer = 100
 
+        # Shared intermediates (the 12/26 EMAs, the 20-bar mean) are computed once.
+        self.feature_plan = (FeaturePlan()
+            .add('sma', name='sma_short', period=10)
+            .add('sma', name='sma_long', period=50)
+            .add('rsi', period=14)
+            .add('ema', name='ema12', period=12, adjust=False)
+            .add('ema', name='ema26', period=26, adjust=False)
+            .add('macd', name=('macd', 'signal_line'), adjust=False)
+            .add('bollinger_bands', name=('bb_upper', 'bb_middle', 'bb_lower'), period=20)
+            .add('std', name='bb_std', period=20))
+
     def set_leverage(self, symbol, leverage):
         try:
             self.futures_exchange.fapiPrivate_post_leverage({
@@ -81,22 +93,9 @@ class CryptorTradeBot:
         return dynamic_leverage
 
     def calculate_technical_indicators(self, df):
-        df['sma_short'] = df['close'].rolling(window=10).mean()
-        df['sma_long'] = df['close'].rolling(window=50).mean()
-        delta = df['close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        df['rsi'] = 100 - (100 / (1 + rs))
-        df['ema12'] = df['close'].ewm(span=12, adjust=False).mean()
-        df['ema26'] = df['close'].ewm(span=26, adjust=False).mean()
-        df['macd'] = df['ema12'] - df['ema26']
-        df['signal_line'] = df['macd'].ewm(span=9, adjust=False).mean()
-        df['bb_middle'] = df['close'].rolling(window=20).mean()
-        df['bb_std'] = df['close'].rolling(window=20).std()
-        df['bb_upper'] = df['bb_middle'] + (df['bb_std'] * 2)
-        df['bb_lower'] = df['bb_middle'] - (df['bb_std'] * 2)
-        return df.dropna()
+        features = self.feature_plan.compute(df)
+        # Recompute rather than clash with features from an earlier call
+        return df.drop(columns=features.columns, errors='ignore').join(features).dropna()
 
     def get_balance(self, market='spot'):
         try:
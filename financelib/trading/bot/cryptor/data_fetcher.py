@@ -14,34 +14,44 @@ from settings import (
     TWITTER_ACCESS_TOKEN_SECRET,
     TIMEFRAME
 )
+from ....news.dedup import NewsDeduplicator
+from ....stock.providers import CCXTProvider
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 class DataFetcher:
-    def __init__(self):
+    def __init__(self, provider=None):
+        """``provider`` answers price and candle calls, a CCXTProvider over Binance by default"""
         self.exchange = ccxt.binance({
             'apiKey': BINANCE_API_KEY,
             'secret': BINANCE_API_SECRET,
             'enableRateLimit': True,
         })
+        self.provider = provider or CCXTProvider(self.exchange)
         auth = tweepy.OAuthHandler(TWITTER_ACCESS_TOKEN, TWITTER_API_SECRET)
         auth.set_access_token(TWITTER_ACCESS_TOKEN, TWITTER_ACCESS_TOKEN_SECRET)
         self.twitter_api = tweepy.API(auth, wait_on_rate_limit=True)
 
     def fetch_realtime_price(self, symbol):
         try:
-            ticker = self.exchange.fetch_ticker(symbol)
-            return ticker['last']
+            return self.provider.quotes([symbol])[symbol]['price']
         except Exception as e:
             logging.error(f"{symbol} için anlık fiyat çekme hatası: {e}")
             return None
 
-    def fetch_historical_data(self, symbol, limit=200):
+    def fetch_historical_data(self, symbol, limit=200, store=None):
+        """Last ``limit`` candles; with a HistoryStore only the missing ones are downloaded."""
         try:
-            ohlcv = self.exchange.fetch_ohlcv(symbol, TIMEFRAME, limit=limit)
-            df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            return df
+            step = pd.Timedelta(seconds=self.exchange.parse_timeframe(TIMEFRAME))
+            start = pd.Timestamp.now(tz='UTC').floor(step) - step * (limit - 1)
+            if store is not None:
+                df = store.get(symbol, TIMEFRAME, start, fetch=self.provider.history).tail(limit)
+                df.index = df.index.tz_convert(None)
+                return df.reset_index()
+
+            df = self.provider.history(symbol, TIMEFRAME, start, pd.Timestamp.now(tz='UTC')).tail(limit)
+            df['timestamp'] = df['timestamp'].dt.tz_convert(None)
+            return df.reset_index(drop=True)
         except Exception as e:
             logging.error(f"{symbol} için geçmiş veri çekme hatası: {e}")
             return None
@@ -60,7 +70,8 @@ class DataFetcher:
             url = f"https://www.coindesk.com/tag/{coin_name.lower()}/"
             response = requests.get(url, timeout=10)
             soup = BeautifulSoup(response.text, 'html.parser')
-            headlines = [h.text.strip() for h in soup.find_all('h3', limit=10)]
+            # Aynı başlık sayfada birden çok bölümde yer alabiliyor
+            headlines = NewsDeduplicator().filter(h.text.strip() for h in soup.find_all('h3', limit=10))
             logging.debug(f"{coin_name} için çekilen haber başlıkları: {headlines}")
             return headlines
         except Exception as e:
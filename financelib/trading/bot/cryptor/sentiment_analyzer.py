@@ -19,6 +19,8 @@ from datetime import datetime
 from settings import FINE_TUNED_MODEL_PATH
 import os
 
+from ....news.dedup import NewsDeduplicator
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 class SentimentDataset(Dataset):
@@ -64,8 +66,14 @@ class SentimentAnalyzer:
 
     def analyze_text(self, texts, coin_name):
         """Metin listesi için FinBERT ile sentiment analizi"""
+        # Aynı haberin kopyaları modele bir kez girer, skoru kopyalara da yazılır
+        dedup = NewsDeduplicator()
+        originals = [dedup.add(text, key=i) for i, text in enumerate(texts)]
         sentiments = []
-        for text in texts:
+        for i, text in enumerate(texts):
+            if originals[i] is not None:
+                sentiments.append(sentiments[originals[i]])
+                continue
             inputs = self.tokenizer(text, return_tensors='pt', truncation=True, padding=True, max_length=128)
             inputs = {key: val.to(self.device) for key, val in inputs.items()}
 
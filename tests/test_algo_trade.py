@@ -0,0 +1,542 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from financelib.trading.algo_trade import compact, kernels, loops
+from financelib.trading.algo_trade import (
+    sma, ema, rsi, macd, bollinger_bands, atr, adx,
+    stochastic, williams_r, cci, aroon,
+    adx_wilder, vwap, obv, supertrend, parabolic_sar, ichimoku,
+    IncrementalSMA, IncrementalEMA, IncrementalRSI, IncrementalMACD,
+    IncrementalBollingerBands, IncrementalATR, IncrementalADX,
+    IncrementalStochastic, IncrementalWilliamsR, IncrementalCCI,
+    IncrementalAroon, panel, sweep, parallel, FeaturePlan, IndicatorCache
+)
+
+
+def make_ohlcv(rows=300, seed=7):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, rows))
+    spread = rng.uniform(0.1, 2.0, rows)
+    high = close + spread * rng.uniform(0, 1, rows)
+    low = close - spread * rng.uniform(0, 1, rows)
+    volume = rng.integers(1_000, 100_000, rows).astype(float)
+    index = pd.date_range('2025-01-01', periods=rows, freq='min')
+    return pd.DataFrame({
+        'open': close + rng.normal(0, 0.2, rows),
+        'high': high,
+        'low': low,
+        'close': close,
+        'volume': volume,
+    }, index=index)
+
+
+class TestIncrementalIndicators(unittest.TestCase):
+    TOLERANCE = 1e-8
+
+    def setUp(self):
+        self.df = make_ohlcv()
+        self.high, self.low, self.close = self.df['high'], self.df['low'], self.df['close']
+
+    def assertStreamEqual(self, expected, actual):
+        np.testing.assert_allclose(np.asarray(actual, dtype=float), np.asarray(expected, dtype=float),
+                                   rtol=self.TOLERANCE, atol=self.TOLERANCE)
+
+    def stream(self, indicator, *series):
+        return [indicator.update(*bar) for bar in zip(*series)]
+
+    def test_close_only_indicators_match_batch(self):
+        cases = [
+            (IncrementalSMA(20), sma(self.close, 20)),
+            (IncrementalEMA(20), ema(self.close, 20)),
+            (IncrementalRSI(14), rsi(self.close, 14)),
+        ]
+        for indicator, expected in cases:
+            with self.subTest(indicator=type(indicator).__name__):
+                self.assertStreamEqual(expected, self.stream(indicator, self.close))
+
+    def test_multi_output_indicators_match_batch(self):
+        values = np.array(self.stream(IncrementalMACD(), self.close))
+        for column, expected in enumerate(macd(self.close)):
+            self.assertStreamEqual(expected, values[:, column])
+
+        values = np.array(self.stream(IncrementalBollingerBands(), self.close))
+        for column, expected in enumerate(bollinger_bands(self.close)):
+            self.assertStreamEqual(expected, values[:, column])
+
+    def test_ohlc_indicators_match_batch(self):
+        hlc = (self.high, self.low, self.close)
+        self.assertStreamEqual(atr(*hlc), self.stream(IncrementalATR(), *hlc))
+        self.assertStreamEqual(adx(*hlc), self.stream(IncrementalADX(), *hlc))
+        self.assertStreamEqual(williams_r(*hlc), self.stream(IncrementalWilliamsR(), *hlc))
+        self.assertStreamEqual(cci(*hlc), self.stream(IncrementalCCI(), *hlc))
+
+        values = np.array(self.stream(IncrementalStochastic(), *hlc))
+        for column, expected in enumerate(stochastic(*hlc)):
+            self.assertStreamEqual(expected, values[:, column])
+
+        values = np.array(self.stream(IncrementalAroon(), self.high, self.low))
+        for column, expected in enumerate(aroon(self.high, self.low)):
+            self.assertStreamEqual(expected, values[:, column])
+
+    def test_seed_then_update(self):
+        split = 200
+        head, tail = self.df.iloc[:split], self.df.iloc[split:]
+
+        indicator = IncrementalRSI(14).seed(head['close'])
+        self.assertStreamEqual(rsi(self.close, 14).iloc[split:], self.stream(indicator, tail['close']))
+
+        indicator = IncrementalEMA(30).seed(head['close'])
+        self.assertStreamEqual(ema(self.close, 30).iloc[split:], self.stream(indicator, tail['close']))
+
+        indicator = IncrementalMACD().seed(head['close'])
+        values = np.array(self.stream(indicator, tail['close']))
+        self.assertStreamEqual(macd(self.close)[1].iloc[split:], values[:, 1])
+
+        hlc = ('high', 'low', 'close')
+        indicator = IncrementalADX(14).seed(*(head[c] for c in hlc))
+        self.assertStreamEqual(adx(self.high, self.low, self.close).iloc[split:],
+                               self.stream(indicator, *(tail[c] for c in hlc)))
+
+        indicator = IncrementalAroon(25).seed(head['high'], head['low'])
+        values = np.array(self.stream(indicator, tail['high'], tail['low']))
+        self.assertStreamEqual(aroon(self.high, self.low)[0].iloc[split:], values[:, 0])
+
+    def test_missing_values_propagate_like_batch(self):
+        close = self.close.copy()
+        close.iloc[50] = np.nan
+        self.assertStreamEqual(sma(close, 10), self.stream(IncrementalSMA(10), close))
+        self.assertStreamEqual(ema(close, 10), self.stream(IncrementalEMA(10), close))
+        self.assertStreamEqual(rsi(close, 10), self.stream(IncrementalRSI(10), close))
+
+
+class TestKernelBackends(unittest.TestCase):
+    def setUp(self):
+        self.df = make_ohlcv(rows=500)
+        self.df.iloc[100, self.df.columns.get_loc('high')] = np.nan
+
+    def test_aroon_backends_agree(self):
+        for period in (5, 25):
+            numpy_result = aroon(self.df['high'], self.df['low'], period)
+            pandas_result = aroon(self.df['high'], self.df['low'], period, backend='pandas')
+            for numpy_series, pandas_series in zip(numpy_result, pandas_result):
+                pd.testing.assert_series_equal(numpy_series, pandas_series)
+
+    def test_cci_backends_agree(self):
+        hlc = (self.df['high'], self.df['low'], self.df['close'])
+        pd.testing.assert_series_equal(cci(*hlc), cci(*hlc, backend='pandas'))
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            cci(self.df['high'], self.df['low'], self.df['close'], backend='cuda')
+
+    def test_chunked_kernels_match_whole_windows(self):
+        panel = np.column_stack((self.df['high'].to_numpy(), self.df['low'].to_numpy()))
+        whole = [kernels.rolling_argmax(panel, 26), kernels.rolling_argmin(panel, 26), kernels.rolling_mad(panel, 26)]
+        chunk_size = kernels.CHUNK_SIZE
+        kernels.CHUNK_SIZE = 14
+        try:
+            chunked = [kernels.rolling_argmax(panel, 26), kernels.rolling_argmin(panel, 26),
+                       kernels.rolling_mad(panel, 26)]
+        finally:
+            kernels.CHUNK_SIZE = chunk_size
+        for expected, result in zip(whole, chunked):
+            np.testing.assert_array_equal(result, expected)
+
+
+class TestPanelIndicators(unittest.TestCase):
+    SYMBOLS = ['THYAO', 'GARAN', 'ASELS']
+
+    def setUp(self):
+        frames = {symbol: make_ohlcv(rows=250, seed=seed) for seed, symbol in enumerate(self.SYMBOLS)}
+        self.frames = frames
+        self.panels = {
+            field: pd.DataFrame({symbol: frame[field] for symbol, frame in frames.items()})
+            for field in ('high', 'low', 'close')
+        }
+        # ASELS listed late: no history for the first 40 bars.
+        for panel_frame in self.panels.values():
+            panel_frame.iloc[:40, panel_frame.columns.get_loc('ASELS')] = np.nan
+
+    def single(self, symbol, field):
+        return self.panels[field][symbol].dropna()
+
+    def assertColumnsMatch(self, panel_result, single_func, fields, **params):
+        panel_results = panel_result if isinstance(panel_result, tuple) else (panel_result,)
+        for symbol in self.SYMBOLS:
+            expected = single_func(*(self.single(symbol, field) for field in fields), **params)
+            expected = expected if isinstance(expected, tuple) else (expected,)
+            for panel_frame, single_series in zip(panel_results, expected):
+                np.testing.assert_allclose(panel_frame[symbol].dropna().to_numpy(),
+                                           single_series.dropna().to_numpy(), rtol=1e-10)
+                self.assertEqual(panel_frame[symbol].first_valid_index(), single_series.first_valid_index())
+
+    def test_columns_match_single_symbol_functions(self):
+        close = ('close',)
+        hl = ('high', 'low')
+        hlc = ('high', 'low', 'close')
+        cases = [
+            ('sma', sma, close), ('ema', ema, close), ('rsi', rsi, close),
+            ('macd', macd, close), ('bollinger_bands', bollinger_bands, close),
+            ('atr', atr, hlc), ('adx', adx, hlc), ('stochastic', stochastic, hlc),
+            ('williams_r', williams_r, hlc), ('cci', cci, hlc), ('aroon', aroon, hl),
+        ]
+        for name, single_func, fields in cases:
+            with self.subTest(indicator=name):
+                panel_result = getattr(panel, name)(*(self.panels[field] for field in fields))
+                self.assertColumnsMatch(panel_result, single_func, fields)
+
+    def test_rsi_gap_inside_series(self):
+        close = self.panels['close'].copy()
+        close.iloc[100:103, close.columns.get_loc('THYAO')] = np.nan
+        np.testing.assert_allclose(panel.rsi(close, 14)['THYAO'].to_numpy(),
+                                   rsi(close['THYAO'], 14).to_numpy(), equal_nan=True)
+        halted = pd.DataFrame({'A': [1, 2, 3, np.nan, 5, 6, 7]}, dtype=float)
+        np.testing.assert_allclose(panel.rsi(halted, 3)['A'].to_numpy(), rsi(halted['A'], 3).to_numpy(),
+                                   equal_nan=True)
+
+    def test_array_input_returns_array(self):
+        close = self.panels['close']
+        result = panel.rsi(close.to_numpy(), 14)
+        self.assertIsInstance(result, np.ndarray)
+        np.testing.assert_allclose(result, panel.rsi(close, 14).to_numpy(), equal_nan=True)
+
+        with self.assertRaises(ValueError):
+            panel.sma(close['THYAO'].to_numpy())
+
+
+class TestFeaturePlan(unittest.TestCase):
+    def setUp(self):
+        self.df = make_ohlcv()
+        self.hlc = (self.df['high'], self.df['low'], self.df['close'])
+
+    def test_outputs_match_indicator_functions(self):
+        plan = (FeaturePlan()
+                .add('sma', period=20)
+                .add('ema', period=20)
+                .add('rsi', period=14)
+                .add('macd')
+                .add('bollinger_bands', period=20)
+                .add('atr', period=14)
+                .add('adx', period=14)
+                .add('stochastic')
+                .add('williams_r')
+                .add('cci')
+                .add('aroon'))
+        features = plan.compute(self.df)
+        close = self.df['close']
+        expected = {
+            'sma': sma(close, 20), 'ema': ema(close, 20), 'rsi': rsi(close, 14),
+            'atr': atr(*self.hlc), 'adx': adx(*self.hlc), 'williams_r': williams_r(*self.hlc),
+            'cci': cci(*self.hlc),
+        }
+        for names, values in (
+            (('macd', 'macd_signal'), macd(close)),
+            (('bb_upper', 'bb_middle', 'bb_lower'), bollinger_bands(close)),
+            (('stoch_k', 'stoch_d'), stochastic(*self.hlc)),
+            (('aroon_up', 'aroon_down'), aroon(self.df['high'], self.df['low'])),
+        ):
+            expected.update(zip(names, values))
+
+        self.assertEqual(sorted(features.columns), sorted(expected))
+        for column, series in expected.items():
+            with self.subTest(column=column):
+                np.testing.assert_allclose(features[column].to_numpy(), series.to_numpy(), rtol=1e-12)
+
+    def test_shared_intermediates_are_computed_once(self):
+        plan = (FeaturePlan()
+                .add('atr').add('adx')
+                .add('stochastic').add('williams_r')
+                .add('sma', period=20).add('bollinger_bands', period=20))
+        nodes = plan.nodes
+        self.assertEqual(len(nodes), len(set(nodes)))
+        self.assertEqual(sum(node[0] == 'true_range' for node in nodes), 1)
+        self.assertEqual(sum(node[0] == 'max' for node in nodes), 1)
+        self.assertEqual(sum(node[0] == 'mean' and node[1] == ('input', 'close') for node in nodes), 1)
+
+    def test_invalid_declarations(self):
+        with self.assertRaises(ValueError):
+            FeaturePlan().add('vortex')
+        with self.assertRaises(ValueError):
+            FeaturePlan().add('sma', period=10).add('sma', period=50)
+        with self.assertRaises(ValueError):
+            FeaturePlan().add('macd', name='macd')
+
+
+class TestParameterSweeps(unittest.TestCase):
+    PERIODS = [2, 5, 14, 20, 50, 200]
+
+    def setUp(self):
+        self.close = make_ohlcv(rows=400)['close']
+        self.close.iloc[120] = np.nan
+
+    def assertSweepMatches(self, table, single_func):
+        self.assertEqual(list(table.columns), self.PERIODS)
+        for period in self.PERIODS:
+            np.testing.assert_allclose(table[period].to_numpy(), single_func(self.close, period).to_numpy(),
+                                       rtol=1e-8, atol=1e-8)
+
+    def test_single_output_sweeps(self):
+        self.assertSweepMatches(sweep.sma(self.close, self.PERIODS), sma)
+        self.assertSweepMatches(sweep.ema(self.close, self.PERIODS), ema)
+        self.assertSweepMatches(sweep.rsi(self.close, self.PERIODS), rsi)
+
+    def test_bollinger_sweep(self):
+        tables = sweep.bollinger_bands(self.close, self.PERIODS)
+        for band, table in enumerate(tables):
+            self.assertSweepMatches(table, lambda data, period: bollinger_bands(data, period)[band])
+
+    def test_bollinger_sweep_on_long_quiet_series(self):
+        # Sums of squares over the whole series would cancel the variance of short windows
+        rng = np.random.default_rng(3)
+        values = 100 + np.cumsum(rng.normal(0, 0.05, 1_000_000))
+        close = pd.Series(values)
+        upper, middle, _ = sweep.bollinger_bands(close, [5, 20])
+        for period in (5, 20):
+            expected_upper, expected_middle, _ = bollinger_bands(close, period)
+            std = (upper[period] - middle[period]).to_numpy()[period - 1:] / 2
+            exact = np.lib.stride_tricks.sliding_window_view(values, period).std(axis=1, ddof=1)
+            np.testing.assert_allclose(std, exact, rtol=1e-6, atol=1e-8)
+            np.testing.assert_allclose(std, (expected_upper - expected_middle).to_numpy()[period - 1:] / 2,
+                                       rtol=1e-6, atol=1e-7)
+            np.testing.assert_allclose(middle[period].to_numpy(), expected_middle.to_numpy(), rtol=1e-9)
+
+    def test_invalid_periods(self):
+        with self.assertRaises(ValueError):
+            sweep.sma(self.close, [])
+        with self.assertRaises(ValueError):
+            sweep.rsi(self.close, [0, 14])
+
+
+class TestIndicatorCache(unittest.TestCase):
+    def setUp(self):
+        self.df = make_ohlcv(rows=300)
+        self.cache = IndicatorCache()
+
+    def test_repeated_calls_hit(self):
+        first = self.cache(rsi, self.df['close'], period=14)
+        second = self.cache(rsi, self.df['close'].copy(), 14)
+        pd.testing.assert_series_equal(first, second)
+        self.cache(rsi, self.df['close'], period=10)
+        self.assertEqual(self.cache.stats['hits'], 1)
+        self.assertEqual(self.cache.stats['misses'], 2)
+
+    def test_appended_bars_reuse_prefix(self):
+        head, full = self.df.iloc[:250], self.df
+        cases = [
+            (rsi, ('close',), {'period': 14}),
+            (bollinger_bands, ('close',), {'period': 20}),
+            (adx, ('high', 'low', 'close'), {}),
+            (stochastic, ('high', 'low', 'close'), {}),
+            (aroon, ('high', 'low'), {'period': 25}),
+            (ema, ('close',), {'period': 20}),
+        ]
+        for func, fields, params in cases:
+            with self.subTest(indicator=func.__name__):
+                self.cache(func, *(head[field] for field in fields), **params)
+                extended = self.cache(func, *(full[field] for field in fields), **params)
+                expected = func(*(full[field] for field in fields), **params)
+                for got, want in zip(extended if isinstance(extended, tuple) else (extended,),
+                                     expected if isinstance(expected, tuple) else (expected,)):
+                    pd.testing.assert_series_equal(got, want, rtol=1e-10)
+        # ema has no bounded lookback and is recomputed in full.
+        self.assertEqual(self.cache.stats['extensions'], len(cases) - 1)
+
+    def test_changed_history_is_not_treated_as_extension(self):
+        self.cache(sma, self.df['close'].iloc[:200], period=5)
+        changed = self.df['close'].copy()
+        changed.iloc[10] += 1
+        pd.testing.assert_series_equal(self.cache(sma, changed, period=5), sma(changed, 5))
+        self.assertEqual(self.cache.stats['extensions'], 0)
+
+    def test_sweeps_panels_and_unhashable_params(self):
+        close = self.df['close']
+        expected = sweep.sma(close, periods=[5, 10])
+        pd.testing.assert_frame_equal(self.cache(sweep.sma, close.iloc[:200], periods=[5, 10]),
+                                      sweep.sma(close.iloc[:200], periods=[5, 10]))
+        pd.testing.assert_frame_equal(self.cache(sweep.sma, close, periods=[5, 10]), expected)
+        pd.testing.assert_frame_equal(self.cache(sweep.sma, close, periods=[5, 10]), expected)
+        self.cache(sweep.sma, close, periods=range(5, 10))
+        self.assertEqual(self.cache.stats['extensions'], 0)
+
+        wide = pd.DataFrame({'A': close, 'B': close * 2})
+        self.cache(panel.rsi, wide.iloc[:250], period=14)
+        pd.testing.assert_frame_equal(self.cache(panel.rsi, wide, period=14), panel.rsi(wide, 14))
+        array = wide.to_numpy()
+        self.cache(panel.sma, array[:250], period=5)
+        np.testing.assert_allclose(self.cache(panel.sma, array, period=5), panel.sma(array, 5), equal_nan=True)
+        self.cache(panel.sma, array, period=5)
+        self.assertEqual(self.cache.stats['extensions'], 2)
+        self.assertEqual(self.cache.stats['hits'], 2)
+
+    def test_lru_eviction(self):
+        cache = IndicatorCache(max_entries=2)
+        cache(sma, self.df['close'], period=5)
+        cache(sma, self.df['close'], period=10)
+        cache(sma, self.df['close'], period=5)
+        cache(sma, self.df['close'], period=20)
+        self.assertEqual(cache.stats['evictions'], 1)
+        cache(sma, self.df['close'], period=5)
+        self.assertEqual(cache.stats['hits'], 2)
+
+        small = IndicatorCache(max_bytes=1)
+        small(sma, self.df['close'], period=5)
+        self.assertEqual(small.stats['entries'], 0)
+
+
+class TestCompactMode(unittest.TestCase):
+    def setUp(self):
+        self.df = make_ohlcv(rows=500)
+        self.df.iloc[123, self.df.columns.get_loc('close')] = np.nan
+        self.chunk_size = compact.CHUNK_SIZE
+        compact.CHUNK_SIZE = 64  # exercise the chunk boundaries
+
+    def tearDown(self):
+        compact.CHUNK_SIZE = self.chunk_size
+
+    def cases(self):
+        high, low, close = self.df['high'], self.df['low'], self.df['close']
+        return [
+            (sma, (close, 20)), (ema, (close, 20)), (rsi, (close, 14)), (macd, (close,)),
+            (bollinger_bands, (close, 20)), (atr, (high, low, close)), (adx, (high, low, close)),
+            (stochastic, (high, low, close)), (williams_r, (high, low, close)),
+            (cci, (high, low, close)), (aroon, (high, low)),
+        ]
+
+    def test_float64_matches_default_path(self):
+        for func, args in self.cases():
+            with self.subTest(indicator=func.__name__):
+                expected, got = func(*args), func(*args, dtype='float64')
+                for want, have in zip(expected if isinstance(expected, tuple) else (expected,),
+                                      got if isinstance(got, tuple) else (got,)):
+                    np.testing.assert_allclose(have, want, rtol=1e-7, atol=1e-6)
+                    self.assertTrue(have.index.equals(want.index))
+
+    def test_float32_stays_within_rounding(self):
+        for func, args in self.cases():
+            rounded = tuple(arg.astype(np.float32).astype(float) if isinstance(arg, pd.Series) else arg
+                            for arg in args)
+            with self.subTest(indicator=func.__name__):
+                expected, got = func(*rounded), func(*args, dtype=np.float32)
+                for want, have in zip(expected if isinstance(expected, tuple) else (expected,),
+                                      got if isinstance(got, tuple) else (got,)):
+                    self.assertEqual(have.dtype, np.float32)
+                    np.testing.assert_allclose(have, want, rtol=1e-5, atol=1e-4)
+
+    def test_out_buffers_are_filled_in_place(self):
+        close = self.df['close']
+        buffer = np.empty(len(close), dtype=np.float32)
+        result = rsi(close, 14, out=buffer)
+        self.assertTrue(np.shares_memory(result.to_numpy(), buffer))
+
+        upper, middle, lower = (np.empty(len(close)) for _ in range(3))
+        bollinger_bands(close, out=(upper, middle, lower))
+        np.testing.assert_allclose(middle, sma(close, 20), equal_nan=True)
+
+    def test_invalid_buffers(self):
+        close = self.df['close']
+        with self.assertRaises(ValueError):
+            sma(close, out=np.empty(len(close) - 1))
+        with self.assertRaises(ValueError):
+            sma(close, dtype=np.float32, out=np.empty(len(close)))
+        with self.assertRaises(ValueError):
+            macd(close, out=np.empty(len(close)))
+        with self.assertRaises(ValueError):
+            sma(close, dtype=int)
+        with self.assertRaises(ValueError):
+            IndicatorCache()(sma, close, out=np.empty(len(close)))
+
+
+class TestParallelRunner(unittest.TestCase):
+    def setUp(self):
+        self.frames = {f'S{seed}': make_ohlcv(rows=150 + seed * 10, seed=seed) for seed in range(6)}
+        self.indicators = ['rsi', ('bollinger_bands', {'period': 10}), 'adx', 'aroon']
+
+    def test_matches_feature_plan(self):
+        plan = parallel._plan(self.indicators)
+        for workers in (1, 2):
+            results = parallel.compute_many(self.frames, self.indicators, workers=workers)
+            self.assertEqual(list(results), list(self.frames))
+            for symbol, frame in self.frames.items():
+                pd.testing.assert_frame_equal(results[symbol], plan.compute(frame))
+
+    def test_list_input_and_missing_columns(self):
+        frames = list(self.frames.values())
+        results = parallel.compute_many(frames, ['sma'], workers=1, dtype='float32')
+        self.assertEqual(len(results), len(frames))
+        self.assertEqual(results[0]['sma'].dtype, np.float32)
+        with self.assertRaises(ValueError):
+            parallel.compute_many([frames[0][['close']]], ['atr'], workers=1)
+
+
+class TestPathDependentIndicators(unittest.TestCase):
+    def setUp(self):
+        self.df = make_ohlcv(rows=400)
+        self.arrays = {column: self.df[column].to_numpy() for column in self.df}
+
+    def wilder(self, values, period, first):
+        out = pd.Series(np.nan, index=values.index)
+        out.iloc[first + period - 1] = values.iloc[first:first + period].mean()
+        for i in range(first + period, len(values)):
+            out.iloc[i] = out.iloc[i - 1] + (values.iloc[i] - out.iloc[i - 1]) / period
+        return out
+
+    def test_adx_wilder_matches_reference(self):
+        high, low, close = self.df['high'], self.df['low'], self.df['close']
+        up, down = high.diff(), -low.diff()
+        plus_dm = up.where((up > down) & (up > 0), 0.0)
+        minus_dm = down.where((down > up) & (down > 0), 0.0)
+        tr = pd.concat([high - low, (high - close.shift()).abs(), (low - close.shift()).abs()], axis=1).max(axis=1)
+        atr_values = self.wilder(tr, 14, 1)
+        plus_di = 100 * self.wilder(plus_dm, 14, 1) / atr_values
+        minus_di = 100 * self.wilder(minus_dm, 14, 1) / atr_values
+        expected = self.wilder(100 * (plus_di - minus_di).abs() / (plus_di + minus_di), 14, 14)
+        pd.testing.assert_series_equal(adx_wilder(high, low, close), expected, check_names=False)
+        self.assertEqual(adx_wilder(high, low, close).first_valid_index(), self.df.index[27])
+
+    def test_numpy_fallbacks_match_loops(self):
+        high, low, close, volume = (self.arrays[column] for column in ('high', 'low', 'close', 'volume'))
+        resets = np.zeros(len(close), dtype=bool)
+        resets[::50] = True
+        np.testing.assert_allclose(loops.adx_wilder_numpy(high, low, close, 14),
+                                   loops.adx_wilder_loop(high, low, close, 14), rtol=1e-10)
+        np.testing.assert_allclose(loops.vwap_numpy(high, low, close, volume, resets),
+                                   loops.vwap_loop(high, low, close, volume, resets), rtol=1e-10)
+        np.testing.assert_array_equal(loops.obv_numpy(close, volume), loops.obv_loop(close, volume))
+        np.testing.assert_array_equal(loops.ichimoku_numpy(high, low, close, 9, 26, 52),
+                                      loops.ichimoku_loop(high, low, close, 9, 26, 52))
+
+    def test_volume_indicators(self):
+        close = pd.Series([10.0, 11.0, 11.0, 9.0, 12.0])
+        volume = pd.Series([5.0, 3.0, 4.0, 2.0, 1.0])
+        np.testing.assert_array_equal(obv(close, volume), [0, 3, 3, 1, 2])
+
+        daily = vwap(self.df['high'], self.df['low'], self.df['close'], self.df['volume'], anchor='h')
+        tp = (self.df['high'] + self.df['low'] + self.df['close']) / 3
+        hour = self.df.index.floor('h')
+        expected = (tp * self.df['volume']).groupby(hour).cumsum() / self.df['volume'].groupby(hour).cumsum()
+        pd.testing.assert_series_equal(daily, expected, check_names=False)
+        with self.assertRaises(ValueError):
+            vwap(self.arrays['high'], self.arrays['low'], self.arrays['close'], self.arrays['volume'], anchor='D')
+
+    def test_trend_indicators(self):
+        high, low, close = self.df['high'], self.df['low'], self.df['close']
+        line, direction = supertrend(high, low, close, period=10)
+        self.assertTrue(line.iloc[:10].isna().all())
+        self.assertEqual(set(direction.dropna()), {1.0, -1.0})
+        self.assertTrue((line[direction == 1] <= high[direction == 1]).all())
+
+        sar = parabolic_sar(high, low)
+        self.assertTrue(np.isnan(sar.iloc[0]))
+        self.assertEqual(sar.iloc[1:].isna().sum(), 0)
+
+        tenkan, kijun, span_a, span_b, chikou = ichimoku(high, low, close)
+        pd.testing.assert_series_equal(
+            tenkan, (high.rolling(9).max() + low.rolling(9).min()) / 2, check_names=False)
+        pd.testing.assert_series_equal(span_a, ((tenkan + kijun) / 2).shift(26), check_names=False)
+        pd.testing.assert_series_equal(chikou, close.shift(-26), check_names=False)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import tempfile
+import time
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from financelib.database.history import HistoryStore
+from financelib.trading.algo_trade import panel
+from financelib.trading.bot.bist import BISTTradeBotv1
+
+
+def make_store(root, symbols, rows=120, seed=3):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2025-01-01', periods=rows, freq='D', tz='UTC')
+    store = HistoryStore(root)
+    for symbol in symbols:
+        close = 100 + np.cumsum(rng.normal(0, 1, rows))
+        store.write(symbol, '1d', pd.DataFrame({
+            'open': close, 'high': close + 1, 'low': close - 1, 'close': close, 'volume': 1000.0,
+        }, index=index))
+    return store
+
+
+class TestBISTScanner(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.symbols = [f'S{i:03d}.IS' for i in range(20)]
+        self.store = make_store(self.tmp.name, self.symbols)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_scan_matches_per_symbol_indicators(self):
+        bot = BISTTradeBotv1(self.symbols, store=self.store, rules={'weak': 'rsi < 50', 'strong': 'rsi > 50'},
+                             rank_by='rsi', ascending=True).load()
+        candidates = bot.scan()
+
+        close = pd.DataFrame({symbol: self.store.read(symbol, '1d')['close'] for symbol in self.symbols})
+        expected = panel.rsi(close).iloc[-1]
+        self.assertEqual(set(candidates.index), set(expected.dropna().index))
+        weak = candidates[candidates['rules'] == 'weak']
+        self.assertTrue((weak['score'] < 50).all())
+        self.assertTrue(weak['score'].is_monotonic_increasing)
+        np.testing.assert_allclose(candidates['score'], expected[candidates.index])
+
+    def test_on_bar_appends_and_trims(self):
+        bot = BISTTradeBotv1(self.symbols, store=self.store, lookback=60,
+                             rules={'crash': 'close < prev_close * 0.5'}).load()
+        self.assertEqual(len(bot.panels['close']), 60)
+        last = bot.panels['close'].iloc[-1]
+        bars = pd.DataFrame({'Open': last, 'High': last, 'Low': last, 'Close': last, 'Volume': 1.0})
+        bars.loc[self.symbols[4], ['Open', 'High', 'Low', 'Close']] = 1.0
+        candidates = bot.on_bar(bars.drop(index=self.symbols[7]), time=pd.Timestamp('2025-05-01', tz='UTC'))
+
+        self.assertEqual(list(candidates.index), [self.symbols[4]])
+        self.assertEqual(len(bot.panels['close']), 60)
+        self.assertTrue(np.isnan(bot.panels['close'][self.symbols[7]].iloc[-1]))
+
+    def test_bad_rules(self):
+        bot = BISTTradeBotv1(self.symbols, store=self.store).load()
+        with self.assertRaises(ValueError):
+            bot.scan()
+        with self.assertRaises(ValueError):
+            bot.add_rule('typo', 'rsii < 30').scan()
+        with self.assertRaises(ValueError):
+            BISTTradeBotv1(self.symbols, store=self.store, indicators=[('nope', {}, None)])
+
+    def test_universe_falls_back_to_common_stocks(self):
+        class Broken:
+            def symbols(self):
+                raise OSError('offline')
+
+        class Listed:
+            def symbols(self):
+                return [{'symbol': 'THYAO', 'name': 'x'}, {'symbol': 'NEWCO', 'name': 'y'}]
+
+        common = BISTTradeBotv1.universe(Broken())
+        self.assertIn('THYAO.IS', common)
+        listed = BISTTradeBotv1.universe(Listed())
+        self.assertEqual(listed.count('THYAO.IS'), 1)
+        self.assertIn('NEWCO.IS', listed)
+
+    def test_full_market_scan_is_fast(self):
+        symbols = [f'M{i:03d}.IS' for i in range(600)]
+        rng = np.random.default_rng(0)
+        index = pd.date_range('2025-01-01', periods=250, freq='min', tz='UTC')
+        bot = BISTTradeBotv1(symbols, store=self.store, rules={'oversold': 'rsi < 30 and close < bb_lower'})
+        for field in ('open', 'high', 'low', 'close'):
+            bot.panels[field] = pd.DataFrame(100 + rng.normal(0, 1, (250, 600)).cumsum(axis=0),
+                                             index=index, columns=symbols)
+        bot.panels['volume'] = pd.DataFrame(1000.0, index=index, columns=symbols)
+        start = time.perf_counter()
+        bot.scan()
+        self.assertLess(time.perf_counter() - start, 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+import os
+import tempfile
+import threading
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from financelib.database.history import HistoryStore
+
+
+def make_bars(start, periods, freq='D'):
+    index = pd.date_range(start, periods=periods, freq=freq, tz='UTC')
+    close = np.arange(periods, dtype=float) + 100
+    return pd.DataFrame({'Open': close, 'High': close + 1, 'Low': close - 1,
+                         'Close': close, 'Volume': 1000.0}, index=index)
+
+
+class RecordingFetch:
+    """Serves bars from a fixed daily series and records the requested ranges."""
+
+    def __init__(self, bars):
+        self.bars = bars
+        self.requests = []
+
+    def __call__(self, symbol, interval, start, end):
+        self.requests.append((start, end))
+        return self.bars[(self.bars.index >= start) & (self.bars.index < end)]
+
+
+class TestHistoryStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = HistoryStore(root=self.directory.name)
+        self.fetch = RecordingFetch(make_bars('2024-01-01', 100))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_only_missing_ranges_are_fetched(self):
+        first = self.store.get('THYAO.IS', '1d', '2024-01-10', '2024-01-20', fetch=self.fetch)
+        self.assertEqual(len(first), 10)
+        self.store.get('THYAO.IS', '1d', '2024-01-30', '2024-02-05', fetch=self.fetch)
+
+        full = self.store.get('THYAO.IS', '1d', '2024-01-05', '2024-02-10', fetch=self.fetch)
+        self.assertEqual(len(full), 36)
+        self.assertEqual(self.fetch.requests[2:], [
+            (pd.Timestamp('2024-01-05', tz='UTC'), pd.Timestamp('2024-01-10', tz='UTC')),
+            (pd.Timestamp('2024-01-20', tz='UTC'), pd.Timestamp('2024-01-30', tz='UTC')),
+            (pd.Timestamp('2024-02-05', tz='UTC'), pd.Timestamp('2024-02-10', tz='UTC')),
+        ])
+        self.assertEqual(self.store.coverage('THYAO.IS', '1d'),
+                         [(pd.Timestamp('2024-01-05', tz='UTC'), pd.Timestamp('2024-02-10', tz='UTC'))])
+
+        self.store.get('THYAO.IS', '1d', '2024-01-05', '2024-02-10', fetch=self.fetch)
+        self.assertEqual(len(self.fetch.requests), 5)
+        np.testing.assert_array_equal(full['close'], np.arange(4, 40) + 100.0)
+
+    def test_open_ended_tail_is_topped_up(self):
+        self.store.get('BTC/USDT', '1d', '2024-01-01', fetch=self.fetch)
+        last = self.fetch.bars.index[-1]
+        self.assertEqual(self.store.coverage('BTC/USDT', '1d')[0][1], last)
+
+        self.fetch.bars.loc[last, 'Close'] = 1.0
+        bars = self.store.get('BTC/USDT', '1d', '2024-01-01', fetch=self.fetch)
+        self.assertEqual(self.fetch.requests[-1][0], last)
+        self.assertEqual(bars['close'].iloc[-1], 1.0)
+        self.assertEqual(len(bars), 100)
+
+    def test_future_end_keeps_forming_bar_open(self):
+        end = pd.Timestamp.now(tz='UTC').normalize() + pd.Timedelta(days=3)
+        self.fetch.bars = make_bars(end - pd.Timedelta(days=10), 8)
+        self.store.get('THYAO.IS', '1d', end - pd.Timedelta(days=10), end, fetch=self.fetch)
+        self.assertEqual(self.store.coverage('THYAO.IS', '1d')[0][1], self.fetch.bars.index[-1])
+
+    def test_top_up_writes_in_place(self):
+        self.store.write('THYAO.IS', '1d', self.fetch.bars.iloc[:50])
+        path = self.store._path('THYAO.IS', '1d') + '.bars'
+        inode = os.stat(path).st_ino
+        changed = self.fetch.bars.iloc[49:60].copy()
+        changed['Close'] = -1.0
+        self.store.write('THYAO.IS', '1d', changed)
+        self.assertEqual(os.stat(path).st_ino, inode)
+        bars = self.store.read('THYAO.IS', '1d')
+        self.assertEqual(len(bars), 60)
+        self.assertEqual(bars['close'].iloc[48], 148.0)
+        self.assertTrue((bars['close'].iloc[49:] == -1.0).all())
+
+        # Filling an older gap rewrites the file
+        self.store.write('THYAO.IS', '1d', make_bars('2023-12-01', 5))
+        self.assertEqual(len(self.store.read('THYAO.IS', '1d')), 65)
+
+    def test_concurrent_writers_do_not_lose_bars(self):
+        bars = self.fetch.bars
+        threads = [threading.Thread(target=HistoryStore(root=self.directory.name).write,
+                                    args=('THYAO.IS', '1d', bars.iloc[i::4])) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(self.store.read('THYAO.IS', '1d')), 100)
+
+    def test_reads_never_see_a_half_written_top_up(self):
+        bars = make_bars('2024-01-01', 50_000, freq='min')
+        self.store.write('THYAO.IS', '1m', bars.iloc[:10_000])
+        tail = bars.iloc[9_000:]
+        done = threading.Event()
+
+        def top_up():
+            for version in range(20):
+                changed = tail.copy()
+                changed['Close'] = float(version)
+                self.store.write('THYAO.IS', '1m', changed)
+            done.set()
+
+        writer = threading.Thread(target=top_up)
+        writer.start()
+        torn = 0
+        while not done.is_set():
+            close = self.store.read('THYAO.IS', '1m')['close'].to_numpy()
+            if len(close) > 10_000:
+                torn += len(close) != len(bars) or len(np.unique(close[9_000:])) != 1
+        writer.join()
+        self.assertEqual(torn, 0)
+
+    def test_frames_for_many_symbols(self):
+        naive = make_bars('2024-01-01', 5).tz_convert(None).rename_axis('timestamp').reset_index()
+        self.store.write('GARAN.IS', '1h', naive)
+        frames = self.store.frames(['GARAN.IS', 'SASA.IS'], '1h')
+        self.assertEqual(list(frames['GARAN.IS'].columns), ['open', 'high', 'low', 'close', 'volume'])
+        self.assertEqual(len(frames['GARAN.IS']), 5)
+        self.assertTrue(frames['SASA.IS'].empty)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,17 @@
 """
 Main Test
 """
-from financelib.news import NewsAPIQuery
+from financelib.news.dedup import normalize_url
+from financelib.news.extract import PARSER
+from financelib.news import (
+    ArticleExtractor, BaseQueryClass, BloombergQuery, BloomFilter, HostLimiter, News, NewsAPIQuery, NewsBatch,
+    NewsDeduplicator, NewsPoller, TokenBucket
+)
+import numpy as np
+import os
+import tempfile
+import threading
+import time
 import unittest
 
 
@@ -11,6 +21,336 @@ class TestStock(unittest.TestCase):
       self.assertIsNotNone(news_client.get_all_news_source_ids())
       self.assertIn('status', news_client.get_all_news_source_ids())
 
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_burst_then_rate(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2, burst=3, clock=clock, sleep=clock.sleep)
+        for _ in range(3):
+            self.assertEqual(bucket.acquire(), 0)
+        self.assertFalse(bucket.try_acquire())
+        self.assertAlmostEqual(bucket.acquire(), 0.5)
+        clock.now += 10
+        self.assertTrue(bucket.try_acquire())
+
+    def test_hosts_are_limited_separately(self):
+        clock = FakeClock()
+        limiter = HostLimiter(rate=1, clock=clock, sleep=clock.sleep)
+        limiter.acquire('https://www.bloomberg.com/search')
+        self.assertEqual(limiter.acquire('https://newsapi.org/v2'), 0)
+        self.assertAlmostEqual(limiter.acquire('https://WWW.bloomberg.com/other'), 1.0)
+
+
+class SlowQuery(BaseQueryClass):
+    RATE = 1000
+    BURST = 100
+
+    def __init__(self):
+        self.limiter = HostLimiter()
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def search_articles(self, query, limit=5, print_results=False):
+        self.wait_for_slot('https://example.com')
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.05)
+        with self.lock:
+            self.active -= 1
+        if query == 'BROKEN':
+            raise OSError('down')
+        return [News({'title': f'{query} shared', 'article_url': 'https://example.com/shared'}),
+                News({'title': f'{query} only', 'article_url': f'https://example.com/{query}'})]
+
+
+class TestSearchMany(unittest.TestCase):
+    def test_queries_run_concurrently_and_merge(self):
+        query = SlowQuery()
+        merged = query.search_many(['THYAO', 'GARAN', 'AKBNK', 'BROKEN', 'THYAO'], max_workers=4)
+        self.assertGreater(query.peak, 1)
+        urls = [article.article_url for article in merged]
+        self.assertEqual(len(urls), len(set(urls)))
+        self.assertEqual(len(merged), 4)
+
+    def test_iter_many_yields_every_query(self):
+        results = dict(SlowQuery().iter_many(['A', 'BROKEN']))
+        self.assertEqual(results['BROKEN'], [])
+        self.assertEqual(len(results['A']), 2)
+
+
+PAGE = """
+<html><body>
+<div class="nav-story-link">menu</div>
+<article>
+  <span class="Eyebrow">markets</span>
+  <div class="headline"><h2>Turkish Airlines expands fleet</h2></div>
+  <div class="summary">Summary text</div>
+  <p>First paragraph</p>
+  <div class="byline">By Jane Doe</div>
+  <time>2025-01-02</time>
+</article>
+<article><div class="story-title">No heading here</div><span class="Published_At">yesterday</span></article>
+</body></html>
+"""
+
+
+class TestArticleExtractor(unittest.TestCase):
+    def test_fields_follow_selector_order(self):
+        for parser in dict.fromkeys(('html.parser', PARSER)):
+            first, second = ArticleExtractor(parser=parser, learn=False).extract_page(PAGE)
+            self.assertEqual(first, {'title': 'Turkish Airlines expands fleet', 'content': 'First paragraph',
+                                     'date': '2025-01-02', 'author': 'By Jane Doe', 'category': 'markets'})
+            self.assertEqual(second['title'], 'No heading here')
+            self.assertEqual(second['date'], 'yesterday')
+            self.assertIsNone(second['author'])
+
+    def test_categories_class(self):
+        page = '<article><h2>THY</h2><span class="categories">Markets</span></article>'
+        for parser in dict.fromkeys(('html.parser', PARSER)):
+            self.assertEqual(ArticleExtractor(parser=parser).extract_page(page)[0]['category'], 'Markets')
+
+    def test_limit_and_empty_pages(self):
+        extractor = ArticleExtractor()
+        self.assertEqual(len(extractor.extract_page(PAGE, limit=1)), 1)
+        self.assertEqual(extractor.extract_page(''), [])
+        self.assertEqual(extractor.extract_page('<div class="nav">x</div>'), [])
+
+    def test_winning_selector_is_tried_first(self):
+        extractor = ArticleExtractor()
+        page = '<article><span class="published_at">today</span><h1>Title</h1></article>'
+        for _ in range(3):
+            extractor.extract_page(page)
+        self.assertEqual(extractor.order('date')[0], ('class', 'published_at'))
+        self.assertEqual(extractor.order('title')[0][0], 'tag')
+
+
+STORY = ('Turkish Airlines reported record quarterly profit on Tuesday as passenger numbers rose '
+         'and fuel costs eased, beating analyst expectations for the third quarter in a row')
+
+
+class TestNewsDeduplicator(unittest.TestCase):
+    def test_exact_duplicates_across_sources(self):
+        dedup = NewsDeduplicator()
+        items = [
+            News({'title': 'THY posts record profit', 'article_url': 'https://www.bloomberg.com/news/thy/'}),
+            {'title': 'Other headline', 'url': 'https://bloomberg.com/news/thy?utm_source=x#top'},
+            'THY Posts Record Profit!',
+            'Garanti raises dividend',
+        ]
+        self.assertEqual(dedup.filter(items), [items[0], items[3]])
+        self.assertEqual(dedup.stats()['exact'], 2)
+        self.assertAlmostEqual(dedup.ratio, 0.5)
+        self.assertEqual(normalize_url('HTTPS://www.X.com/a/?b=1&utm_medium=y&a=2'), '//x.com/a?a=2&b=1')
+
+    def test_near_duplicates(self):
+        dedup = NewsDeduplicator()
+        self.assertIsNone(dedup.add({'title': 'THY record profit', 'content': STORY}, key='first'))
+        rewrite = STORY.replace('on Tuesday', 'on Tuesday,') + ' - Reuters'
+        self.assertEqual(dedup.add({'title': 'THY record profit (update)', 'content': rewrite}), 'first')
+        self.assertIsNone(dedup.add({'title': 'Bank earnings',
+                                     'content': 'Garanti said lending growth slowed sharply as rates stayed high'}))
+        self.assertEqual(dedup.stats()['near'], 1)
+
+    def test_window_and_capacity(self):
+        now = [0.0]
+        dedup = NewsDeduplicator(window=60, max_entries=2, clock=lambda: now[0])
+        dedup.filter(['first headline', 'second headline'])
+        self.assertTrue(dedup.is_duplicate('second headline'))
+        dedup.add('third headline')
+        self.assertFalse(dedup.is_duplicate('first headline'))
+        now[0] = 120
+        self.assertFalse(dedup.is_duplicate('third headline'))
+        self.assertLessEqual(dedup.stats()['remembered'], 2)
+
+
+RECORDS = [
+    {'title': 'THY posts record profit', 'content': 'Body', 'date': '2025-01-02', 'author': ['A B', 'C D'],
+     'source': 'Bloomberg', 'article_url': 'https://x.com/1'},
+    {'title': 'Garanti raises dividend', 'content': 'Other', 'date': '2025-01-03', 'author': 'E F'},
+]
+
+
+class TestNewsRecords(unittest.TestCase):
+    def test_from_records_matches_constructor(self):
+        for built, record in zip(News.from_records(RECORDS), RECORDS):
+            self.assertEqual(built.to_dict(), News(record).to_dict())
+        self.assertEqual(News({'TITLE': 'Mixed case key'}).title, 'Mixed case key')
+        with self.assertRaises(AttributeError):
+            News().extra = 1
+
+    def test_batch_columns_and_pandas(self):
+        batch = NewsBatch.from_records(RECORDS)
+        self.assertEqual(len(batch), 2)
+        self.assertEqual(batch[1].title, 'Garanti raises dividend')
+        self.assertEqual(batch[1].category, 'news')
+        self.assertEqual(batch[0].author, 'A B, C D')
+        frame = batch.to_pandas()
+        self.assertTrue(np.shares_memory(frame['title'].to_numpy(), batch.column('title')))
+        self.assertEqual(list(frame.columns), list(News.FIELDS))
+        self.assertEqual([news.to_dict() for news in batch], [news.to_dict() for news in News.from_records(RECORDS)])
+        self.assertEqual(NewsBatch.from_news(batch).to_records(), batch.to_records())
+        self.assertEqual(len(NewsBatch.concat([batch, batch[:1]])), 3)
+        with self.assertRaises(ValueError):
+            NewsBatch({'title': ['a'], 'content': []})
+
+
+class FakeNewsAPI(BaseQueryClass):
+    """NewsAPI-like source: honours ``since`` like the ``from`` parameter (inclusive)."""
+
+    def __init__(self, articles):
+        self.articles = articles
+        self.calls = []
+
+    def search_since(self, query, since=None, validators=None, **kwargs):
+        self.calls.append(since)
+        return [a for a in self.articles if since is None or a['publishedAt'][:19] >= since], validators
+
+
+class FakeResponse:
+    def __init__(self, status_code, text='', headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.content = text.encode()
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeSession:
+    def __init__(self, page):
+        self.page = page
+        self.requests = []
+
+    def get(self, url, params=None, headers=None):
+        self.requests.append(headers)
+        if headers.get('If-None-Match') == '"v1"':
+            return FakeResponse(304)
+        return FakeResponse(200, self.page, {'ETag': '"v1"'})
+
+
+class TestNewsPoller(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_high_water_mark_and_seen_filter_persist(self):
+        articles = [{'title': 'Old', 'url': 'https://x.com/1', 'publishedAt': '2025-01-01T10:00:00Z'},
+                    {'title': 'New', 'url': 'https://x.com/2', 'publishedAt': '2025-01-02T10:00:00Z'}]
+        source = FakeNewsAPI(articles)
+        poller = NewsPoller(source, root=self.tmp.name)
+        self.assertEqual(len(poller.poll('THYAO')), 2)
+        self.assertEqual(poller.poll('THYAO'), [])
+        self.assertEqual(source.calls, [None, '2025-01-02T10:00:00'])
+        poller.save()
+
+        source.articles.append({'title': 'Newer', 'url': 'https://x.com/3?utm_source=rss',
+                                'publishedAt': '2025-01-03T08:00:00Z'})
+        restarted = NewsPoller(source, root=self.tmp.name)
+        self.assertEqual([a['title'] for a in restarted.poll('THYAO')], ['Newer'])
+        self.assertEqual(restarted.high_water('THYAO'), '2025-01-03T08:00:00')
+
+    def test_bloomberg_conditional_requests(self):
+        query = BloombergQuery()
+        query.limiter, query.RATE, query.BURST = HostLimiter(), 1000, 100
+        query.session = FakeSession('<article><h2>THY posts record profit</h2></article>')
+        poller = NewsPoller(query, root=None)
+        self.assertEqual(len(poller.poll('THYAO')), 1)
+        self.assertEqual(poller.poll('THYAO'), [])
+        self.assertEqual(query.session.requests[1]['If-None-Match'], '"v1"')
+        self.assertEqual(poller.stats['unchanged'], 1)
+
+    def test_bloom_filter_rotates_and_saves(self):
+        bloom = BloomFilter(capacity=100, error_rate=0.01)
+        repeated = sum(bloom.add(f'https://x.com/{i}') for i in range(250))
+        self.assertLess(repeated, 10)
+        self.assertIn('https://x.com/249', bloom)
+        self.assertIn('https://x.com/150', bloom)
+        self.assertNotIn('https://x.com/0', bloom)
+        path = os.path.join(self.tmp.name, 'seen.bloom')
+        bloom.save(path)
+        self.assertIn('https://x.com/249', BloomFilter.load(path))
+        false_positives = sum(f'other/{i}' in bloom for i in range(2000))
+        self.assertLess(false_positives, 40)
+
+
+class FakeNewsApiClient:
+    """get_everything over ``total`` articles, one per hour going back from 2025-01-10, newest first."""
+
+    def __init__(self, total):
+        self.articles = [{'title': f'Article {i}',
+                          'publishedAt': f'2025-01-{10 - i // 24:02d}T{23 - i % 24:02d}:00:00Z'}
+                         for i in range(total)]
+        self.pages = []
+        self.source_calls = 0
+
+    def get_everything(self, page=1, page_size=100, **params):
+        self.pages.append(page)
+        start = (page - 1) * page_size
+        return {'status': 'ok', 'totalResults': len(self.articles),
+                'articles': self.articles[start:start + page_size]}
+
+    def get_sources(self):
+        self.source_calls += 1
+        return {'status': 'ok', 'sources': [{'id': 'bloomberg'}, {'id': 'bbc-news'}]}
+
+
+class TestNewsAPIPaging(unittest.TestCase):
+
+    def setUp(self):
+        self.query = NewsAPIQuery(api_key='test')
+        self.query.limiter, self.query.RATE, self.query.BURST = HostLimiter(), 1000, 100
+        self.query.newsapi = FakeNewsApiClient(250)
+
+    def test_streams_every_page(self):
+        titles = [a['title'] for a in self.query.iter_articles('THY', page_size=100)]
+        self.assertEqual(len(titles), 250)
+        self.assertEqual(titles[-1], 'Article 249')
+        self.assertEqual(self.query.newsapi.pages, [1, 2, 3])
+
+    def test_stops_at_limit_and_date(self):
+        self.assertEqual(len(list(self.query.iter_articles('THY', limit=30, page_size=20))), 30)
+        self.assertEqual(self.query.newsapi.pages, [1, 2])
+        self.query.newsapi.pages = []
+        # The last article of page one is already older than ``since``: page two is never fetched
+        since = list(self.query.iter_articles('THY', since='2025-01-10T10:00:00', page_size=20))
+        self.assertEqual(len(since), 14)
+        self.assertEqual(self.query.newsapi.pages, [1])
+
+    def test_sources_are_cached(self):
+        clock = FakeClock()
+        self.query.clock = clock
+        self.assertEqual(self.query.get_all_news_source_ids(), ['bloomberg', 'bbc-news'])
+        self.assertEqual(len(self.query.get_all_news_sources_detailed()), 2)
+        self.assertEqual(self.query.newsapi.source_calls, 1)
+        clock.now += NewsAPIQuery.SOURCES_TTL
+        self.query.get_all_news_source_ids()
+        self.query.get_all_news_source_ids(refresh=True)
+        self.assertEqual(self.query.newsapi.source_calls, 3)
+        # Each client keeps its own catalogue
+        other = NewsAPIQuery(api_key='test')
+        other.newsapi = FakeNewsApiClient(0)
+        other.get_all_news_source_ids()
+        self.assertEqual((self.query.newsapi.source_calls, other.newsapi.source_calls), (3, 1))
+
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+
+from financelib.database.news_archive import NewsArchive
+from financelib.news import News, NewsBatch
+
+
+RECORDS = [
+    {'title': 'THY kargo gelirlerini artırdı', 'content': 'Turkish Cargo volumes rose in January',
+     'date': '2025-01-10T08:00:00Z', 'source': 'bloomberg', 'article_url': 'https://x.com/thy-kargo'},
+    {'title': 'Garanti raises dividend', 'content': 'The bank also mentioned kargo once',
+     'date': '2025-01-12T08:00:00Z', 'source': 'newsapi', 'article_url': 'https://x.com/garanti'},
+    {'title': 'THY filo büyütüyor', 'content': 'Fleet expansion, no cargo words here',
+     'date': '2024-11-01T08:00:00Z', 'source': 'bloomberg', 'article_url': 'https://x.com/thy-filo'},
+]
+
+
+class TestNewsArchive(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.archive = NewsArchive(os.path.join(self.tmp.name, 'news.db'))
+        tags = {'https://x.com/garanti': ['GARAN.IS']}
+        self.assertEqual(self.archive.add(NewsBatch.from_records(RECORDS),
+                                          symbols=lambda record: tags.get(record['article_url'], ['THYAO'])), 3)
+
+    def tearDown(self):
+        self.archive.close()
+        self.tmp.cleanup()
+
+    def test_ranked_text_search(self):
+        results = self.archive.search('kargo')
+        self.assertEqual([r['article_url'] for r in results], ['https://x.com/thy-kargo', 'https://x.com/garanti'])
+        self.assertLess(results[0]['rank'], results[1]['rank'])
+        self.assertEqual(results[0]['symbols'], ['THYAO'])
+        # Accents are folded: 'buyutuyor' finds 'büyütüyor'
+        self.assertEqual(len(self.archive.search('buyutuyor')), 1)
+
+    def test_filters(self):
+        self.assertEqual(len(self.archive.search('kargo', symbols=['THYAO'])), 1)
+        self.assertEqual(len(self.archive.search('kargo', sources=['newsapi'])), 1)
+        self.assertEqual(len(self.archive.search('kargo', since='2025-01-11')), 1)
+        newest = self.archive.search(symbols=['thyao'], until='2025-02-01')
+        self.assertEqual([r['article_url'] for r in newest], ['https://x.com/thy-kargo', 'https://x.com/thy-filo'])
+        self.assertEqual(self.archive.search(symbols=['THYAO'], since='2025-01-11'), [])
+        with self.assertRaises(ValueError):
+            self.archive.search('"unbalanced')
+
+    def test_adding_again_only_adds_tags(self):
+        news = News.from_records(RECORDS[:1])
+        self.assertEqual(self.archive.add(news, symbols=['PGSUS']), 0)
+        self.assertEqual(len(self.archive), 3)
+        self.assertEqual(self.archive.search('kargo', symbols=['PGSUS'])[0]['symbols'], ['PGSUS', 'THYAO'])
+
+        reopened = NewsArchive(self.archive.path)
+        self.assertEqual(len(reopened), 3)
+        reopened.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
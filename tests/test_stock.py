@@ -1,5 +1,17 @@
+import os
+import tempfile
+import threading
+import time
 import unittest
-from financelib import Stock
+
+import pandas as pd
+
+from financelib.database.history import HistoryStore
+from financelib.livedata.sabah_com import parse_stock_symbol_list
+from financelib.stock import Stock, StockUniverse, Watchlist
+from financelib.stock.fixtures import RecordingProvider, ReplayProvider
+from financelib.stock.metadata_cache import MetadataCache
+from financelib.stock.symbol_index import SAVE_EVERY, SymbolIndex, fold
 
 class TestStock(unittest.TestCase):
     def test_search_stock(self):
@@ -12,5 +24,391 @@ class TestStock(unittest.TestCase):
         self.assertIsNotNone(data)
 
 
+class LocalProvider:
+    """Stand-in provider answering from memory, with optional delays."""
+
+    def __init__(self, delays=None):
+        self.delays = delays or {}
+        self.prices = {}
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def _call(self, key):
+        with self._lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delays.get(key, 0.01))
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def search(self, query):
+        self._call(query)
+        if query == 'unknown':
+            return {'quotes': []}
+        return {'quotes': [{'symbol': f'{query.upper()}.IS', 'exchange': 'IST', 'score': 1.0}]}
+
+    def info(self, symbol):
+        self._call(symbol)
+        if symbol == 'BROKEN.IS':
+            raise RuntimeError('upstream error')
+        return {'symbol': symbol, 'shortName': symbol[:-3], 'currentPrice': 10.0, 'sector': 'Industrials'}
+
+    def quotes(self, symbols):
+        self._call(tuple(symbols))
+        return {symbol: {'price': self.prices.get(symbol, 10.0), 'currency': 'TRY'}
+                for symbol in symbols if symbol != 'UNKNOWN.IS'}
+
+    def history(self, symbol, interval, start, end):
+        self._call(symbol)
+        index = pd.date_range(start, end, freq='D', inclusive='left')
+        return pd.DataFrame({'Open': 1.0, 'High': 2.0, 'Low': 0.5, 'Close': 1.5, 'Volume': 10.0}, index=index)
+
+
+class TestFetchMany(unittest.TestCase):
+    def setUp(self):
+        Stock._symbol_index = SymbolIndex()
+        Stock._metadata_cache = MetadataCache()
+
+    def tearDown(self):
+        Stock._symbol_index = None
+        Stock._metadata_cache = None
+
+    def test_results_keep_query_order(self):
+        provider = LocalProvider()
+        results = Stock.fetch_many(['thyao', 'garan', 'sasa'], max_workers=3, provider=provider)
+        self.assertEqual([result['symbol'] for result in results], ['THYAO.IS', 'GARAN.IS', 'SASA.IS'])
+        self.assertEqual(results[0]['exchange'], 'IST')
+        self.assertTrue(all(result['error'] is None for result in results))
+
+    def test_bounded_parallelism_is_faster_than_sequential(self):
+        provider = LocalProvider(delays={f'S{i}.IS': 0.05 for i in range(20)})
+        start = time.monotonic()
+        results = Stock.fetch_many([f'S{i}.IS' for i in range(20)], max_workers=5, resolve=False, provider=provider)
+        self.assertLess(time.monotonic() - start, 20 * 0.05 / 2)
+        self.assertLessEqual(provider.max_in_flight, 5)
+        self.assertEqual(len(results), 20)
+
+    def test_display_stock_infos_keeps_per_query_lists(self):
+        info = Stock.display_stock_infos(['thyao', 'unknown'], return_info=True, provider=LocalProvider())
+        self.assertEqual([record['symbol'] for record in info[0]], ['THYAO.IS'])
+        self.assertEqual(info[0][0]['exchange'], 'IST')
+        self.assertEqual(info[1], {'error': 'No matching company found'})
+
+    def test_partial_failures_and_timeouts(self):
+        provider = LocalProvider(delays={'SLOW.IS': 1.0})
+        results = Stock.fetch_many(['thyao', 'unknown', 'broken', 'slow'], max_workers=4, timeout=0.2, provider=provider)
+        errors = {result['query']: result['error'] for result in results}
+        self.assertIsNone(errors['thyao'])
+        self.assertIn('No matching company', errors['unknown'])
+        self.assertIn('upstream error', errors['broken'])
+        self.assertIn('Timed out', errors['slow'])
+
+
+class TestSymbolIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = SymbolIndex.from_common_stocks(Stock.COMMON_STOCKS)
+        Stock._metadata_cache = MetadataCache()
+
+    def tearDown(self):
+        Stock._metadata_cache = None
+
+    def test_turkish_folding(self):
+        self.assertEqual(fold('Türk Hava Yolları'), 'turk hava yollari')
+        self.assertEqual(fold('BİM Mağazalar'), 'bim magazalar')
+        self.assertEqual(fold('EREĞLİ DEMİR ÇELİK'), 'eregli demir celik')
+
+    def test_codes_names_and_prefixes(self):
+        self.assertEqual(self.index.search('THYAO')[0]['symbol'], 'THYAO.IS')
+        self.assertEqual(self.index.search('thyao.is')[0]['symbol'], 'THYAO.IS')
+        self.assertEqual(self.index.search('Türk Hava Yolları')[0]['symbol'], 'THYAO.IS')
+        self.assertEqual(self.index.search('turk hava')[0]['symbol'], 'THYAO.IS')
+        self.assertEqual(self.index.search('eregli demir')[0]['symbol'], 'EREGL.IS')
+        self.assertEqual({quote['symbol'] for quote in self.index.search('holding')}, {'KCHOL.IS', 'SAHOL.IS'})
+        self.assertEqual(self.index.search('garnti')[0]['symbol'], 'GARAN.IS')
+        self.assertEqual(self.index.search('nothing like this', fuzzy=False), [])
+
+    def test_network_only_on_miss_and_learned(self):
+        provider = LocalProvider()
+        Stock._symbol_index = self.index
+        try:
+            self.assertEqual(Stock._resolve('Koç Holding', provider)['symbol'], 'KCHOL.IS')
+            self.assertEqual(provider.calls, 0)
+            self.assertEqual(Stock._resolve('mgros', provider)['symbol'], 'MGROS.IS')
+            self.assertEqual(Stock._resolve('mgros', provider)['symbol'], 'MGROS.IS')
+            self.assertEqual(provider.calls, 1)
+        finally:
+            Stock._symbol_index = None
+
+    def test_short_prefixes_go_upstream(self):
+        provider = LocalProvider()
+        Stock._symbol_index = self.index
+        try:
+            self.assertEqual(Stock._resolve('F', provider)['symbol'], 'F.IS')
+            self.assertEqual(Stock._resolve('Ford', provider)['symbol'], 'FORD.IS')
+            self.assertEqual(Stock._resolve('FROTO', provider, exact=True)['symbol'], 'FROTO.IS')
+            self.assertEqual(Stock._resolve('Ford Otosan', provider)['symbol'], 'FROTO.IS')
+            self.assertEqual(provider.calls, 2)
+            # A learned symbol does not capture prefixes of itself
+            self.assertEqual(Stock._resolve('FO', provider)['symbol'], 'FO.IS')
+        finally:
+            Stock._symbol_index = None
+
+    def test_persistence_and_sabah_list(self):
+        symbols = parse_stock_symbol_list(
+            '[{"kod": "MGROS", "LastTradeDate": "2025-03-14", "ad": "Migros Ticaret"}, "ASTOR"]')
+        self.assertEqual(symbols, [{'symbol': 'MGROS', 'name': 'Migros Ticaret'}, {'symbol': 'ASTOR', 'name': None}])
+        with tempfile.TemporaryDirectory() as root:
+            path = f'{root}/symbols.json'
+            self.index.save(path)
+            loaded = SymbolIndex.load(path)
+            loaded.extend({'symbol': f"{item['symbol']}.IS", 'name': item['name']} for item in symbols)
+            self.assertEqual(len(SymbolIndex.load(path)), len(Stock.COMMON_STOCKS) + 2)
+        self.assertEqual(loaded.search('migros')[0]['symbol'], 'MGROS.IS')
+
+
+    def test_searches_while_symbols_are_added(self):
+        errors = []
+
+        def learn():
+            for i in range(300):
+                self.index.add(f'NEW{i}.IS', f'New Company {i}')
+
+        def search():
+            try:
+                for _ in range(300):
+                    self.assertEqual(self.index.search('turk hava')[0]['symbol'], 'THYAO.IS')
+                    self.assertEqual(self.index.lookup('GARAN')['symbol'], 'GARAN.IS')
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=learn)] + [threading.Thread(target=search) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(self.index.search('NEW299')[0]['symbol'], 'NEW299.IS')
+
+    def test_learned_symbols_are_saved_in_batches(self):
+        with tempfile.TemporaryDirectory() as root:
+            path = f'{root}/symbols.json'
+            index = SymbolIndex.from_common_stocks(Stock.COMMON_STOCKS, path=path)
+            index.add('MGROS.IS', 'Migros Ticaret')
+            self.assertFalse(os.path.exists(path))
+            for i in range(SAVE_EVERY - 1):
+                index.add(f'NEW{i}.IS')
+            self.assertEqual(len(SymbolIndex.load(path)), len(Stock.COMMON_STOCKS) + SAVE_EVERY)
+            index.add('ASTOR.IS')
+            index.flush()
+            self.assertEqual(SymbolIndex.load(path).lookup('ASTOR')['symbol'], 'ASTOR.IS')
+
+class TestMetadataCache(unittest.TestCase):
+    def setUp(self):
+        self.now = 1000.0
+        self.calls = 0
+
+    def fetch(self):
+        self.calls += 1
+        return {'sector': 'Industrials', 'currentPrice': 10.0 + self.calls}
+
+    def test_field_ttls_and_stale_while_revalidate(self):
+        cache = MetadataCache(clock=lambda: self.now)
+        self.assertEqual(cache.get('info', 'THYAO.IS', self.fetch, fields=('sector',))['currentPrice'], 11.0)
+        self.now += 3600
+        # The sector is still fresh, the price is not
+        self.assertEqual(cache.get('info', 'THYAO.IS', self.fetch, fields=('sector',))['currentPrice'], 11.0)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(cache.get('info', 'THYAO.IS', self.fetch, fields=('currentPrice',))['currentPrice'], 11.0)
+        cache._executor.shutdown(wait=True)
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(cache.get('info', 'THYAO.IS', self.fetch, fields=('sector',))['currentPrice'], 12.0)
+        self.assertEqual(cache.stats['hits'], 2)
+        self.assertEqual(cache.stats['stale_hits'], 1)
+        self.assertEqual(cache.stats['misses'], 1)
+        self.assertEqual(cache.stats['refreshes'], 1)
+        self.assertAlmostEqual(cache.stats['hit_rate'], 0.75)
+
+    def test_disk_store_and_lru(self):
+        with tempfile.TemporaryDirectory() as root:
+            cache = MetadataCache(f'{root}/metadata.db', max_entries=1, clock=lambda: self.now)
+            cache.get('info', 'THYAO.IS', self.fetch)
+            cache.get('info', 'GARAN.IS', self.fetch)
+            self.assertEqual(cache.stats['entries'], 1)
+            self.assertEqual(cache.get('info', 'THYAO.IS', self.fetch)['currentPrice'], 11.0)
+            reopened = MetadataCache(f'{root}/metadata.db', clock=lambda: self.now)
+            self.assertEqual(reopened.get('info', 'GARAN.IS', self.fetch)['currentPrice'], 12.0)
+        self.assertEqual(self.calls, 2)
+
+    def test_prices_are_not_served_from_stale_metadata(self):
+        provider = LocalProvider()
+        Stock._metadata_cache = MetadataCache(clock=lambda: self.now)
+        try:
+            self.assertEqual(Stock._info('THYAO.IS', provider)['currentPrice'], 10.0)
+            self.assertEqual(provider.calls, 1)
+            provider.info = lambda symbol: {'symbol': symbol, 'sector': 'Industrials', 'currentPrice': 12.0}
+            self.now += 3600
+            # The sector is still fresh, the price is fetched again before returning
+            info = Stock._info('THYAO.IS', provider)
+            self.assertEqual(info['sector'], 'Industrials')
+            self.assertEqual(info['currentPrice'], 12.0)
+        finally:
+            Stock._metadata_cache = None
+
+    def test_stock_lookups_are_cached(self):
+        provider = LocalProvider()
+        Stock._symbol_index = SymbolIndex()
+        Stock._metadata_cache = MetadataCache()
+        try:
+            Stock.fetch_many(['thyao'], provider=provider)
+            Stock._symbol_index = SymbolIndex()
+            Stock.fetch_many(['thyao'], provider=provider)
+            self.assertEqual(provider.calls, 2)
+        finally:
+            Stock._symbol_index = None
+            Stock._metadata_cache = None
+
+
+class TestStockUniverse(unittest.TestCase):
+    def setUp(self):
+        self.universe = StockUniverse.from_records([
+            {'symbol': 'THYAO.IS', 'exchange': 'IST', 'sector': 'Industrials', 'market_cap': 4e11},
+            {'symbol': 'GARAN.IS', 'exchange': 'IST', 'sector': 'Financial Services', 'market_cap': 5e11},
+            {'symbol': 'AKBNK.IS', 'exchange': 'IST', 'sector': 'Financial Services', 'market_cap': None},
+            {'symbol': 'JPM', 'exchange': 'NYQ', 'sector': 'Financial Services', 'market_cap': 6e14},
+        ])
+
+    def test_stock_is_lazy_and_slotted(self):
+        stock = Stock('thyao.is')
+        self.assertFalse(hasattr(stock, '__dict__'))
+        self.assertIsNone(stock._ticker_instance)
+        self.assertIs(stock._ticker, stock._ticker)
+
+    def test_vectorized_filters(self):
+        banks = self.universe.filter(exchange='IST', sector=['Financial Services'])
+        self.assertEqual(list(banks.symbols), ['GARAN.IS', 'AKBNK.IS'])
+        self.assertEqual(len(self.universe.filter(exchange=['ISTANBUL'])), 0)
+        self.assertEqual(len(self.universe.filter(exchange='ISTANBUL')), 0)
+        self.assertEqual(list(self.universe.between('market_cap', 1e12).symbols), ['JPM'])
+        self.assertEqual(list(banks.between('market_cap').symbols), ['GARAN.IS'])
+        self.assertEqual([stock.symbol for stock in banks], ['GARAN.IS', 'AKBNK.IS'])
+        self.assertEqual(self.universe[0].symbol, 'THYAO.IS')
+        with self.assertRaises(ValueError):
+            self.universe.filter(country='TR')
+
+    def test_from_symbol_index(self):
+        universe = StockUniverse.from_symbol_index(SymbolIndex.from_common_stocks(Stock.COMMON_STOCKS))
+        self.assertEqual(len(universe.filter(exchange='IST')), len(Stock.COMMON_STOCKS))
+        self.assertEqual(universe.to_frame().loc['THYAO.IS', 'name'], 'Türk Hava Yolları')
+
+
+class TestWatchlist(unittest.TestCase):
+    # Wednesday 2024-01-03 12:00 in Istanbul, 04:00 in New York
+    BIST_OPEN = 1704272400.0
+
+    def setUp(self):
+        self.now = self.BIST_OPEN
+        self.provider = LocalProvider(delays={})
+        self.received = []
+        self.watchlist = Watchlist([f'S{i}.IS' for i in range(120)] + ['AAPL', 'UNKNOWN.IS'],
+                                   callback=self.received.append, provider=self.provider,
+                                   batch_size=50, clock=lambda: self.now)
+
+    def test_batches_callback_and_metrics(self):
+        snapshots = self.watchlist.poll()
+        self.assertEqual(self.provider.calls, 3)
+        self.assertEqual(len(snapshots), 121)
+        self.assertEqual(self.received, snapshots)
+        self.now += 30
+        metrics = self.watchlist.metrics()
+        self.assertEqual(metrics['S0.IS']['staleness'], 30)
+        self.assertIsNotNone(metrics['S0.IS']['latency'])
+        self.assertEqual(metrics['UNKNOWN.IS']['errors'], 1)
+        self.assertIsNone(metrics['UNKNOWN.IS']['staleness'])
+        # Closed market polls rarely, open market with no moves polls every max_interval
+        self.assertEqual(metrics['AAPL']['interval'], self.watchlist.closed_interval)
+        self.assertEqual(metrics['S0.IS']['interval'], self.watchlist.max_interval)
+        self.assertEqual(self.watchlist.poll(), [])
+
+    def test_volatile_symbols_are_polled_faster(self):
+        self.watchlist.poll()
+        self.provider.prices['S1.IS'] = 10.5
+        self.now += 60
+        self.watchlist.poll()
+        metrics = self.watchlist.metrics()
+        self.assertEqual(metrics['S1.IS']['interval'], self.watchlist.min_interval)
+        self.assertEqual(metrics['S2.IS']['interval'], self.watchlist.max_interval)
+        self.now += 5
+        self.assertEqual([snapshot['symbol'] for snapshot in self.watchlist.poll()], ['S1.IS'])
+
+    def test_stream_until_stopped(self):
+        watchlist = Watchlist(['THYAO.IS'], provider=self.provider, min_interval=0.01, max_interval=0.01,
+                              closed_interval=0.01)
+        received = []
+        for snapshot in watchlist.stream():
+            received.append(snapshot)
+            if len(received) == 3:
+                watchlist.stop()
+        self.assertEqual([snapshot['symbol'] for snapshot in received], ['THYAO.IS'] * 3)
+
+
+class TestRecordedProvider(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = f'{self.directory.name}/fixture.pkl.gz'
+        Stock._symbol_index = SymbolIndex()
+        Stock._metadata_cache = MetadataCache()
+
+    def tearDown(self):
+        self.directory.cleanup()
+        Stock._symbol_index = None
+        Stock._metadata_cache = None
+
+    def replay(self, **kwargs):
+        Stock._symbol_index = SymbolIndex()
+        Stock._metadata_cache = MetadataCache()
+        return ReplayProvider(self.path, **kwargs)
+
+    def test_replay_matches_recording(self):
+        with RecordingProvider(LocalProvider(), self.path) as recording:
+            recorded = Stock.fetch_many(['thyao', 'broken', 'unknown'], provider=recording)
+            bars = Stock('THYAO.IS').history('2024-01-01', '2024-03-01', store=HistoryStore(self.directory.name + '/a'),
+                                             provider=recording)
+        replay = self.replay()
+        self.assertEqual(Stock.fetch_many(['thyao', 'broken', 'unknown'], provider=replay), recorded)
+        # Sub-ranges of recorded history replay too
+        again = Stock('THYAO.IS').history('2024-02-01', '2024-02-10', store=HistoryStore(self.directory.name + '/b'),
+                                          provider=replay)
+        pd.testing.assert_frame_equal(again, bars.loc['2024-02-01':'2024-02-09'])
+        with self.assertRaises(ValueError):
+            replay.info('GARAN.IS')
+
+    def test_simulated_latency(self):
+        with RecordingProvider(LocalProvider(), self.path) as recording:
+            recording.info('THYAO.IS')
+        replay = self.replay(latency=0.05)
+        start = time.monotonic()
+        self.assertEqual(replay.info('THYAO.IS')['symbol'], 'THYAO.IS')
+        self.assertGreaterEqual(time.monotonic() - start, 0.05)
+        self.assertEqual(replay.calls, 1)
+
+
+class TestStockHistory(unittest.TestCase):
+    def test_history_is_served_locally_after_first_fetch(self):
+        provider = LocalProvider()
+        with tempfile.TemporaryDirectory() as root:
+            store = HistoryStore(root=root)
+            stock = Stock('thyao.is')
+            first = stock.history('2024-01-01', '2024-03-01', store=store, provider=provider)
+            again = stock.history('2024-01-15', '2024-02-01', store=store, provider=provider)
+        self.assertEqual(provider.calls, 1)
+        self.assertEqual(len(first), 60)
+        self.assertEqual(len(again), 17)
+
+
 if __name__ == '__main__':
     unittest.main()